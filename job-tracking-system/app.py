@@ -3,13 +3,33 @@ Job Tracking System Web Interface
 Flask web application for managing job opportunities and applications
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, g, make_response, session, Response
+from markupsafe import Markup, escape
 import sqlite3
 import os
+import io
+import time
+from functools import wraps
 from datetime import datetime, date
-import json
 from dotenv import load_dotenv
-from src.scoring_algorithm import JobScoringAlgorithm
+from src.scoring_algorithm import JobScoringAlgorithm, load_stored_breakdown
+from src.parallel_scoring import rescore_parallel
+from src.migrations import migrate_database
+from src.requirements_extractor import jobs_requiring, match_by_importance
+from src.reweighting import what_if
+from src.dedupe import dedupe_corpus, link_duplicate
+from src.job_search import SNIPPET_END, SNIPPET_START, search_jobs
+from src.bulk_import import import_jobs, parse_rows
+from src.analytics import monthly_trends, score_distribution, source_analysis
+from src.change_tracking import data_version
+from src.company_resolver import add_company_alias, find_similar, get_resolver
+from src.db import get_pool
+from src.export import EXPORT_FORMATS, applications_export_query, export_format, jobs_export_query, stream_export
+from src.query_cache import get_query_cache, invalidate
+from src.activity_log import activity_for, archive_stats, compact_activity_log
+from src.task_queue import TaskWorkerPool, get_task, queue_stats
+from src.metrics import REGISTRY as metrics, install as install_metrics, metric_lines
+from src.pagination import JOB_ORDER, applications_page, jobs_page, order_by
 from src.cover_letter_generator import CoverLetterGenerator
 from src.gdrive_automation import GoogleDriveAutomation
 from src.notion_integration import setup_notion_integration
@@ -23,6 +43,48 @@ app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
 # Configuration
 DATABASE_PATH = 'job_tracker.db'
 
+# Route latency and SQL timings at /metrics and /api/metrics (METRICS_ENABLED=0 turns them off)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+if METRICS_ENABLED:
+    install_metrics()
+
+# Part of every page ETag, so a restart (possibly with new templates) never serves a stale 304
+ETAG_SALT = datetime.now().isoformat()
+
+# Read results reused between writes (invalidated by writes and the table_versions counters)
+query_cache = get_query_cache(DATABASE_PATH)
+
+# Shared scorer - the profile index is compiled once and reloaded only when my_profile changes
+scorer = JobScoringAlgorithm(DATABASE_PATH)
+
+def build_application_package(payload, progress):
+    """Task handler: the Drive application package (folders, cover letter, pandoc, uploads)"""
+    automation = GoogleDriveAutomation(DATABASE_PATH)
+    return {'folder_path': automation.create_application_package(payload['job_id'], progress=progress)}
+
+def activity_compaction(payload, progress):
+    """Task handler: archive activity_log rows older than the retention window"""
+    report = compact_activity_log(DATABASE_PATH, days=payload.get('days'))
+    if report.rows_archived:
+        invalidate(DATABASE_PATH, 'activity_log')
+    return {
+        'rows_archived': report.rows_archived,
+        'segments_written': report.segments_written,
+        'raw_bytes': report.raw_bytes,
+        'compressed_bytes': report.compressed_bytes
+    }
+
+def rescore_stale_jobs(payload, progress):
+    """Task handler: rescore the jobs whose content or scoring profile changed since they were scored"""
+    result = scorer.score_jobs()
+    return {'jobs_scored': result.jobs_scored, 'jobs_skipped': result.jobs_skipped}
+
+# Slow Drive/rclone work runs on background workers instead of holding a request
+task_pool = TaskWorkerPool(DATABASE_PATH, {'application_package': build_application_package,
+                                           'activity_compaction': activity_compaction,
+                                           'rescore_stale_jobs': rescore_stale_jobs},
+                           workers=int(os.getenv('TASK_WORKERS', '2')))
+
 # Initialize Notion integration (if configured)
 notion_tracker = None
 try:
@@ -42,37 +104,115 @@ def init_database():
                 conn.executescript(f.read())
         print("Database initialized with schema")
 
+    for name in migrate_database(DATABASE_PATH):
+        print(f"Applied migration: {name}")
+
+def queue_background_rescore():
+    """Queue a rescore of stale jobs (joins the queued or running one, if there is one)"""
+    task_pool.submit('rescore_stale_jobs', {}, dedupe_key='rescore')
+
+def start_background_rescore():
+    """Pick up the scoring profile version and queue a rescore of stale jobs"""
+    stale = scorer.sync_profile_version()
+    if stale:
+        print(f"Scoring profile changed: {stale} jobs marked for rescoring")
+
+    queue_background_rescore()
+
+def refresh_scoring_profile(rescore_stale: bool = True):
+    """
+    Hot-reload the scoring profile after my_profile/scoring_weights edits
+
+    Pass rescore_stale=False when the request goes on to rescore every job itself.
+    """
+    if scorer.refresh_profile() and rescore_stale:
+        queue_background_rescore()
+
 def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the request's database connection (pooled; returned to the pool when the request ends)"""
+    if 'db' not in g:
+        g.db = get_pool(DATABASE_PATH).acquire(sqlite3.Row)
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Hand the request's connection back to the pool, rolling back anything uncommitted"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool(DATABASE_PATH).release(conn)
+
+@app.before_request
+def start_request_metrics():
+    """Start counting the request's SQL statements and connection borrows"""
+    if METRICS_ENABLED:
+        g.request_started = time.perf_counter()
+        metrics.begin_request(request.endpoint or 'unmatched')
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency and SQL per route (streamed responses count time to the first byte)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.end_request(request.method, request.endpoint or 'unmatched', response.status_code,
+                            time.perf_counter() - started)
+    return response
+
+def conditional(*tables):
+    """
+    ETag/Last-Modified for a page that only depends on the given tables
+
+    The ETag combines the URL with the tables' change counters, so a matching
+    If-None-Match (or If-Modified-Since) gets a 304 before the view runs any
+    page query or renders its template.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pending flash messages are rendered by the page, so it must not be a 304
+            if session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            version = data_version(get_db_connection(), tables)
+            if version is None:
+                return view(*args, **kwargs)
+            etag = version.etag(request.full_path, ETAG_SALT)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = bool(request.if_modified_since and version.last_modified
+                                    and version.last_modified <= request.if_modified_since)
+
+            response = make_response('', 304) if not_modified else make_response(view(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                response.last_modified = version.last_modified
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
 
 @app.route('/')
+@conditional('job_opportunities', 'companies', 'applications', 'interviews')
 def dashboard():
     """Main dashboard showing job tracking overview"""
     conn = get_db_connection()
 
-    # Get summary statistics
-    stats = {}
-    stats['total_jobs'] = conn.execute('SELECT COUNT(*) FROM job_opportunities').fetchone()[0]
-    stats['high_priority'] = conn.execute(
-        'SELECT COUNT(*) FROM job_opportunities WHERE priority = "high" OR ai_score >= 80'
-    ).fetchone()[0]
-    stats['applications_sent'] = conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0]
-    stats['interviews_scheduled'] = conn.execute('SELECT COUNT(*) FROM interviews').fetchone()[0]
+    # Summary statistics: counters maintained by the trg_dashboard_* triggers
+    row = conn.execute('SELECT * FROM dashboard_stats WHERE id = 1').fetchone()
+    stats = {name: row[name] for name in ('total_jobs', 'high_priority', 'applications_sent', 'interviews_scheduled')}
 
     # Get recent jobs (top 10 by score and priority)
-    recent_jobs = conn.execute("""
+    recent_jobs = query_cache.fetchall(conn, f"""
         SELECT j.*, c.name as company_name
         FROM job_opportunities j
         LEFT JOIN companies c ON j.company_id = c.id
-        ORDER BY j.ai_score DESC, j.created_at DESC
+        ORDER BY {order_by(JOB_ORDER)}
         LIMIT 10
-    """).fetchall()
+    """, tables=['job_opportunities', 'companies'])
 
     # Get application pipeline
-    pipeline = conn.execute("""
+    pipeline = query_cache.fetchall(conn, f"""
         SELECT
             j.title,
             c.name as company_name,
@@ -85,11 +225,9 @@ def dashboard():
         LEFT JOIN companies c ON j.company_id = c.id
         LEFT JOIN applications a ON j.id = a.job_id
         WHERE j.status NOT IN ('rejected', 'withdrawn')
-        ORDER BY j.ai_score DESC, j.created_at DESC
+        ORDER BY {order_by(JOB_ORDER)}
         LIMIT 20
-    """).fetchall()
-
-    conn.close()
+    """, tables=['job_opportunities', 'companies', 'applications'])
 
     return render_template('dashboard.html',
                          stats=stats,
@@ -97,48 +235,34 @@ def dashboard():
                          pipeline=pipeline)
 
 @app.route('/jobs')
+@conditional('job_opportunities', 'companies')
 def jobs_list():
-    """List all job opportunities with filtering"""
+    """List all job opportunities with filtering and full-text search"""
     conn = get_db_connection()
 
     # Get filter parameters
+    search_text = request.args.get('q', '').strip()
     status_filter = request.args.get('status', '')
     priority_filter = request.args.get('priority', '')
     min_score = request.args.get('min_score', 0, type=int)
 
-    # Build query
-    query = """
-        SELECT j.*, c.name as company_name, c.industry
-        FROM job_opportunities j
-        LEFT JOIN companies c ON j.company_id = c.id
-        WHERE 1=1
-    """
-    params = []
-
-    if status_filter:
-        query += " AND j.status = ?"
-        params.append(status_filter)
-
-    if priority_filter:
-        query += " AND j.priority = ?"
-        params.append(priority_filter)
-
-    if min_score > 0:
-        query += " AND j.ai_score >= ?"
-        params.append(min_score)
+    if search_text:
+        jobs = search_jobs(conn, search_text, status_filter, priority_filter, min_score)
+        return render_template('jobs_list.html', jobs=jobs, search_text=search_text)
 
-    query += " ORDER BY j.ai_score DESC, j.created_at DESC"
-
-    jobs = conn.execute(query, params).fetchall()
-    conn.close()
-
-    return render_template('jobs_list.html', jobs=jobs)
+    # One keyset page (?cursor= from the previous page's "Next" link)
+    try:
+        page = jobs_page(conn, status_filter, priority_filter, min_score,
+                         request.args.get('cursor'), request.args.get('limit', type=int))
+    except ValueError:
+        flash('That page link has expired; showing the first page', 'warning')
+        return redirect(url_for('jobs_list', status=status_filter or None, priority=priority_filter or None,
+                                min_score=min_score or None))
 
-@app.route('/job/<int:job_id>')
-def job_detail(job_id):
-    """Job detail view with scoring breakdown"""
-    conn = get_db_connection()
+    return render_template('jobs_list.html', jobs=page.items, next_cursor=page.next_cursor, search_text='')
 
+def load_job_detail(conn, job_id):
+    """Everything the job detail page shows, or None if the job doesn't exist"""
     job = conn.execute("""
         SELECT j.*, c.name as company_name, c.industry, c.description as company_description
         FROM job_opportunities j
@@ -147,42 +271,41 @@ def job_detail(job_id):
     """, (job_id,)).fetchone()
 
     if not job:
-        flash('Job not found', 'error')
-        return redirect(url_for('jobs_list'))
-
-    # Get scoring breakdown from activity log
-    scoring_data = conn.execute("""
-        SELECT metadata FROM activity_log
-        WHERE entity_type = 'job' AND entity_id = ?
-        AND activity_type = 'job_scored'
-        ORDER BY created_at DESC
-        LIMIT 1
-    """, (job_id,)).fetchone()
-
-    score_breakdown = None
-    if scoring_data:
-        try:
-            score_breakdown = json.loads(scoring_data[0])
-        except:
-            pass
+        return None
+
+    return {
+        'job': job,
+        # Scoring breakdown (primary-key read of job_scores)
+        'score_breakdown': load_stored_breakdown(conn, job_id),
+        # Requirements extracted when the job was last scored (rewritten with job_scores)
+        'requirements': conn.execute("""
+            SELECT * FROM job_requirements WHERE job_id = ? ORDER BY id
+        """, (job_id,)).fetchall(),
+        'applications': conn.execute("""
+            SELECT * FROM applications WHERE job_id = ? ORDER BY application_date DESC
+        """, (job_id,)).fetchall(),
+        'documents': conn.execute("""
+            SELECT * FROM generated_documents WHERE job_id = ? ORDER BY created_at DESC
+        """, (job_id,)).fetchall()
+    }
 
-    # Get applications for this job
-    applications = conn.execute("""
-        SELECT * FROM applications WHERE job_id = ? ORDER BY application_date DESC
-    """, (job_id,)).fetchall()
+@app.route('/job/<int:job_id>')
+@conditional('job_opportunities', 'companies', 'job_scores', 'applications', 'generated_documents')
+def job_detail(job_id):
+    """Job detail view with scoring breakdown"""
+    conn = get_db_connection()
 
-    # Get generated documents
-    documents = conn.execute("""
-        SELECT * FROM generated_documents WHERE job_id = ? ORDER BY created_at DESC
-    """, (job_id,)).fetchall()
+    detail = query_cache.get_or_load(
+        conn, ('job_detail', job_id),
+        ['job_opportunities', 'companies', 'job_scores', 'applications', 'generated_documents'],
+        lambda: load_job_detail(conn, job_id)
+    )
 
-    conn.close()
+    if not detail:
+        flash('Job not found', 'error')
+        return redirect(url_for('jobs_list'))
 
-    return render_template('job_detail.html',
-                         job=job,
-                         score_breakdown=score_breakdown,
-                         applications=applications,
-                         documents=documents)
+    return render_template('job_detail.html', **detail)
 
 @app.route('/job/add', methods=['GET', 'POST'])
 def add_job():
@@ -190,21 +313,17 @@ def add_job():
     if request.method == 'POST':
         conn = get_db_connection()
 
-        # Check if company exists, create if not
-        company_name = request.form['company_name']
-        company = conn.execute('SELECT id FROM companies WHERE name = ?', (company_name,)).fetchone()
-
-        if not company:
-            conn.execute("""
-                INSERT INTO companies (name, industry, description)
-                VALUES (?, ?, ?)
-            """, (company_name, request.form.get('industry', ''), request.form.get('company_description', '')))
-            company_id = conn.lastrowid
-        else:
-            company_id = company['id']
+        # Resolve to the canonical company ("ANZ", "anz" and "ANZ Pty Ltd" are one company;
+        # other spellings such as "ANZ Bank" need an alias, see /api/companies/<id>/aliases)
+        company = get_resolver(DATABASE_PATH).resolve(
+            conn, request.form['company_name'],
+            industry=request.form.get('industry', ''),
+            description=request.form.get('company_description', '')
+        )
+        company_id = company.id if company else None
 
         # Insert job
-        conn.execute("""
+        cursor = conn.execute("""
             INSERT INTO job_opportunities
             (company_id, title, level, employment_type, location, remote_option,
              salary_min, salary_max, job_description, requirements, source, source_url,
@@ -229,9 +348,22 @@ def add_job():
             request.form.get('notes', '')
         ))
 
-        job_id = conn.lastrowid
+        job_id = cursor.lastrowid
+
+        # Link near-duplicates of a posting already tracked (same role from another source)
+        duplicate_of = link_duplicate(conn, {
+            'id': job_id,
+            'title': request.form['title'],
+            'job_description': request.form.get('job_description', ''),
+            'requirements': request.form.get('requirements', '')
+        })
         conn.commit()
-        conn.close()
+        invalidate(DATABASE_PATH, 'job_opportunities', 'companies')
+
+        if duplicate_of:
+            # The original is already tracked (and synced), so don't push a second copy
+            flash(f'Looks like a repost of job #{duplicate_of}; linked as a duplicate', 'warning')
+            return redirect(url_for('job_detail', job_id=job_id))
 
         # Sync to Notion if configured
         if notion_tracker:
@@ -254,8 +386,9 @@ def add_job():
 def score_job(job_id):
     """API endpoint to score a job opportunity"""
     try:
-        scorer = JobScoringAlgorithm(DATABASE_PATH)
-        score_result = scorer.update_job_score(job_id)
+        refresh_scoring_profile()
+        force = request.args.get('force', '').lower() in ('1', 'true')
+        score_result = scorer.update_job_score(job_id, force=force)
 
         return jsonify({
             'success': True,
@@ -268,6 +401,373 @@ def score_job(job_id):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def parse_job_id(value) -> int:
+    """A job ID from JSON: an integer or a string of digits (not a bool or a float)"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(f"Invalid job ID: {value!r}")
+    return int(value)
+
+@app.route('/api/rescore_all', methods=['POST'])
+def rescore_all():
+    """API endpoint to rescore many jobs in one batch (all jobs by default)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job_ids = data.get('job_ids')
+        if job_ids is not None:
+            if not isinstance(job_ids, list):
+                raise ValueError("job_ids must be a list of integers")
+            try:
+                job_ids = [parse_job_id(job_id) for job_id in job_ids]
+            except (TypeError, ValueError):
+                raise ValueError("job_ids must be a list of integers")
+        status = data.get('status')
+        if status is not None and not isinstance(status, str):
+            raise ValueError("status must be a string")
+        force = bool(data.get('force', False))
+        query, params = ('j.status = ?', (status,)) if status else (None, ())
+
+        workers = data.get('workers')
+        if workers is not None:
+            try:
+                workers = int(workers)
+            except (TypeError, ValueError):
+                raise ValueError("workers must be a positive integer")
+            if workers < 1:
+                raise ValueError("workers must be a positive integer")
+
+        refresh_scoring_profile(rescore_stale=job_ids is not None or bool(status))
+
+        if workers and workers > 1:
+            result = rescore_parallel(scorer, job_ids, workers=workers, force=force, query=query, params=params)
+        else:
+            result = scorer.score_jobs(job_ids, query=query, params=params, force=force)
+
+        return jsonify({
+            'success': True,
+            'jobs_scored': result.jobs_scored,
+            'jobs_skipped': result.jobs_skipped,
+            'elapsed_seconds': round(result.elapsed_seconds, 3),
+            'jobs_per_second': round(result.jobs_per_second, 1)
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/whatif', methods=['POST'])
+def whatif_reweighting():
+    """API endpoint to rerank all scored jobs under alternative weights without rescoring"""
+    try:
+        refresh_scoring_profile()
+        data = request.get_json(silent=True) or {}
+        top_k = int(data.get('top_k', 20))
+
+        conn = get_db_connection()
+        result = what_if(conn, DATABASE_PATH, scorer.profile, data.get('weights') or {}, top_k)
+
+        return jsonify({
+            'success': True,
+            'weights': result.weights,
+            'jobs_ranked': result.jobs_ranked,
+            'jobs_moved': result.jobs_moved,
+            'elapsed_ms': round(result.elapsed_ms, 1),
+            'top': result.top
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/import_jobs', methods=['POST'])
+def import_jobs_upload():
+    """API endpoint to stream an uploaded CSV/JSONL export into the jobs table"""
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'success': False, 'error': 'No file uploaded'}), 400
+
+    try:
+        file_format = request.form.get('format') or os.path.splitext(upload.filename or '')[1].lstrip('.').lower()
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8', newline='')
+        report = import_jobs(
+            DATABASE_PATH,
+            parse_rows(stream, file_format),
+            score=request.form.get('score', '').lower() in ('1', 'true'),
+            dedupe=request.form.get('dedupe', '').lower() in ('1', 'true'),
+            scorer=scorer
+        )
+
+        return jsonify({
+            'success': True,
+            'rows_read': report.rows_read,
+            'jobs_imported': report.jobs_imported,
+            'companies_created': report.companies_created,
+            'duplicates_linked': report.duplicates_linked,
+            'jobs_scored': report.jobs_scored,
+            'elapsed_seconds': round(report.elapsed_seconds, 3),
+            'rows_per_second': round(report.rows_per_second, 1),
+            'rejected': [{'line': row.line, 'reason': row.reason} for row in report.rejected[:100]],
+            'rejected_count': len(report.rejected)
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/dedupe', methods=['POST'])
+def dedupe_jobs():
+    """API endpoint for the corpus-wide near-duplicate pass"""
+    try:
+        indexed, clusters = dedupe_corpus(DATABASE_PATH)
+        return jsonify({
+            'success': True,
+            'jobs_indexed': indexed,
+            'clusters': [{'job_id': members[0], 'duplicates': members[1:]} for members in clusters]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/search')
+def search_api():
+    """API endpoint for ranked full-text search (same filters as the jobs list)"""
+    try:
+        conn = get_db_connection()
+        jobs = search_jobs(
+            conn,
+            request.args.get('q', ''),
+            request.args.get('status', ''),
+            request.args.get('priority', ''),
+            request.args.get('min_score', 0, type=int),
+            min(request.args.get('limit', 50, type=int), 200)
+        )
+
+        return jsonify({
+            'success': True,
+            'results': [{
+                'id': job['id'],
+                'title': job['title'],
+                'company_name': job['company_name'],
+                'status': job['status'],
+                'priority': job['priority'],
+                'ai_score': job['ai_score'],
+                'rank': job['search_rank'],
+                'snippet': str(highlight(job['snippet']))
+            } for job in jobs]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/jobs')
+def jobs_api():
+    """API endpoint for the jobs list, one keyset page at a time (pass next_cursor back as ?cursor=)"""
+    try:
+        conn = get_db_connection()
+        page = jobs_page(
+            conn,
+            request.args.get('status', ''),
+            request.args.get('priority', ''),
+            request.args.get('min_score', 0, type=int),
+            request.args.get('cursor'),
+            request.args.get('limit', type=int)
+        )
+
+        return jsonify({
+            'success': True,
+            'jobs': [{
+                'id': job['id'],
+                'title': job['title'],
+                'company_name': job['company_name'],
+                'status': job['status'],
+                'priority': job['priority'],
+                'ai_score': job['ai_score'],
+                'created_at': job['created_at']
+            } for job in page.items],
+            'next_cursor': page.next_cursor
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/applications')
+def applications_api():
+    """API endpoint for applications, most recent first, one keyset page at a time"""
+    try:
+        conn = get_db_connection()
+        page = applications_page(conn, request.args.get('status', ''), request.args.get('cursor'),
+                                 request.args.get('limit', type=int))
+
+        return jsonify({
+            'success': True,
+            'applications': [{
+                'id': application['id'],
+                'job_id': application['job_id'],
+                'job_title': application['job_title'],
+                'company_name': application['company_name'],
+                'application_date': application['application_date'],
+                'status': application['status'],
+                'ai_score': application['ai_score']
+            } for application in page.items],
+            'next_cursor': page.next_cursor
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def export_response(name, query, fmt):
+    """Streaming download of an export query; rows are sent as they are read"""
+    extension = 'csv' if fmt == 'csv' else 'ndjson'
+    return Response(stream_export(DATABASE_PATH, query, fmt), mimetype=EXPORT_FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{name}-{date.today().isoformat()}.{extension}"',
+        'Cache-Control': 'no-store'
+    })
+
+@app.route('/api/export/jobs')
+def export_jobs():
+    """API endpoint streaming every job matching the /jobs filters (plus ?updated_since=) as NDJSON or CSV"""
+    try:
+        fmt = export_format(request.args.get('format'))
+        query = jobs_export_query(
+            get_db_connection(),
+            request.args.get('q', '').strip(),
+            request.args.get('status', ''),
+            request.args.get('priority', ''),
+            request.args.get('min_score', 0, type=int),
+            request.args.get('updated_since')
+        )
+        return export_response('jobs', query, fmt)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/export/applications')
+def export_applications():
+    """API endpoint streaming every application (?status=, ?updated_since=) as NDJSON or CSV"""
+    try:
+        fmt = export_format(request.args.get('format'))
+        query = applications_export_query(request.args.get('status', ''), request.args.get('updated_since'))
+        return export_response('applications', query, fmt)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/companies/resolve')
+def resolve_company_api():
+    """API endpoint showing which canonical company a name resolves to, without creating one"""
+    try:
+        name = request.args.get('name', '')
+        conn = get_db_connection()
+        company = get_resolver(DATABASE_PATH).resolve(conn, name, create=False)
+        similar = find_similar(conn, name, limit=min(request.args.get('limit', 5, type=int), 20))
+
+        return jsonify({
+            'success': True,
+            'company': {'id': company.id, 'name': company.name, 'similarity': company.similarity} if company else None,
+            'similar': [{'id': match.id, 'name': match.name, 'similarity': round(match.similarity, 3)}
+                        for match in similar]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/companies/<int:company_id>/aliases', methods=['POST'])
+def add_company_alias_api(company_id):
+    """API endpoint to make another name resolve to a company (e.g. "ANZ Bank" -> ANZ)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        conn = get_db_connection()
+        alias_key = add_company_alias(conn, data.get('alias', ''), company_id)
+        conn.commit()
+
+        return jsonify({'success': True, 'company_id': company_id, 'alias_key': alias_key})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/query_cache')
+def query_cache_stats():
+    """API endpoint for result cache hit/miss counters (for tuning its size)"""
+    return jsonify({'success': True, 'stats': query_cache.stats()})
+
+def runtime_stats():
+    """Connection pool, result cache and task queue counters for the metrics endpoints"""
+    pool = get_pool(DATABASE_PATH)
+    return {
+        'pool': {'created': pool.created, 'reused': pool.reused},
+        'query_cache': query_cache.stats(),
+        'tasks': queue_stats(get_db_connection())
+    }
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint: route latency histograms, SQL timings, pool, cache and queue counters"""
+    stats = runtime_stats()
+    cache = stats['query_cache']
+    lines = [metrics.prometheus()]
+    lines += metric_lines('db_pool_connections_total', 'Pooled connection acquisitions by outcome', 'counter', [
+        ({'outcome': 'created'}, stats['pool']['created']),
+        ({'outcome': 'reused'}, stats['pool']['reused'])
+    ])
+    lines += metric_lines('query_cache_lookups_total', 'Result cache lookups by outcome', 'counter', [
+        ({'outcome': 'hit'}, cache['hits']),
+        ({'outcome': 'miss'}, cache['misses']),
+        ({'outcome': 'stale'}, cache['stale'])
+    ])
+    lines += metric_lines('query_cache_entries', 'Results held by the cache', 'gauge', [({}, cache['entries'])])
+    lines += metric_lines('tasks', 'Background tasks by status', 'gauge', [
+        ({'status': status}, count) for status, count in stats['tasks'].items()
+    ])
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics')
+def metrics_summary():
+    """API endpoint summarising route latency, SQL per request (N+1 patterns) and the slowest statements"""
+    try:
+        return jsonify({
+            'success': True,
+            'enabled': METRICS_ENABLED,
+            **metrics.summary(min(request.args.get('top', 20, type=int), 100)),
+            **runtime_stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/slow_queries')
+def slow_queries_api():
+    """API endpoint ranking statements by total time, with slow-log counts, parameters and query plans"""
+    try:
+        return jsonify({
+            'success': True,
+            'enabled': METRICS_ENABLED,
+            **metrics.slow_query_report(min(request.args.get('top', 50, type=int), 500))
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/slow_queries')
+def slow_queries_report():
+    """Slow query report: statements by total time, their plans and the latest slow executions"""
+    return render_template('slow_queries.html', enabled=METRICS_ENABLED, **metrics.slow_query_report())
+
+@app.route('/api/requirements')
+def requirements_summary():
+    """API endpoint for extracted requirements: jobs naming a term and average match by importance"""
+    try:
+        term = request.args.get('term')
+        importance = request.args.get('importance')
+        job_id = request.args.get('job_id', type=int)
+
+        conn = get_db_connection()
+        response = {'success': True, 'match_by_importance': match_by_importance(conn, job_id)}
+        if term:
+            response['jobs'] = jobs_requiring(conn, term, importance)
+
+        return jsonify(response)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/generate_cover_letter/<int:job_id>', methods=['POST'])
 def generate_cover_letter(job_id):
     """API endpoint to generate a cover letter"""
@@ -288,19 +788,90 @@ def generate_cover_letter(job_id):
 
 @app.route('/api/create_application_package/<int:job_id>', methods=['POST'])
 def create_application_package(job_id):
-    """API endpoint to create complete application package"""
+    """API endpoint to queue the application package build; poll status_url for progress"""
     try:
-        automation = GoogleDriveAutomation(DATABASE_PATH)
-        folder_path = automation.create_application_package(job_id)
+        conn = get_db_connection()
+        if not conn.execute("SELECT 1 FROM job_opportunities WHERE id = ?", (job_id,)).fetchone():
+            raise ValueError(f"Job {job_id} not found")
+
+        # A second click while a build for this job is queued or running returns the same task
+        task_id, created = task_pool.submit('application_package', {'job_id': job_id}, dedupe_key=str(job_id))
 
         return jsonify({
             'success': True,
-            'folder_path': folder_path,
-            'message': f'Application package created in Google Drive: {folder_path}'
+            'task_id': task_id,
+            'created': created,
+            'status_url': url_for('task_status', task_id=task_id)
+        }), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/tasks/<int:task_id>')
+def task_status(task_id):
+    """API endpoint for a background task's status, progress and result"""
+    try:
+        task = get_task(get_db_connection(), task_id)
+        if not task:
+            return jsonify({'success': False, 'error': f'Task {task_id} not found'}), 404
+
+        return jsonify({
+            'success': True,
+            'task': {
+                'id': task.id,
+                'type': task.task_type,
+                'status': task.status,
+                'progress': task.progress,
+                'message': task.progress_message,
+                'attempts': task.attempts,
+                'max_attempts': task.max_attempts,
+                'next_attempt_at': task.run_after if task.status == 'queued' else None,
+                'result': task.result,
+                'error': task.error,
+                'created_at': task.created_at,
+                'finished_at': task.finished_at
+            }
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/activity/compact', methods=['POST'])
+def compact_activity():
+    """API endpoint to queue activity log compaction (optional JSON body: {"days": N})"""
+    try:
+        data = request.get_json(silent=True) or {}
+        days = data.get('days')
+        if days is not None and (not isinstance(days, int) or days < 1):
+            raise ValueError("days must be a positive integer")
+
+        task_id, created = task_pool.submit('activity_compaction', {'days': days}, dedupe_key='activity')
+        return jsonify({
+            'success': True,
+            'task_id': task_id,
+            'created': created,
+            'status_url': url_for('task_status', task_id=task_id)
+        }), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/activity/<entity_type>/<int:entity_id>')
+def entity_activity(entity_type, entity_id):
+    """API endpoint for an entity's activity, newest first (archived entries included unless include_archived=0)"""
+    try:
+        conn = get_db_connection()
+        entries = activity_for(
+            conn, entity_type, entity_id,
+            activity_type=request.args.get('activity_type') or None,
+            include_archived=request.args.get('include_archived', '1') not in ('0', 'false'),
+            limit=min(request.args.get('limit', 100, type=int), 1000)
+        )
+        return jsonify({'success': True, 'activity': entries, 'archive': archive_stats(conn)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/sync_to_notion/<int:job_id>', methods=['POST'])
 def sync_to_notion(job_id):
     """API endpoint to sync a job to Notion"""
@@ -364,74 +935,33 @@ def create_reading_list():
 
 @app.route('/applications')
 def applications_list():
-    """List all applications"""
+    """List applications, most recent first, one keyset page at a time"""
     conn = get_db_connection()
 
-    applications = conn.execute("""
-        SELECT
-            a.*,
-            j.title as job_title,
-            c.name as company_name,
-            j.ai_score
-        FROM applications a
-        JOIN job_opportunities j ON a.job_id = j.id
-        JOIN companies c ON j.company_id = c.id
-        ORDER BY a.application_date DESC
-    """).fetchall()
-
-    conn.close()
+    try:
+        page = applications_page(conn, request.args.get('status', ''), request.args.get('cursor'),
+                                 request.args.get('limit', type=int))
+    except ValueError:
+        flash('That page link has expired; showing the first page', 'warning')
+        return redirect(url_for('applications_list'))
 
-    return render_template('applications_list.html', applications=applications)
+    return render_template('applications_list.html', applications=page.items, next_cursor=page.next_cursor)
 
 @app.route('/analytics')
+@conditional('job_opportunities')
 def analytics():
     """Analytics dashboard"""
     conn = get_db_connection()
 
-    # Score distribution
-    score_distribution = conn.execute("""
-        SELECT
-            CASE
-                WHEN ai_score >= 90 THEN '90-100'
-                WHEN ai_score >= 80 THEN '80-89'
-                WHEN ai_score >= 70 THEN '70-79'
-                WHEN ai_score >= 60 THEN '60-69'
-                WHEN ai_score >= 50 THEN '50-59'
-                ELSE '0-49'
-            END as score_range,
-            COUNT(*) as count
-        FROM job_opportunities
-        GROUP BY score_range
-        ORDER BY score_range DESC
-    """).fetchall()
-
-    # Source analysis
-    source_analysis = conn.execute("""
-        SELECT source, COUNT(*) as count, AVG(ai_score) as avg_score
-        FROM job_opportunities
-        WHERE source IS NOT NULL AND source != ''
-        GROUP BY source
-        ORDER BY count DESC
-    """).fetchall()
-
-    # Monthly trends
-    monthly_trends = conn.execute("""
-        SELECT
-            strftime('%Y-%m', created_at) as month,
-            COUNT(*) as jobs_added,
-            AVG(ai_score) as avg_score
-        FROM job_opportunities
-        GROUP BY month
-        ORDER BY month DESC
-        LIMIT 12
-    """).fetchall()
-
-    conn.close()
-
-    return render_template('analytics.html',
-                         score_distribution=score_distribution,
-                         source_analysis=source_analysis,
-                         monthly_trends=monthly_trends)
+    # Rollup tables maintained by the trg_analytics_* triggers (python3 -m src.analytics rebuilds them)
+    return render_template('analytics.html', **query_cache.get_or_load(
+        conn, 'analytics', ['job_opportunities'],
+        lambda: {
+            'score_distribution': score_distribution(conn),
+            'source_analysis': source_analysis(conn),
+            'monthly_trends': monthly_trends(conn)
+        }
+    ))
 
 @app.template_filter('datetime')
 def datetime_filter(value):
@@ -445,6 +975,13 @@ def datetime_filter(value):
             return value
     return value.strftime('%B %d, %Y')
 
+@app.template_filter('highlight')
+def highlight(snippet):
+    """Escape a search snippet and wrap its matches in <mark>"""
+    if not snippet:
+        return ''
+    return Markup(str(escape(snippet)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>'))
+
 @app.template_filter('priority_badge')
 def priority_badge(priority):
     """Priority badge classes"""
@@ -470,4 +1007,8 @@ def score_badge(score):
 
 if __name__ == '__main__':
     init_database()
+    start_background_rescore()
+    task_pool.start()
+    # Archive old activity once per start (a no-op until rows pass the retention window)
+    task_pool.submit('activity_compaction', {}, dedupe_key='activity')
     app.run(debug=True, port=5001)
\ No newline at end of file
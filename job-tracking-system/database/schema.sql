@@ -5,12 +5,14 @@
 CREATE TABLE companies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name VARCHAR(255) NOT NULL,
+    normalized_name VARCHAR(255), -- canonical key from src/company_resolver.py
     industry VARCHAR(100),
     size VARCHAR(50), -- startup, small, medium, large, enterprise
     location VARCHAR(255),
     website VARCHAR(255),
     description TEXT,
     culture_notes TEXT,
+    notion_page_id VARCHAR(64), -- Notion companies page, cached by the sync
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -39,6 +41,9 @@ CREATE TABLE job_opportunities (
     manual_score INTEGER, -- optional manual override
     priority VARCHAR(20) DEFAULT 'medium', -- low, medium, high, urgent
     notes TEXT,
+    score_fingerprint VARCHAR(64), -- hash of the scored fields when ai_score was computed
+    scored_profile_version VARCHAR(64), -- scoring profile version that produced ai_score (NULL = stale)
+    duplicate_of INTEGER, -- canonical job this posting is a near-duplicate of (see src/dedupe.py)
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (company_id) REFERENCES companies (id)
@@ -56,6 +61,15 @@ CREATE TABLE job_requirements (
     FOREIGN KEY (job_id) REFERENCES job_opportunities (id)
 );
 
+-- Common requirements (MBA, PhD, ...) named by each requirement line; a line can name several
+CREATE TABLE job_requirement_terms (
+    term VARCHAR(100) NOT NULL COLLATE NOCASE, -- 'mba' finds 'MBA'
+    requirement_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (term, requirement_id),
+    FOREIGN KEY (requirement_id) REFERENCES job_requirements (id)
+) WITHOUT ROWID;
+
 -- Application tracking
 CREATE TABLE applications (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -110,6 +124,165 @@ CREATE TABLE my_profile (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Category and fit weights for the scoring algorithm (loaded with my_profile into the profile index)
+CREATE TABLE scoring_weights (
+    component VARCHAR(100) PRIMARY KEY, -- skill category or industry_fit, role_level, location_fit
+    weight REAL NOT NULL
+);
+
+INSERT INTO scoring_weights (component, weight) VALUES
+    ('executive_leadership', 0.25),
+    ('ai_technology', 0.30),
+    ('design_innovation', 0.25),
+    ('consulting_business', 0.20),
+    ('industry_fit', 0.10),
+    ('role_level', 0.10),
+    ('location_fit', 0.05);
+
+-- Revision counter bumped by triggers on my_profile/scoring_weights so the scorer knows when to reload
+CREATE TABLE scoring_profile_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO scoring_profile_state (id, revision) VALUES (1, 0);
+
+-- Snapshots of the scoring profile, used to work out which jobs a profile edit affects
+CREATE TABLE scoring_profile_versions (
+    version VARCHAR(64) PRIMARY KEY,
+    profile TEXT NOT NULL, -- JSON snapshot of skills, weights and preferences
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Current score of each job, one row per job with a column per breakdown component
+CREATE TABLE job_scores (
+    job_id INTEGER PRIMARY KEY,
+    total_score INTEGER NOT NULL,
+    executive_leadership INTEGER,
+    ai_technology INTEGER,
+    design_innovation INTEGER,
+    consulting_business INTEGER,
+    industry_fit INTEGER,
+    role_level INTEGER,
+    location_fit INTEGER,
+    strong_matches TEXT, -- JSON list
+    missing_requirements TEXT, -- JSON list
+    recommendations TEXT, -- JSON list
+    fingerprint VARCHAR(64), -- content fingerprint the score was computed from
+    profile_version VARCHAR(64), -- profile version that computed the score
+    scored_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (job_id) REFERENCES job_opportunities (id)
+);
+
+-- Revision counter bumped by triggers on job_scores so cached score matrices know when to reload
+CREATE TABLE job_scores_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO job_scores_state (id, revision) VALUES (1, 0);
+
+-- Dashboard counters, kept current by the trg_dashboard_* triggers
+CREATE TABLE dashboard_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_jobs INTEGER NOT NULL DEFAULT 0,
+    high_priority INTEGER NOT NULL DEFAULT 0, -- priority = 'high' OR ai_score >= 80
+    applications_sent INTEGER NOT NULL DEFAULT 0,
+    interviews_scheduled INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO dashboard_stats (id) VALUES (1);
+
+-- Analytics rollups (src/analytics.py), kept current by the trg_analytics_* triggers
+CREATE TABLE analytics_score_buckets (
+    bucket INTEGER PRIMARY KEY, -- 0 (0-49), 50, 60, 70, 80, 90 (90-100)
+    jobs INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE analytics_sources (
+    source VARCHAR(100) PRIMARY KEY,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    scored_jobs INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE analytics_months (
+    month CHAR(7) PRIMARY KEY, -- YYYY-MM of created_at
+    jobs_added INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    scored_jobs INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Change counter per table, bumped by the trg_versions_* triggers (ETag/Last-Modified for pages)
+CREATE TABLE table_versions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID;
+
+INSERT INTO table_versions (table_name) VALUES
+    ('job_opportunities'),
+    ('companies'),
+    ('applications'),
+    ('interviews'),
+    ('job_scores'),
+    ('generated_documents');
+
+-- Score of each job under each profile version it was scored with
+CREATE TABLE job_score_history (
+    job_id INTEGER NOT NULL,
+    profile_version VARCHAR(64) NOT NULL,
+    total_score INTEGER NOT NULL,
+    executive_leadership INTEGER,
+    ai_technology INTEGER,
+    design_innovation INTEGER,
+    consulting_business INTEGER,
+    industry_fit INTEGER,
+    role_level INTEGER,
+    location_fit INTEGER,
+    scored_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, profile_version)
+) WITHOUT ROWID;
+
+-- MinHash signature of each job's title/description/requirements
+CREATE TABLE job_minhash (
+    job_id INTEGER PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL, -- text the signature was computed from
+    signature BLOB NOT NULL, -- 64 little-endian uint32 minimum hashes
+    FOREIGN KEY (job_id) REFERENCES job_opportunities (id)
+);
+
+-- LSH band index over the signatures: jobs sharing a (band, bucket) are duplicate candidates
+CREATE TABLE job_lsh_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, job_id)
+) WITHOUT ROWID;
+
+-- Full-text index over postings and company names (rowid = job_opportunities.id),
+-- kept in sync by the trg_job_search_* triggers
+CREATE VIRTUAL TABLE job_search USING fts5(
+    title, job_description, requirements, notes, company_name,
+    tokenize = 'porter unicode61'
+);
+
+-- Trigram index over companies.normalized_name for fuzzy company matching
+CREATE TABLE company_trigrams (
+    trigram CHAR(3) NOT NULL,
+    company_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, company_id),
+    FOREIGN KEY (company_id) REFERENCES companies (id)
+) WITHOUT ROWID;
+
+-- Other names for a company ("ANZ Bank" -> ANZ), keyed like companies.normalized_name
+CREATE TABLE company_aliases (
+    alias_key VARCHAR(255) PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (company_id) REFERENCES companies (id)
+);
+
 -- Generated documents tracking
 CREATE TABLE generated_documents (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -170,20 +343,75 @@ CREATE TABLE activity_log (
     entity_id INTEGER,
     description TEXT NOT NULL,
     metadata TEXT, -- JSON for additional data
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    folder_path VARCHAR(500) GENERATED ALWAYS AS (CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.folder_path') END) VIRTUAL,
+    notion_page_id VARCHAR(64) GENERATED ALWAYS AS (CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.notion_page_id') END) VIRTUAL
+);
+
+-- Activity older than the retention window, in compressed segments (src/activity_log.py)
+CREATE TABLE activity_archive (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    first_created_at DATETIME,
+    last_created_at DATETIME,
+    row_count INTEGER NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    payload BLOB NOT NULL, -- zlib-compressed JSON {"columns": [...], "rows": [...]}
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
+CREATE TABLE activity_archive_entities (
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    activity_type VARCHAR(100) NOT NULL,
+    segment_id INTEGER NOT NULL,
+    PRIMARY KEY (entity_type, entity_id, activity_type, segment_id)
+) WITHOUT ROWID;
+
+-- Background tasks (src/task_queue.py)
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_type VARCHAR(50) NOT NULL, -- handler name, e.g. application_package
+    dedupe_key VARCHAR(255), -- at most one queued/running task per (task_type, dedupe_key)
+    payload TEXT, -- JSON arguments for the handler
+    status VARCHAR(20) DEFAULT 'queued', -- queued, running, succeeded, failed
+    progress INTEGER DEFAULT 0, -- 0-100
+    progress_message TEXT,
+    result TEXT, -- JSON returned by the handler
+    error TEXT, -- last failure
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    run_after DATETIME DEFAULT CURRENT_TIMESTAMP, -- retries are pushed back with exponential backoff
+    locked_by VARCHAR(64), -- worker running it
+    locked_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME
+);
 
 -- Indexes for performance
+CREATE UNIQUE INDEX idx_companies_normalized_name ON companies(normalized_name);
 CREATE INDEX idx_jobs_company ON job_opportunities(company_id);
-CREATE INDEX idx_jobs_status ON job_opportunities(status);
-CREATE INDEX idx_jobs_score ON job_opportunities(ai_score DESC);
-CREATE INDEX idx_jobs_priority ON job_opportunities(priority);
+-- Keyset pagination: each list sort (optionally after an equality filter) ends in id DESC
+CREATE INDEX idx_jobs_ranked ON job_opportunities(COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+CREATE INDEX idx_jobs_status_ranked ON job_opportunities(status, COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+CREATE INDEX idx_jobs_priority_ranked ON job_opportunities(priority, COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+CREATE INDEX idx_jobs_profile_version ON job_opportunities(scored_profile_version);
+CREATE INDEX idx_job_requirements_job ON job_requirements(job_id, importance, match_score);
+CREATE INDEX idx_job_requirement_terms_job ON job_requirement_terms(job_id);
+CREATE INDEX idx_jobs_duplicate_of ON job_opportunities(duplicate_of);
+CREATE INDEX idx_lsh_bands_job ON job_lsh_bands(job_id);
 CREATE INDEX idx_applications_job ON applications(job_id);
-CREATE INDEX idx_applications_status ON applications(status);
+CREATE INDEX idx_applications_recent ON applications(application_date DESC, id DESC);
+CREATE INDEX idx_applications_status_recent ON applications(status, application_date DESC, id DESC);
 CREATE INDEX idx_interviews_application ON interviews(application_id);
 CREATE INDEX idx_profile_category ON my_profile(category);
 CREATE INDEX idx_activity_type ON activity_log(activity_type);
 CREATE INDEX idx_activity_date ON activity_log(created_at DESC);
+CREATE INDEX idx_activity_entity ON activity_log(entity_type, entity_id, activity_type, created_at);
+CREATE INDEX idx_activity_notion_page ON activity_log(notion_page_id) WHERE notion_page_id IS NOT NULL;
+CREATE INDEX idx_tasks_ready ON tasks(status, run_after, id);
+CREATE UNIQUE INDEX idx_tasks_active_key ON tasks(task_type, dedupe_key) WHERE status IN ('queued', 'running');
 
 -- Views for common queries
 CREATE VIEW job_summary AS
@@ -221,4 +449,186 @@ JOIN job_opportunities j ON a.job_id = j.id
 JOIN companies c ON j.company_id = c.id
 LEFT JOIN interviews i ON a.id = i.application_id
 GROUP BY a.id
-ORDER BY a.application_date DESC;
\ No newline at end of file
+ORDER BY a.application_date DESC;
+
+-- Profile change tracking for the scoring profile index
+CREATE TRIGGER trg_my_profile_insert AFTER INSERT ON my_profile
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_my_profile_update AFTER UPDATE ON my_profile
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_my_profile_delete AFTER DELETE ON my_profile
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_scoring_weights_insert AFTER INSERT ON scoring_weights
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_scoring_weights_update AFTER UPDATE ON scoring_weights
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_scoring_weights_delete AFTER DELETE ON scoring_weights
+BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+
+CREATE TRIGGER trg_job_scores_insert AFTER INSERT ON job_scores
+BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_job_scores_update AFTER UPDATE ON job_scores
+BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_job_scores_delete AFTER DELETE ON job_scores
+BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+
+CREATE TRIGGER trg_job_search_insert AFTER INSERT ON job_opportunities
+BEGIN
+    INSERT INTO job_search (rowid, title, job_description, requirements, notes, company_name)
+    VALUES (new.id, new.title, new.job_description, new.requirements, new.notes,
+            (SELECT name FROM companies WHERE id = new.company_id));
+END;
+CREATE TRIGGER trg_job_search_update
+AFTER UPDATE OF title, job_description, requirements, notes, company_id ON job_opportunities
+BEGIN
+    UPDATE job_search SET
+        title = new.title, job_description = new.job_description,
+        requirements = new.requirements, notes = new.notes,
+        company_name = (SELECT name FROM companies WHERE id = new.company_id)
+    WHERE rowid = new.id;
+END;
+CREATE TRIGGER trg_job_search_delete AFTER DELETE ON job_opportunities
+BEGIN
+    DELETE FROM job_search WHERE rowid = old.id;
+END;
+CREATE TRIGGER trg_job_search_company AFTER UPDATE OF name ON companies
+BEGIN
+    UPDATE job_search SET company_name = new.name
+    WHERE rowid IN (SELECT id FROM job_opportunities WHERE company_id = new.id);
+END;
+
+CREATE TRIGGER trg_company_trigrams_delete AFTER DELETE ON companies
+BEGIN
+    DELETE FROM company_trigrams WHERE company_id = old.id;
+END;
+
+CREATE TRIGGER trg_company_aliases_delete AFTER DELETE ON companies
+BEGIN
+    DELETE FROM company_aliases WHERE company_id = old.id;
+END;
+
+-- Near-duplicate index: a deleted job leaves no signature, buckets or duplicate_of links behind
+CREATE TRIGGER trg_job_dedupe_delete AFTER DELETE ON job_opportunities
+BEGIN
+    DELETE FROM job_minhash WHERE job_id = old.id;
+    DELETE FROM job_lsh_bands WHERE job_id = old.id;
+    UPDATE job_opportunities SET duplicate_of = NULL WHERE duplicate_of = old.id;
+END;
+
+-- Dashboard counters
+CREATE TRIGGER trg_dashboard_jobs_insert AFTER INSERT ON job_opportunities
+BEGIN
+    UPDATE dashboard_stats SET total_jobs = total_jobs + 1,
+        high_priority = high_priority + COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+    WHERE id = 1;
+END;
+CREATE TRIGGER trg_dashboard_jobs_update AFTER UPDATE OF priority, ai_score ON job_opportunities
+WHEN COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0) != COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+BEGIN
+    UPDATE dashboard_stats SET high_priority = high_priority
+        - COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0)
+        + COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+    WHERE id = 1;
+END;
+CREATE TRIGGER trg_dashboard_jobs_delete AFTER DELETE ON job_opportunities
+BEGIN
+    UPDATE dashboard_stats SET total_jobs = total_jobs - 1,
+        high_priority = high_priority - COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0)
+    WHERE id = 1;
+END;
+CREATE TRIGGER trg_dashboard_applications_insert AFTER INSERT ON applications
+BEGIN UPDATE dashboard_stats SET applications_sent = applications_sent + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_dashboard_applications_delete AFTER DELETE ON applications
+BEGIN UPDATE dashboard_stats SET applications_sent = applications_sent - 1 WHERE id = 1; END;
+CREATE TRIGGER trg_dashboard_interviews_insert AFTER INSERT ON interviews
+BEGIN UPDATE dashboard_stats SET interviews_scheduled = interviews_scheduled + 1 WHERE id = 1; END;
+CREATE TRIGGER trg_dashboard_interviews_delete AFTER DELETE ON interviews
+BEGIN UPDATE dashboard_stats SET interviews_scheduled = interviews_scheduled - 1 WHERE id = 1; END;
+
+-- Analytics rollups
+CREATE TRIGGER trg_analytics_jobs_insert AFTER INSERT ON job_opportunities
+BEGIN
+    INSERT INTO analytics_score_buckets (bucket, jobs) VALUES (CASE WHEN new.ai_score >= 50 THEN MIN(CAST(new.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END, 1)
+    ON CONFLICT(bucket) DO UPDATE SET jobs = jobs + 1;
+    INSERT INTO analytics_sources (source, jobs, score_sum, scored_jobs)
+    SELECT new.source, 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL WHERE COALESCE(new.source, '') != ''
+    ON CONFLICT(source) DO UPDATE SET jobs = jobs + 1, score_sum = score_sum + excluded.score_sum,
+        scored_jobs = scored_jobs + excluded.scored_jobs;
+    INSERT INTO analytics_months (month, jobs_added, score_sum, scored_jobs)
+    SELECT strftime('%Y-%m', new.created_at), 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL
+    WHERE new.created_at IS NOT NULL
+    ON CONFLICT(month) DO UPDATE SET jobs_added = jobs_added + 1, score_sum = score_sum + excluded.score_sum,
+        scored_jobs = scored_jobs + excluded.scored_jobs;
+END;
+CREATE TRIGGER trg_analytics_jobs_update AFTER UPDATE OF ai_score, source, created_at ON job_opportunities
+WHEN old.ai_score IS NOT new.ai_score OR old.source IS NOT new.source OR old.created_at IS NOT new.created_at
+BEGIN
+    UPDATE analytics_score_buckets SET jobs = jobs - 1 WHERE bucket = CASE WHEN old.ai_score >= 50 THEN MIN(CAST(old.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END;
+    UPDATE analytics_sources SET jobs = jobs - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+        scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+    WHERE source = old.source;
+    UPDATE analytics_months SET jobs_added = jobs_added - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+        scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+    WHERE month = strftime('%Y-%m', old.created_at);
+    DELETE FROM analytics_sources WHERE source = old.source AND jobs = 0;
+    INSERT INTO analytics_score_buckets (bucket, jobs) VALUES (CASE WHEN new.ai_score >= 50 THEN MIN(CAST(new.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END, 1)
+    ON CONFLICT(bucket) DO UPDATE SET jobs = jobs + 1;
+    INSERT INTO analytics_sources (source, jobs, score_sum, scored_jobs)
+    SELECT new.source, 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL WHERE COALESCE(new.source, '') != ''
+    ON CONFLICT(source) DO UPDATE SET jobs = jobs + 1, score_sum = score_sum + excluded.score_sum,
+        scored_jobs = scored_jobs + excluded.scored_jobs;
+    INSERT INTO analytics_months (month, jobs_added, score_sum, scored_jobs)
+    SELECT strftime('%Y-%m', new.created_at), 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL
+    WHERE new.created_at IS NOT NULL
+    ON CONFLICT(month) DO UPDATE SET jobs_added = jobs_added + 1, score_sum = score_sum + excluded.score_sum,
+        scored_jobs = scored_jobs + excluded.scored_jobs;
+END;
+CREATE TRIGGER trg_analytics_jobs_delete AFTER DELETE ON job_opportunities
+BEGIN
+    UPDATE analytics_score_buckets SET jobs = jobs - 1 WHERE bucket = CASE WHEN old.ai_score >= 50 THEN MIN(CAST(old.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END;
+    UPDATE analytics_sources SET jobs = jobs - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+        scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+    WHERE source = old.source;
+    UPDATE analytics_months SET jobs_added = jobs_added - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+        scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+    WHERE month = strftime('%Y-%m', old.created_at);
+    DELETE FROM analytics_sources WHERE source = old.source AND jobs = 0;
+END;
+
+-- Table change counters
+CREATE TRIGGER trg_versions_job_opportunities_insert AFTER INSERT ON job_opportunities
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_opportunities'; END;
+CREATE TRIGGER trg_versions_job_opportunities_update AFTER UPDATE ON job_opportunities
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_opportunities'; END;
+CREATE TRIGGER trg_versions_job_opportunities_delete AFTER DELETE ON job_opportunities
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_opportunities'; END;
+CREATE TRIGGER trg_versions_companies_insert AFTER INSERT ON companies
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'companies'; END;
+CREATE TRIGGER trg_versions_companies_update AFTER UPDATE ON companies
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'companies'; END;
+CREATE TRIGGER trg_versions_companies_delete AFTER DELETE ON companies
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'companies'; END;
+CREATE TRIGGER trg_versions_applications_insert AFTER INSERT ON applications
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'applications'; END;
+CREATE TRIGGER trg_versions_applications_update AFTER UPDATE ON applications
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'applications'; END;
+CREATE TRIGGER trg_versions_applications_delete AFTER DELETE ON applications
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'applications'; END;
+CREATE TRIGGER trg_versions_interviews_insert AFTER INSERT ON interviews
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'interviews'; END;
+CREATE TRIGGER trg_versions_interviews_update AFTER UPDATE ON interviews
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'interviews'; END;
+CREATE TRIGGER trg_versions_interviews_delete AFTER DELETE ON interviews
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'interviews'; END;
+CREATE TRIGGER trg_versions_job_scores_insert AFTER INSERT ON job_scores
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_scores'; END;
+CREATE TRIGGER trg_versions_job_scores_update AFTER UPDATE ON job_scores
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_scores'; END;
+CREATE TRIGGER trg_versions_job_scores_delete AFTER DELETE ON job_scores
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'job_scores'; END;
+CREATE TRIGGER trg_versions_generated_documents_insert AFTER INSERT ON generated_documents
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'generated_documents'; END;
+CREATE TRIGGER trg_versions_generated_documents_update AFTER UPDATE ON generated_documents
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'generated_documents'; END;
+CREATE TRIGGER trg_versions_generated_documents_delete AFTER DELETE ON generated_documents
+BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP WHERE table_name = 'generated_documents'; END;
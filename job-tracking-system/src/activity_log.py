@@ -0,0 +1,163 @@
+"""
+Activity Log
+Indexed lookups over activity_log, and retention that moves old rows into compressed archive segments
+"""
+
+import json
+import os
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .db import connection
+
+# ACTIVITY_RETENTION_DAYS sets how long rows stay in the hot table
+DEFAULT_RETENTION_DAYS = 90
+SEGMENT_ROWS = 5000
+
+# Stored in every archived row; folder_path/notion_page_id are the generated (indexed) JSON fields
+ACTIVITY_COLUMNS = ('id', 'activity_type', 'entity_type', 'entity_id', 'description', 'metadata',
+                    'created_at', 'folder_path', 'notion_page_id')
+
+
+@dataclass
+class CompactionReport:
+    rows_archived: int = 0
+    segments_written: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+
+def retention_days() -> int:
+    """Retention window from ACTIVITY_RETENTION_DAYS, falling back to DEFAULT_RETENTION_DAYS"""
+    configured = os.getenv('ACTIVITY_RETENTION_DAYS')
+    return max(int(configured), 1) if configured else DEFAULT_RETENTION_DAYS
+
+
+def _segment_rows(conn: sqlite3.Connection, segment_id: int) -> List[Dict]:
+    payload = conn.execute("SELECT payload FROM activity_archive WHERE id = ?", (segment_id,)).fetchone()
+    if payload is None:
+        return []
+    segment = json.loads(zlib.decompress(payload[0]))
+    return [dict(zip(segment['columns'], row)) for row in segment['rows']]
+
+
+def archived_activity(conn: sqlite3.Connection, entity_type: str, entity_id: int,
+                      activity_type: Optional[str] = None) -> List[Dict]:
+    """Archived entries for an entity, oldest first (only the segments that hold it are decompressed)"""
+    sql = "SELECT DISTINCT segment_id FROM activity_archive_entities WHERE entity_type = ? AND entity_id = ?"
+    params: List = [entity_type, entity_id]
+    if activity_type:
+        sql += " AND activity_type = ?"
+        params.append(activity_type)
+
+    entries = []
+    for (segment_id,) in conn.execute(sql + " ORDER BY segment_id", params).fetchall():
+        entries += [row for row in _segment_rows(conn, segment_id)
+                    if row['entity_type'] == entity_type and row['entity_id'] == entity_id
+                    and (not activity_type or row['activity_type'] == activity_type)]
+    entries.sort(key=lambda row: (row['created_at'] or '', row['id']))
+    return entries
+
+
+def activity_for(conn: sqlite3.Connection, entity_type: str, entity_id: int, activity_type: Optional[str] = None,
+                 include_archived: bool = True, limit: int = 100) -> List[Dict]:
+    """Newest entries for an entity from the hot log (indexed), then the archive"""
+    columns = ', '.join(ACTIVITY_COLUMNS)
+    sql = f"SELECT {columns} FROM activity_log WHERE entity_type = ? AND entity_id = ?"
+    params: List = [entity_type, entity_id]
+    if activity_type:
+        sql += " AND activity_type = ?"
+        params.append(activity_type)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.append(limit)
+
+    entries = [dict(zip(ACTIVITY_COLUMNS, row)) for row in conn.execute(sql, params).fetchall()]
+    if include_archived and len(entries) < limit:
+        entries += list(reversed(archived_activity(conn, entity_type, entity_id, activity_type)))[:limit - len(entries)]
+    return entries
+
+
+def latest_activity(conn: sqlite3.Connection, entity_type: str, entity_id: int,
+                    activity_type: str) -> Optional[Dict]:
+    """Most recent entry of one type for an entity, looking in the archive if the hot log has none"""
+    entries = activity_for(conn, entity_type, entity_id, activity_type, limit=1)
+    return entries[0] if entries else None
+
+
+def compact_activity_log(db_path: str, days: Optional[int] = None,
+                         segment_rows: int = SEGMENT_ROWS) -> CompactionReport:
+    """
+    Move rows older than the retention window into zlib-compressed archive segments
+
+    Each segment (one transaction) holds up to ``segment_rows`` rows as JSON, and
+    activity_archive_entities indexes which segments mention each entity, so
+    archived_activity() only decompresses the segments it needs.
+    """
+    cutoff = f'-{days or retention_days()} days'
+    columns = ', '.join(ACTIVITY_COLUMNS)
+    report = CompactionReport()
+
+    while True:
+        with connection(db_path) as conn:
+            rows = conn.execute(f"""
+                SELECT {columns} FROM activity_log
+                WHERE created_at < datetime('now', ?)
+                ORDER BY created_at
+                LIMIT ?
+            """, (cutoff, segment_rows)).fetchall()
+            if not rows:
+                break
+
+            raw = json.dumps({'columns': ACTIVITY_COLUMNS, 'rows': rows}, ensure_ascii=False).encode('utf-8')
+            payload = zlib.compress(raw, 9)
+            ids = [row[0] for row in rows]
+            created = [row[6] for row in rows if row[6]]
+            segment_id = conn.execute("""
+                INSERT INTO activity_archive
+                (first_id, last_id, first_created_at, last_created_at, row_count, raw_bytes, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (min(ids), max(ids), min(created, default=None), max(created, default=None),
+                  len(rows), len(raw), payload)).lastrowid
+
+            conn.executemany("""
+                INSERT OR IGNORE INTO activity_archive_entities (entity_type, entity_id, activity_type, segment_id)
+                VALUES (?, ?, ?, ?)
+            """, {(row[2], row[3], row[1] or '', segment_id) for row in rows if row[2] and row[3] is not None})
+            conn.execute("DELETE FROM activity_log WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+
+        report.rows_archived += len(rows)
+        report.segments_written += 1
+        report.raw_bytes += len(raw)
+        report.compressed_bytes += len(payload)
+        if len(rows) < segment_rows:
+            break
+
+    return report
+
+
+def archive_stats(conn: sqlite3.Connection) -> Dict:
+    """Hot row count and archive size"""
+    hot_rows = conn.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0]
+    segments, archived_rows, raw_bytes, compressed_bytes = conn.execute("""
+        SELECT COUNT(*), COALESCE(SUM(row_count), 0), COALESCE(SUM(raw_bytes), 0),
+               COALESCE(SUM(LENGTH(payload)), 0)
+        FROM activity_archive
+    """).fetchone()
+    return {
+        'hot_rows': hot_rows,
+        'archived_rows': archived_rows,
+        'segments': segments,
+        'raw_bytes': raw_bytes,
+        'compressed_bytes': compressed_bytes,
+        'compression_ratio': round(raw_bytes / compressed_bytes, 1) if compressed_bytes else None,
+        'retention_days': retention_days()
+    }
+
+
+# Usage example:
+if __name__ == "__main__":
+    report = compact_activity_log("job_tracker.db")
+    print(f"Archived {report.rows_archived} activity rows into {report.segments_written} segments "
+          f"({report.raw_bytes} -> {report.compressed_bytes} bytes)")
@@ -0,0 +1,89 @@
+"""
+Analytics Rollups
+Score bucket, per-source and per-month aggregates kept current by triggers, read by /analytics
+"""
+
+import sqlite3
+from typing import Dict, List
+
+from .db import connection
+
+# Bucket of a job row: 0 for scores below 50, then 50, 60, 70, 80 and 90 (90-100)
+BUCKET_SQL = "CASE WHEN {row}.ai_score >= 50 THEN MIN(CAST({row}.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END"
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Recompute every rollup table from job_opportunities in one transaction (triggers keep them current)"""
+    job = BUCKET_SQL.format(row='j')
+    for sql in (
+        "DELETE FROM analytics_score_buckets",
+        "DELETE FROM analytics_sources",
+        "DELETE FROM analytics_months",
+        f"""
+            INSERT INTO analytics_score_buckets (bucket, jobs)
+            SELECT {job}, COUNT(*) FROM job_opportunities j GROUP BY 1
+        """,
+        """
+            INSERT INTO analytics_sources (source, jobs, score_sum, scored_jobs)
+            SELECT source, COUNT(*), COALESCE(SUM(ai_score), 0), COUNT(ai_score)
+            FROM job_opportunities
+            WHERE source IS NOT NULL AND source != ''
+            GROUP BY source
+        """,
+        """
+            INSERT INTO analytics_months (month, jobs_added, score_sum, scored_jobs)
+            SELECT strftime('%Y-%m', created_at), COUNT(*), COALESCE(SUM(ai_score), 0), COUNT(ai_score)
+            FROM job_opportunities
+            WHERE created_at IS NOT NULL
+            GROUP BY 1
+        """,
+    ):
+        conn.execute(sql)
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ('analytics_score_buckets', 'analytics_sources', 'analytics_months')
+    }
+
+
+def score_distribution(conn: sqlite3.Connection) -> List:
+    """Job counts per score range, highest range first"""
+    return conn.execute("""
+        SELECT
+            CASE bucket
+                WHEN 90 THEN '90-100'
+                WHEN 0 THEN '0-49'
+                ELSE bucket || '-' || (bucket + 9)
+            END as score_range,
+            jobs as count
+        FROM analytics_score_buckets
+        WHERE jobs > 0
+        ORDER BY bucket DESC
+    """).fetchall()
+
+
+def source_analysis(conn: sqlite3.Connection) -> List:
+    """Job count and average score per source, most jobs first"""
+    return conn.execute("""
+        SELECT source, jobs as count, CAST(score_sum AS REAL) / NULLIF(scored_jobs, 0) as avg_score
+        FROM analytics_sources
+        WHERE jobs > 0
+        ORDER BY count DESC
+    """).fetchall()
+
+
+def monthly_trends(conn: sqlite3.Connection, months: int = 12) -> List:
+    """Jobs added and average score for the latest months"""
+    return conn.execute("""
+        SELECT month, jobs_added, CAST(score_sum AS REAL) / NULLIF(scored_jobs, 0) as avg_score
+        FROM analytics_months
+        WHERE jobs_added > 0
+        ORDER BY month DESC
+        LIMIT ?
+    """, (months,)).fetchall()
+
+
+# Usage example:
+if __name__ == "__main__":
+    with connection("job_tracker.db") as conn:
+        counts = rebuild_rollups(conn)
+    print("Rebuilt analytics rollups: " + ', '.join(f"{table} ({rows} rows)" for table, rows in counts.items()))
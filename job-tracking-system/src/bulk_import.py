@@ -0,0 +1,217 @@
+"""
+Bulk Job Import
+Streams CSV/JSONL exports into job_opportunities in batched transactions
+"""
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .company_resolver import get_resolver
+from .db import connection
+from .dedupe import link_duplicate
+from .scoring_algorithm import JobScoringAlgorithm
+
+# Columns accepted from an import file, in job_opportunities insert order
+JOB_FIELDS = (
+    'title', 'level', 'employment_type', 'location', 'remote_option', 'salary_min', 'salary_max',
+    'currency', 'job_description', 'requirements', 'nice_to_have', 'source', 'source_url',
+    'posted_date', 'application_deadline', 'priority', 'notes'
+)
+
+# Common export headers mapped onto our column names
+FIELD_ALIASES = {
+    'company': 'company_name',
+    'employer': 'company_name',
+    'job_title': 'title',
+    'position': 'title',
+    'description': 'job_description',
+    'url': 'source_url',
+    'link': 'source_url',
+    'remote': 'remote_option',
+}
+
+PRIORITIES = ('low', 'medium', 'high', 'urgent')
+
+
+@dataclass
+class RejectedRow:
+    line: int
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    jobs_imported: int = 0
+    companies_created: int = 0
+    duplicates_linked: int = 0
+    jobs_scored: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+
+def parse_rows(f: TextIO, file_format: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line number, row) from an open CSV or JSONL text stream"""
+    if file_format == 'csv':
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format in ('jsonl', 'ndjson', 'json'):
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {'_error': f"Invalid JSON: {e.msg}"}
+            yield line_number, row if isinstance(row, dict) else {'_error': 'Expected a JSON object'}
+    else:
+        raise ValueError(f"Unsupported import format: {file_format}")
+
+
+def read_rows(path: str, file_format: Optional[str] = None) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line number, row) from a CSV or JSONL file without loading it into memory"""
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from parse_rows(f, file_format)
+
+
+def _clean_row(row: Dict) -> Dict:
+    """Lower-case, alias and strip the keys/values of one input row"""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip().lower().replace(' ', '_')
+        key = FIELD_ALIASES.get(key, key)
+        if isinstance(value, str):
+            value = value.strip()
+        cleaned[key] = value if value != '' else None
+    return cleaned
+
+
+def validate_row(row: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Return (job values, None) for a usable row or (None, reason) for a rejected one"""
+    if '_error' in row:
+        return None, row['_error']
+
+    row = _clean_row(row)
+    if not row.get('title'):
+        return None, 'Missing title'
+    if not row.get('company_name'):
+        return None, 'Missing company_name'
+
+    for name in ('salary_min', 'salary_max'):
+        if row.get(name) is not None:
+            try:
+                row[name] = int(float(str(row[name]).replace(',', '')))
+            except ValueError:
+                return None, f"Invalid {name}: {row[name]!r}"
+
+    priority = (row.get('priority') or 'medium').lower()
+    if priority not in PRIORITIES:
+        return None, f"Invalid priority: {row['priority']!r}"
+    row['priority'] = priority
+    row['currency'] = row.get('currency') or 'AUD'
+
+    return row, None
+
+
+def import_jobs(db_path: str, rows: Iterable[Tuple[int, Dict]], batch_size: int = 1000,
+                score: bool = False, dedupe: bool = False,
+                scorer: Optional[JobScoringAlgorithm] = None) -> ImportReport:
+    """
+    Insert (line number, row) pairs as job opportunities
+
+    Args:
+        rows: Typically read_rows(path); any iterable works, it is consumed once
+        batch_size: Jobs per transaction
+        score: Score each batch inline (same transaction as the insert)
+        dedupe: Index each job for near-duplicate detection and link reposts
+        scorer: Scorer to use when score=True (a new one for db_path by default)
+
+    Rejected rows are skipped and listed in the report with their line number.
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    if score:
+        scorer = scorer or JobScoringAlgorithm(db_path)
+        scorer.profile  # load the profile before this connection takes the write lock
+
+    columns = ', '.join(('company_id',) + JOB_FIELDS)
+    placeholders = ', '.join('?' for _ in range(len(JOB_FIELDS) + 1))
+    insert_sql = f"INSERT INTO job_opportunities ({columns}) VALUES ({placeholders})"
+
+    resolver = get_resolver(db_path)
+    with connection(db_path) as conn:
+        batch: List[Dict] = []
+
+        def flush():
+            if not batch:
+                return
+            conn.executemany(insert_sql, [
+                [job['company_id']] + [job.get(name) for name in JOB_FIELDS] for job in batch
+            ])
+            # The write lock is held for the whole batch, so AUTOINCREMENT ids are consecutive
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            for offset, job in enumerate(batch):
+                job['id'] = last_id - len(batch) + 1 + offset
+
+            if dedupe:
+                report.duplicates_linked += sum(1 for job in batch if link_duplicate(conn, job))
+            if score:
+                results = [(job['id'], scorer.score_job_data(job)) for job in batch]
+                scorer.write_scores(conn, results)
+                report.jobs_scored += len(results)
+
+            conn.commit()
+            resolver.settle(conn)  # cache the companies this batch created
+            report.jobs_imported += len(batch)
+            batch.clear()
+
+        for line_number, row in rows:
+            report.rows_read += 1
+            job, reason = validate_row(row)
+            if job is None:
+                report.rejected.append(RejectedRow(line_number, reason))
+                continue
+
+            company = resolver.resolve(conn, job['company_name'], job.get('industry'))
+            job['company_id'], job['industry'] = company.id, company.industry
+            report.companies_created += company.created
+            batch.append(job)
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    report.rows_per_second = report.rows_read / report.elapsed_seconds if report.elapsed_seconds > 0 else 0.0
+    return report
+
+
+def import_file(db_path: str, path: str, **options) -> ImportReport:
+    """Stream one CSV/JSONL file into the database (see import_jobs for options)"""
+    return import_jobs(db_path, read_rows(path), **options)
+
+
+# Usage example:
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m src.bulk_import <file.csv|file.jsonl> [--score] [--dedupe]")
+        sys.exit(1)
+
+    report = import_file("job_tracker.db", sys.argv[1],
+                         score='--score' in sys.argv, dedupe='--dedupe' in sys.argv)
+    print(f"Imported {report.jobs_imported} of {report.rows_read} rows in {report.elapsed_seconds:.1f}s "
+          f"({report.rows_per_second:.0f} rows/s), {report.companies_created} new companies, "
+          f"{report.duplicates_linked} duplicates linked, {report.jobs_scored} scored")
+    for rejected in report.rejected[:20]:
+        print(f"  ❌ line {rejected.line}: {rejected.reason}")
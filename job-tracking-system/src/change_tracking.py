@@ -0,0 +1,63 @@
+"""
+Change Tracking
+Per-table change counters (bumped by triggers) that give pages a cheap version for ETag/Last-Modified
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from .db import connection
+
+# Tables with trg_versions_* triggers; pages can only declare dependencies on these.
+# job_requirements is left out: write_scores replaces it together with the job_scores row.
+TRACKED_TABLES = (
+    'job_opportunities', 'companies', 'applications', 'interviews',
+    'job_scores', 'generated_documents',
+)
+
+
+@dataclass
+class DataVersion:
+    token: str                       # changes whenever any of the tables changes
+    last_modified: Optional[datetime]
+
+    def etag(self, *parts: str) -> str:
+        """ETag for a representation of this data (parts: URL, salt, ...)"""
+        return hashlib.sha1('|'.join((self.token,) + parts).encode('utf-8')).hexdigest()[:20]
+
+
+def data_version(conn: sqlite3.Connection, tables: Iterable[str]) -> Optional[DataVersion]:
+    """Combined version of some tracked tables, or None if the counters aren't available"""
+    tables = sorted(set(tables))
+    unknown = set(tables) - set(TRACKED_TABLES)
+    if unknown:
+        raise ValueError(f"Untracked tables: {', '.join(sorted(unknown))}")
+
+    placeholders = ', '.join('?' for _ in tables)
+    try:
+        rows = conn.execute(f"""
+            SELECT table_name, version, changed_at FROM table_versions
+            WHERE table_name IN ({placeholders})
+            ORDER BY table_name
+        """, tables).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    if len(rows) != len(tables):
+        return None
+
+    changed = [row[2] for row in rows if row[2]]
+    last_modified = None
+    if changed:
+        last_modified = datetime.strptime(max(changed), '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    return DataVersion(token=','.join(f"{row[0]}:{row[1]}" for row in rows), last_modified=last_modified)
+
+
+# Usage example:
+if __name__ == "__main__":
+    with connection("job_tracker.db") as conn:
+        version = data_version(conn, TRACKED_TABLES)
+    if version:
+        print(f"{version.token} (last modified {version.last_modified})")
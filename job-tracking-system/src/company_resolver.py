@@ -0,0 +1,332 @@
+"""
+Company Entity Resolution
+Maps free-text company names onto one canonical companies row via a normalized key, trigram fuzzy matching and an LRU cache
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .db import RELEASE_LISTENERS, connection
+
+# Trailing legal forms ("Acme Pty Ltd"). Ordinary words such as "Bank" or "Group" stay in the key:
+# "National Australia Bank" and "Westpac Group" are employers in their own right. Other spellings of
+# one employer ("ANZ Bank" for ANZ) go in company_aliases instead (add_company_alias)
+COMPANY_SUFFIXES = {
+    'pty', 'ltd', 'limited', 'inc', 'incorporated', 'llc', 'llp', 'plc', 'corp', 'corporation',
+    'co', 'gmbh', 'pte',
+}
+
+# Dice coefficient over name trigrams above which a new name is treated as a typo of an existing company
+FUZZY_THRESHOLD = 0.8
+# Shorter keys are only matched exactly: one changed letter in "anz" is a different company
+FUZZY_MIN_LENGTH = 5
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+@dataclass
+class CompanyMatch:
+    id: int
+    name: str
+    industry: Optional[str]
+    created: bool = False
+    similarity: float = 1.0
+
+
+def normalize_company_name(name: str) -> str:
+    """Canonical key for a company name: 'ANZ', 'anz' and 'A.N.Z. Pty Ltd' all become 'anz'"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower().replace('&', ' and ')
+    words = _NON_ALNUM_RE.sub(' ', text.replace('.', '')).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words) or (name or '').strip().lower()
+
+
+def trigrams(key: str) -> Set[str]:
+    """Distinct 3-character grams of a normalized key, padded so short words still produce some"""
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+
+def _index_trigrams(conn: sqlite3.Connection, company_id: int, key: str):
+    conn.executemany("INSERT OR IGNORE INTO company_trigrams (trigram, company_id) VALUES (?, ?)",
+                     [(gram, company_id) for gram in trigrams(key)])
+
+
+def find_similar(conn: sqlite3.Connection, name: str, limit: int = 5,
+                 threshold: float = 0.0) -> List[CompanyMatch]:
+    """Companies whose normalized name shares the most trigrams with name, best match first"""
+    key = normalize_company_name(name)
+    grams = trigrams(key)
+    # Dice >= threshold needs at least threshold * |A| / (2 - threshold) shared trigrams
+    min_shared = math.ceil(threshold * len(grams) / (2 - threshold))
+    rows = conn.execute("""
+        WITH candidates AS (
+            SELECT company_id, COUNT(*) AS shared
+            FROM company_trigrams
+            WHERE trigram IN (SELECT value FROM json_each(?))
+            GROUP BY company_id
+            HAVING shared >= ?
+            ORDER BY shared DESC
+            LIMIT ?
+        )
+        SELECT c.id, c.name, c.industry, c.normalized_name
+        FROM candidates
+        JOIN companies c ON c.id = candidates.company_id
+    """, (json.dumps(sorted(grams)), min_shared, max(limit, 20))).fetchall()
+
+    matches = [CompanyMatch(company_id, company_name, industry,
+                            similarity=_dice(grams, trigrams(normalized or '')))
+               for company_id, company_name, industry, normalized in rows]
+    matches = [match for match in matches if match.similarity >= threshold]
+    return sorted(matches, key=lambda match: (-match.similarity, match.id))[:limit]
+
+
+class CompanyResolver:
+    """
+    LRU cache of normalized key -> canonical company in front of the companies indexes
+
+    Only committed companies are cached: a lookup made inside an open transaction is
+    held per connection until settle() sees that transaction end (the pool calls it on
+    release), so a rolled-back insert can never leave its id behind for the next company.
+    Hits are served without a query; merging or aliasing companies goes through
+    clear_company_caches(), which empties every resolver.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._companies: 'OrderedDict[str, Tuple[int, str, Optional[str]]]' = OrderedDict()
+        self._pending: Dict[sqlite3.Connection, Dict[str, Tuple[int, str, Optional[str]]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _publish(self, key: str, company: Tuple[int, str, Optional[str]]):
+        self._companies[key] = company
+        self._companies.move_to_end(key)
+        while len(self._companies) > self.maxsize:
+            self._companies.popitem(last=False)
+
+    def _remember(self, conn: sqlite3.Connection, key: str, company: Tuple[int, str, Optional[str]]):
+        with self._lock:
+            if conn.in_transaction:
+                self._pending.setdefault(conn, {})[key] = company
+            else:
+                self._publish(key, company)
+
+    def _cached(self, key: str) -> Optional[Tuple[int, str, Optional[str]]]:
+        with self._lock:
+            company = self._companies.get(key)
+            if company is not None:
+                self._companies.move_to_end(key)
+            return company
+
+    def settle(self, conn: sqlite3.Connection):
+        """Cache what conn resolved in its last transaction, keeping only the companies that were committed"""
+        with self._lock:
+            if conn.in_transaction or conn not in self._pending:
+                return
+            pending = self._pending.pop(conn)
+        committed = {row[0]: tuple(row) for row in conn.execute(
+            "SELECT id, name, industry FROM companies WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([company[0] for company in pending.values()]),))}
+        with self._lock:
+            for key, company in pending.items():
+                if committed.get(company[0], (None, None))[1] == company[1]:
+                    self._publish(key, committed[company[0]])
+
+    def resolve(self, conn: sqlite3.Connection, name: str, industry: Optional[str] = None,
+                description: Optional[str] = None, create: bool = True) -> Optional[CompanyMatch]:
+        """
+        Canonical company for name, creating it if there is no exact or fuzzy match
+
+        Lookup order: cache, normalized_name unique index, company_aliases, trigram similarity
+        (FUZZY_THRESHOLD, keys of FUZZY_MIN_LENGTH or more), then INSERT when create is set.
+        The insert runs on conn, so it commits or rolls back with the caller's transaction
+        (and is cached only after it commits, see settle()).
+        """
+        key = normalize_company_name(name)
+        if not key:
+            return None
+
+        company = self._cached(key)
+        with self._lock:
+            if company is not None:
+                self.hits += 1
+                return CompanyMatch(*company)
+            self.misses += 1
+
+        row = conn.execute("SELECT id, name, industry FROM companies WHERE normalized_name = ?",
+                           (key,)).fetchone()
+        if row is None:
+            row = conn.execute("""
+                SELECT c.id, c.name, c.industry
+                FROM company_aliases a
+                JOIN companies c ON c.id = a.company_id
+                WHERE a.alias_key = ?
+            """, (key,)).fetchone()
+        if row:
+            self._remember(conn, key, tuple(row))
+            return CompanyMatch(*row)
+
+        if len(key) >= FUZZY_MIN_LENGTH:
+            similar = find_similar(conn, name, limit=1, threshold=FUZZY_THRESHOLD)
+            if similar:
+                match = similar[0]
+                self._remember(conn, key, (match.id, match.name, match.industry))
+                return match
+
+        if not create:
+            return None
+
+        cursor = conn.execute("""
+            INSERT INTO companies (name, normalized_name, industry, description)
+            VALUES (?, ?, ?, ?)
+        """, (name.strip(), key, industry or None, description or None))
+        _index_trigrams(conn, cursor.lastrowid, key)
+        self._remember(conn, key, (cursor.lastrowid, name.strip(), industry or None))
+        return CompanyMatch(cursor.lastrowid, name.strip(), industry or None, created=True)
+
+    def clear(self):
+        with self._lock:
+            self._companies.clear()
+            self._pending.clear()
+
+
+_resolvers: Dict[str, CompanyResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(db_path: str) -> CompanyResolver:
+    """Shared resolver for db_path, so the add form and the importers reuse one cache"""
+    with _resolvers_lock:
+        resolver = _resolvers.get(db_path)
+        if resolver is None:
+            resolver = _resolvers[db_path] = CompanyResolver()
+        return resolver
+
+
+def clear_company_caches():
+    """Empty every resolver (after companies are merged, renamed, deleted or aliased)"""
+    for resolver in list(_resolvers.values()):
+        resolver.clear()
+
+
+def add_company_alias(conn: sqlite3.Connection, alias: str, company_id: int) -> str:
+    """Make alias resolve to company_id ("ANZ Bank" -> ANZ); returns the alias key"""
+    key = normalize_company_name(alias)
+    if not key:
+        raise ValueError("Alias is empty")
+    if not conn.execute("SELECT 1 FROM companies WHERE id = ?", (company_id,)).fetchone():
+        raise ValueError(f"Company {company_id} not found")
+    owner = conn.execute("SELECT id FROM companies WHERE normalized_name = ?", (key,)).fetchone()
+    if owner and owner[0] != company_id:
+        raise ValueError(f"'{alias}' is already the name of company {owner[0]}; merge the companies instead")
+
+    conn.execute("INSERT OR REPLACE INTO company_aliases (alias_key, company_id) VALUES (?, ?)", (key, company_id))
+    clear_company_caches()
+    return key
+
+
+def _settle_released(db_path: str, conn: sqlite3.Connection):
+    resolver = _resolvers.get(db_path)
+    if resolver is not None:
+        resolver.settle(conn)
+
+
+RELEASE_LISTENERS.append(_settle_released)
+
+
+def merge_duplicate_companies(conn: sqlite3.Connection) -> int:
+    """
+    Collapse companies that share a normalized key into the oldest one
+
+    Jobs are repointed to the surviving company, and its empty fields are filled
+    from the merged rows. Returns the number of companies removed.
+    """
+    groups: Dict[str, List[int]] = {}
+    for company_id, name in conn.execute("SELECT id, name FROM companies ORDER BY id"):
+        groups.setdefault(normalize_company_name(name), []).append(company_id)
+
+    merged = 0
+    for ids in groups.values():
+        if len(ids) < 2:
+            continue
+        keep, others = ids[0], json.dumps(ids[1:])
+        for column in ('industry', 'size', 'location', 'website', 'description', 'culture_notes'):
+            conn.execute(f"""
+                UPDATE companies SET {column} = (
+                    SELECT {column} FROM companies
+                    WHERE id IN (SELECT value FROM json_each(?)) AND COALESCE({column}, '') != ''
+                    ORDER BY id LIMIT 1
+                )
+                WHERE id = ? AND COALESCE({column}, '') = ''
+                  AND EXISTS (SELECT 1 FROM companies
+                              WHERE id IN (SELECT value FROM json_each(?)) AND COALESCE({column}, '') != '')
+            """, (others, keep, others))
+        conn.execute("UPDATE job_opportunities SET company_id = ? WHERE company_id IN (SELECT value FROM json_each(?))",
+                     (keep, others))
+        conn.execute("UPDATE company_aliases SET company_id = ? WHERE company_id IN (SELECT value FROM json_each(?))",
+                     (keep, others))
+        conn.execute("DELETE FROM companies WHERE id IN (SELECT value FROM json_each(?))", (others,))
+        merged += len(ids) - 1
+
+    if merged:
+        clear_company_caches()
+    return merged
+
+
+def reindex_companies(conn: sqlite3.Connection) -> int:
+    """
+    Merge duplicates, then rebuild normalized_name and the trigram index; returns companies merged
+
+    A company whose key changes (the normalization rules changed) keeps its old key as an
+    alias, so names that used to resolve to it still do.
+    """
+    merged = merge_duplicate_companies(conn)
+
+    changed = [(normalize_company_name(name), company_id, normalized)
+               for company_id, name, normalized in conn.execute("SELECT id, name, normalized_name FROM companies")
+               if normalized != normalize_company_name(name)]
+    # Clear first so a key moving between rows never trips the unique index mid-update
+    conn.executemany("UPDATE companies SET normalized_name = NULL WHERE id = ?", [(company_id,) for _, company_id, _ in changed])
+    conn.executemany("UPDATE companies SET normalized_name = ? WHERE id = ?", [(key, company_id) for key, company_id, _ in changed])
+    conn.executemany("INSERT OR IGNORE INTO company_aliases (alias_key, company_id) VALUES (?, ?)",
+                     [(old_key, company_id) for _, company_id, old_key in changed if old_key])
+    # A name that is now some company's own key belongs to that company
+    conn.execute("DELETE FROM company_aliases WHERE alias_key IN (SELECT normalized_name FROM companies)")
+
+    conn.execute("DELETE FROM company_trigrams")
+    for company_id, key in conn.execute("SELECT id, normalized_name FROM companies").fetchall():
+        _index_trigrams(conn, company_id, key)
+
+    clear_company_caches()
+    return merged
+
+
+# Usage example:
+if __name__ == "__main__":
+    import sys
+
+    with connection("job_tracker.db") as conn:
+        if len(sys.argv) > 1:
+            for match in find_similar(conn, ' '.join(sys.argv[1:])):
+                print(f"{match.similarity:.2f}  #{match.id} {match.name}")
+        else:
+            print(f"Merged {reindex_companies(conn)} duplicate companies")
@@ -9,6 +9,9 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from .db import connection
+from .query_cache import invalidate
+from .job_document import analyze_job
 
 @dataclass
 class CoverLetterContent:
@@ -152,7 +155,7 @@ class CoverLetterGenerator:
 
     def generate_cover_letter(self, job_id: int, template_style: str = 'auto') -> CoverLetterContent:
         """Generate a tailored cover letter for a specific job"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 raise ValueError(f"Job {job_id} not found")
@@ -182,7 +185,7 @@ class CoverLetterGenerator:
 
     def _determine_template_style(self, job_data: Dict) -> str:
         """Automatically determine the best template style based on job content"""
-        job_text = f"{job_data['title']} {job_data.get('job_description', '')} {job_data.get('requirements', '')}".lower()
+        document = analyze_job(job_data)
 
         # Score each template style
         style_scores = {
@@ -194,19 +197,19 @@ class CoverLetterGenerator:
 
         # Executive keywords
         exec_keywords = ['chief', 'cto', 'cdo', 'director', 'head of', 'executive', 'strategic', 'leadership']
-        style_scores['executive_leadership'] = sum(1 for keyword in exec_keywords if keyword in job_text)
+        style_scores['executive_leadership'] = sum(1 for keyword in exec_keywords if document.contains(keyword))
 
         # AI keywords
         ai_keywords = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'automation', 'intelligent']
-        style_scores['ai_innovation'] = sum(1 for keyword in ai_keywords if keyword in job_text)
+        style_scores['ai_innovation'] = sum(1 for keyword in ai_keywords if document.contains(keyword))
 
         # Design keywords
         design_keywords = ['design', 'ux', 'ui', 'user experience', 'design thinking', 'design system']
-        style_scores['design_leadership'] = sum(1 for keyword in design_keywords if keyword in job_text)
+        style_scores['design_leadership'] = sum(1 for keyword in design_keywords if document.contains(keyword))
 
         # Consulting keywords
         consulting_keywords = ['consulting', 'consultant', 'transformation', 'process', 'optimization', 'strategy']
-        style_scores['consulting'] = sum(1 for keyword in consulting_keywords if keyword in job_text)
+        style_scores['consulting'] = sum(1 for keyword in consulting_keywords if document.contains(keyword))
 
         # Return highest scoring style
         return max(style_scores.items(), key=lambda x: x[1])[0]
@@ -286,7 +289,7 @@ class CoverLetterGenerator:
         achievements = self.achievements_bank[f'{category}_examples']
 
         # Simple keyword matching for now - could be enhanced with more sophisticated NLP
-        job_text = f"{job_data.get('job_description', '')} {job_data.get('requirements', '')}".lower()
+        job_text = analyze_job(job_data).body
 
         best_match = achievements[0]  # Default
         best_score = 0
@@ -345,7 +348,7 @@ Attachments: Resume, Portfolio samples
 
     def save_cover_letter(self, job_id: int, content: CoverLetterContent, template_style: str) -> str:
         """Save cover letter to file and database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
 
             # Generate filename
@@ -388,6 +391,7 @@ Attachments: Resume, Portfolio samples
                 job_id,
                 f"AI-generated cover letter using {template_style} template"
             ))
+        invalidate(self.db_path, 'generated_documents')
 
         return filepath
 
@@ -0,0 +1,147 @@
+"""
+Database Connections
+Pooled, pre-configured SQLite connections (WAL, busy timeout, tuned pragmas) shared by the app and every module
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Applied to every new connection; journal_mode=WAL is persistent and set once per database
+PRAGMAS = (
+    ('busy_timeout', 5000),           # wait for a writer instead of failing with "database is locked"
+    ('synchronous', 'NORMAL'),        # safe with WAL; fsync at checkpoints instead of every commit
+    ('mmap_size', 256 * 1024 * 1024),
+    ('cache_size', -32000),           # KiB when negative, so ~32MB of page cache per connection
+    ('temp_store', 'MEMORY'),
+)
+
+# Prepared statements kept per connection by the sqlite3 module
+CACHED_STATEMENTS = 256
+MAX_IDLE = 8
+
+# Class of new pooled connections, and callbacks run with the db_path on every acquire
+# (src/metrics.py swaps in a timed subclass and counts borrows per request)
+CONNECTION_FACTORY = sqlite3.Connection
+ACQUIRE_LISTENERS: List[Callable[[str], None]] = []
+# Callbacks run with (db_path, conn) on every release, after any open transaction is rolled back
+# (src/company_resolver.py caches the companies a transaction created only once it committed)
+RELEASE_LISTENERS: List[Callable[[str, sqlite3.Connection], None]] = []
+
+
+def configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply PRAGMAS to a connection"""
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def enable_wal(db_path: str) -> str:
+    """Switch the database to write-ahead logging so readers never block on the writer"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class ConnectionPool:
+    """Idle connections to one database, handed out to one user at a time and reused"""
+
+    def __init__(self, db_path: str, max_idle: int = MAX_IDLE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.created = 0
+        self.reused = 0
+        enable_wal(db_path)
+
+    def acquire(self, row_factory=None) -> sqlite3.Connection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = configure(sqlite3.connect(self.db_path, check_same_thread=False,
+                                             cached_statements=CACHED_STATEMENTS, factory=CONNECTION_FACTORY))
+            self.created += 1
+        else:
+            self.reused += 1
+        conn.row_factory = row_factory
+        for listener in ACQUIRE_LISTENERS:
+            listener(self.db_path)
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back anything left uncommitted"""
+        if conn.in_transaction:
+            conn.rollback()
+        for listener in RELEASE_LISTENERS:
+            listener(self.db_path, conn)
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Shared pool for db_path (a fresh one in a forked child, which must not reuse the parent's handles)"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None or pool._pid != os.getpid():
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+@contextmanager
+def connection(db_path: str, row_factory=None) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection: commits on success, rolls back on error, then returns it
+
+    Drop-in for ``with sqlite3.connect(db_path) as conn:``. Nested blocks borrow separate
+    connections, so each keeps its own transaction just as with sqlite3.connect.
+    """
+    pool = get_pool(db_path)
+    conn = pool.acquire(row_factory)
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    finally:
+        pool.release(conn)
+
+
+def close_all(db_path: Optional[str] = None):
+    """Close idle pooled connections (all databases, or just db_path)"""
+    with _pools_lock:
+        pools = [_pools.pop(db_path)] if db_path in _pools else [] if db_path else list(_pools.values())
+        if db_path is None:
+            _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Usage example:
+if __name__ == "__main__":
+    import time
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        with connection("job_tracker.db") as conn:
+            conn.execute("SELECT COUNT(*) FROM job_opportunities").fetchone()
+    pool = get_pool("job_tracker.db")
+    print(f"1000 queries in {(time.perf_counter() - started) * 1000:.1f}ms "
+          f"({pool.created} connections opened, {pool.reused} reused)")
@@ -0,0 +1,257 @@
+"""
+Near-Duplicate Job Detection
+MinHash signatures over word shingles with an LSH band index, so reposted roles are found at ingest
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, pure Python fallback below
+    np = None
+
+from .db import connection
+from .job_document import tokenize
+
+SHINGLE_SIZE = 3  # words per shingle
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Estimated Jaccard similarity at which two postings count as the same role. With 16 bands of
+# 4 rows, pairs above ~0.5 similarity almost always share a bucket, so few true duplicates are missed.
+DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20240601)  # fixed seed: signatures must be stable across runs
+_A = [_rng.randrange(1, _PRIME) for _ in range(NUM_PERMUTATIONS)]
+_B = [_rng.randrange(0, _PRIME) for _ in range(NUM_PERMUTATIONS)]
+_SIGNATURE = struct.Struct(f'<{NUM_PERMUTATIONS}I')
+
+
+@dataclass
+class DuplicateMatch:
+    job_id: int
+    similarity: float
+
+
+def _job_text(job_data: Dict) -> str:
+    return ' '.join(job_data.get(name) or '' for name in ('title', 'job_description', 'requirements'))
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def shingles(text: str) -> List[int]:
+    """CRC32 hashes of the distinct SHINGLE_SIZE-word shingles of text"""
+    words = tokenize(text)
+    if not words:
+        return []
+    if len(words) < SHINGLE_SIZE:
+        return [zlib.crc32(' '.join(words).encode('utf-8'))]
+    return list({
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    })
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of a posting, or None if it has no words"""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+
+    if np is not None:
+        x = np.array(hashes, dtype=np.uint64)
+        a = np.array(_A, dtype=np.uint64)[:, None]
+        b = np.array(_B, dtype=np.uint64)[:, None]
+        return tuple(((a * x + b) % _PRIME).min(axis=1).tolist())
+
+    return tuple(min((a * x + b) % _PRIME for x in hashes) for a, b in zip(_A, _B))
+
+
+def band_buckets(signature: Tuple[int, ...]) -> List[int]:
+    """One bucket hash per LSH band"""
+    return [
+        zlib.crc32(struct.pack(f'<{ROWS_PER_BAND}I', *signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(BANDS)
+    ]
+
+
+def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the fraction of matching signature slots"""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERMUTATIONS
+
+
+def _load_signatures(conn: sqlite3.Connection, job_ids: Iterable[int]) -> Dict[int, Tuple[int, ...]]:
+    return {
+        job_id: _SIGNATURE.unpack(blob)
+        for job_id, blob in conn.execute("""
+            SELECT job_id, signature FROM job_minhash
+            WHERE job_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(job_ids)),))
+    }
+
+
+def index_job(conn: sqlite3.Connection, job_data: Dict) -> Optional[Tuple[int, ...]]:
+    """Store the signature and band buckets of a job (no-op if its text is unchanged)"""
+    job_id = job_data['id']
+    text = _job_text(job_data)
+    digest = _content_hash(text)
+
+    row = conn.execute("SELECT content_hash, signature FROM job_minhash WHERE job_id = ?", (job_id,)).fetchone()
+    if row and row[0] == digest:
+        return _SIGNATURE.unpack(row[1])
+
+    conn.execute("DELETE FROM job_lsh_bands WHERE job_id = ?", (job_id,))
+    signature = minhash(text)
+    if signature is None:
+        conn.execute("DELETE FROM job_minhash WHERE job_id = ?", (job_id,))
+        return None
+
+    conn.execute("""
+        INSERT OR REPLACE INTO job_minhash (job_id, content_hash, signature)
+        VALUES (?, ?, ?)
+    """, (job_id, digest, _SIGNATURE.pack(*signature)))
+    conn.executemany("""
+        INSERT OR IGNORE INTO job_lsh_bands (band, bucket, job_id) VALUES (?, ?, ?)
+    """, [(band, bucket, job_id) for band, bucket in enumerate(band_buckets(signature))])
+    return signature
+
+
+def find_duplicates(conn: sqlite3.Connection, signature: Tuple[int, ...],
+                    exclude_id: Optional[int] = None,
+                    threshold: float = DUPLICATE_THRESHOLD) -> List[DuplicateMatch]:
+    """Jobs sharing an LSH bucket with signature whose estimated similarity reaches threshold"""
+    # Joined with job_opportunities so rows left by a deleted job are never candidates
+    candidates = [row[0] for row in conn.execute("""
+        SELECT DISTINCT b.job_id
+        FROM json_each(?) e
+        JOIN job_lsh_bands b ON b.band = e.key AND b.bucket = e.value
+        JOIN job_opportunities j ON j.id = b.job_id
+    """, (json.dumps(band_buckets(signature)),)) if row[0] != exclude_id]
+
+    matches = [
+        DuplicateMatch(job_id, similarity(signature, other))
+        for job_id, other in _load_signatures(conn, candidates).items()
+    ]
+    return sorted((m for m in matches if m.similarity >= threshold),
+                  key=lambda m: (-m.similarity, m.job_id))
+
+
+def link_duplicate(conn: sqlite3.Connection, job_data: Dict) -> Optional[int]:
+    """
+    Index a newly added job and link it to the posting it duplicates
+
+    Returns:
+        The canonical job ID the new job was linked to (its duplicate_of), or None
+    """
+    signature = index_job(conn, job_data)
+    if signature is None:
+        return None
+
+    matches = find_duplicates(conn, signature, exclude_id=job_data['id'])
+    if not matches:
+        return None
+
+    row = conn.execute("""
+        SELECT COALESCE(duplicate_of, id) FROM job_opportunities WHERE id = ?
+    """, (matches[0].job_id,)).fetchone()
+    if row is None:
+        return None
+    canonical_id = row[0]
+
+    conn.execute("UPDATE job_opportunities SET duplicate_of = ? WHERE id = ?", (canonical_id, job_data['id']))
+    return canonical_id
+
+
+def index_corpus(conn: sqlite3.Connection) -> int:
+    """Sign every job whose text is new or changed; returns the number of jobs (re)indexed"""
+    indexed = 0
+    cursor = conn.execute("""
+        SELECT j.id, j.title, j.job_description, j.requirements, m.content_hash
+        FROM job_opportunities j
+        LEFT JOIN job_minhash m ON m.job_id = j.id
+    """)
+    for job_id, title, job_description, requirements, digest in cursor.fetchall():
+        job_data = {'id': job_id, 'title': title, 'job_description': job_description,
+                    'requirements': requirements}
+        if digest != _content_hash(_job_text(job_data)):
+            index_job(conn, job_data)
+            indexed += 1
+    return indexed
+
+
+def find_clusters(conn: sqlite3.Connection, threshold: float = DUPLICATE_THRESHOLD) -> List[List[int]]:
+    """
+    Corpus-wide pass: group indexed jobs into clusters of near-duplicates
+
+    Only pairs sharing an LSH bucket are compared. Each cluster is sorted by job ID and
+    its first (oldest) job becomes the duplicate_of target of the others.
+    """
+    parent: Dict[int, int] = {}
+
+    def find(job_id: int) -> int:
+        root = parent.setdefault(job_id, job_id)
+        while root != parent[root]:
+            root = parent[root]
+        while parent[job_id] != root:
+            parent[job_id], job_id = root, parent[job_id]
+        return root
+
+    buckets = conn.execute("""
+        SELECT group_concat(b.job_id) FROM job_lsh_bands b
+        JOIN job_opportunities j ON j.id = b.job_id
+        GROUP BY b.band, b.bucket
+        HAVING COUNT(*) > 1
+    """).fetchall()
+    groups = [sorted(int(job_id) for job_id in row[0].split(',')) for row in buckets]
+    signatures = _load_signatures(conn, {job_id for group in groups for job_id in group})
+
+    compared = set()
+    for group in groups:
+        for i, left in enumerate(group):
+            for right in group[i + 1:]:
+                if (left, right) in compared or find(left) == find(right):
+                    continue
+                compared.add((left, right))
+                if similarity(signatures[left], signatures[right]) >= threshold:
+                    parent[max(find(left), find(right))] = min(find(left), find(right))
+
+    clusters: Dict[int, List[int]] = {}
+    for job_id in parent:
+        clusters.setdefault(find(job_id), []).append(job_id)
+    result = sorted((sorted(members) for members in clusters.values() if len(members) > 1),
+                    key=lambda members: members[0])
+
+    links = [(members[0], job_id) for members in result for job_id in members[1:]]
+    conn.execute("""
+        UPDATE job_opportunities SET duplicate_of = NULL
+        WHERE duplicate_of IS NOT NULL AND id NOT IN (SELECT value FROM json_each(?))
+    """, (json.dumps([job_id for _, job_id in links]),))
+    conn.executemany("UPDATE job_opportunities SET duplicate_of = ? WHERE id = ?", links)
+    return result
+
+
+def dedupe_corpus(db_path: str) -> Tuple[int, List[List[int]]]:
+    """Index new/changed jobs and link every duplicate cluster; returns (jobs indexed, clusters)"""
+    with connection(db_path) as conn:
+        indexed = index_corpus(conn)
+        clusters = find_clusters(conn)
+    return indexed, clusters
+
+
+# Usage example:
+if __name__ == "__main__":
+    indexed, clusters = dedupe_corpus("job_tracker.db")
+    print(f"Indexed {indexed} jobs, found {len(clusters)} duplicate clusters")
+    for members in clusters:
+        print(f"  Job {members[0]} <- {', '.join(str(job_id) for job_id in members[1:])}")
@@ -0,0 +1,154 @@
+"""
+Data Export
+Streams jobs and applications as NDJSON or CSV straight from a database cursor
+"""
+
+import csv
+import io
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from .db import connection
+from .job_search import fts_query
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'jsonl': 'application/x-ndjson',   # same thing; what src/bulk_import.py calls it
+    'csv': 'text/csv',
+}
+
+# Rows fetched per chunk; memory stays at one chunk whatever the table size
+BATCH_SIZE = 500
+
+# Internal scoring bookkeeping, not useful outside the tracker
+JOB_EXCLUDED_COLUMNS = ('score_fingerprint', 'scored_profile_version')
+
+
+@dataclass
+class ExportQuery:
+    sql: str
+    params: List = field(default_factory=list)
+
+
+def parse_since(value: Optional[str]) -> Optional[str]:
+    """updated_since (ISO date or datetime, UTC) in SQLite CURRENT_TIMESTAMP format; raises ValueError"""
+    if not value:
+        return None
+    try:
+        since = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid updated_since: {value!r} (use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def export_format(value: Optional[str]) -> str:
+    """Normalised export format (default ndjson); raises ValueError for anything else"""
+    fmt = (value or 'ndjson').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {value} (use ndjson or csv)")
+    return 'ndjson' if fmt == 'jsonl' else fmt
+
+
+def jobs_export_query(conn: sqlite3.Connection, search_text: str = '', status: str = '', priority: str = '',
+                      min_score: int = 0, updated_since: Optional[str] = None) -> ExportQuery:
+    """Jobs matching the /jobs filters (plus updated_since), in id order so no sort is buffered"""
+    job_columns = [row[1] for row in conn.execute("PRAGMA table_info(job_opportunities)")
+                   if row[1] not in JOB_EXCLUDED_COLUMNS]
+    query = ExportQuery(sql=f"""
+        SELECT {', '.join(f'j.{name}' for name in job_columns)}, c.name as company_name, c.industry
+        FROM job_opportunities j
+        LEFT JOIN companies c ON j.company_id = c.id
+        WHERE 1=1
+    """)
+
+    if search_text:
+        match = fts_query(search_text)
+        if not match:
+            raise ValueError(f"Nothing to search for in {search_text!r}")
+        query.sql += " AND j.id IN (SELECT rowid FROM job_search WHERE job_search MATCH ?)"
+        query.params.append(match)
+
+    if status:
+        query.sql += " AND j.status = ?"
+        query.params.append(status)
+
+    if priority:
+        query.sql += " AND j.priority = ?"
+        query.params.append(priority)
+
+    if min_score > 0:
+        query.sql += " AND j.ai_score >= ?"
+        query.params.append(min_score)
+
+    since = parse_since(updated_since)
+    if since:
+        query.sql += " AND j.updated_at >= ?"
+        query.params.append(since)
+
+    query.sql += " ORDER BY j.id"
+    return query
+
+
+def applications_export_query(status: str = '', updated_since: Optional[str] = None) -> ExportQuery:
+    """Applications matching the /applications filters (plus updated_since), in id order"""
+    query = ExportQuery(sql="""
+        SELECT a.*, j.title as job_title, c.name as company_name, j.ai_score
+        FROM applications a
+        JOIN job_opportunities j ON a.job_id = j.id
+        LEFT JOIN companies c ON j.company_id = c.id
+        WHERE 1=1
+    """)
+
+    if status:
+        query.sql += " AND a.status = ?"
+        query.params.append(status)
+
+    since = parse_since(updated_since)
+    if since:
+        query.sql += " AND a.updated_at >= ?"
+        query.params.append(since)
+
+    query.sql += " ORDER BY a.id"
+    return query
+
+
+def stream_export(db_path: str, query: ExportQuery, fmt: str) -> Iterator[str]:
+    """Yield the export in chunks of BATCH_SIZE rows (CSV starts with a header line)"""
+    with connection(db_path) as conn:
+        cursor = conn.execute(query.sql, query.params)
+        columns = [column[0] for column in cursor.description]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+
+        if fmt == 'csv':
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            buffer.seek(0)
+            buffer.truncate()
+            if fmt == 'csv':
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                    buffer.write('\n')
+            yield buffer.getvalue()
+
+
+# Usage example:
+if __name__ == "__main__":
+    import sys
+
+    with connection("job_tracker.db") as conn:
+        query = jobs_export_query(conn, min_score=70)
+    for chunk in stream_export("job_tracker.db", query, 'csv'):
+        sys.stdout.write(chunk)
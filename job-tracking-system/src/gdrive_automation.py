@@ -8,10 +8,14 @@ import sqlite3
 import subprocess
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 import re
 
+from .activity_log import latest_activity
+from .db import connection
+from .query_cache import invalidate
+
 class GoogleDriveAutomation:
     def __init__(self, db_path: str, rclone_remote: str = "gdrive"):
         self.db_path = db_path
@@ -20,7 +24,7 @@ class GoogleDriveAutomation:
 
     def create_application_folder_structure(self, job_id: int) -> str:
         """Create organized folder structure for a job application"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 raise ValueError(f"Job {job_id} not found")
@@ -58,7 +62,7 @@ class GoogleDriveAutomation:
                 )
 
             # Update database with folder path
-            with sqlite3.connect(self.db_path) as conn:
+            with connection(self.db_path) as conn:
                 conn.execute("""
                     UPDATE job_opportunities
                     SET notes = COALESCE(notes, '') || ?
@@ -77,6 +81,7 @@ class GoogleDriveAutomation:
                     f"Created application folder structure in Google Drive",
                     json.dumps({'folder_path': folder_path, 'subfolders': subfolders})
                 ))
+            invalidate(self.db_path, 'job_opportunities')
 
             return folder_path
 
@@ -95,7 +100,7 @@ class GoogleDriveAutomation:
         Returns:
             Dict mapping document type to Google Drive path
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 raise ValueError(f"Job {job_id} not found")
@@ -138,7 +143,7 @@ class GoogleDriveAutomation:
                 uploaded_paths[doc_type] = gdrive_path
 
                 # Update database
-                with sqlite3.connect(self.db_path) as conn:
+                with connection(self.db_path) as conn:
                     conn.execute("""
                         INSERT OR REPLACE INTO generated_documents
                         (job_id, document_type, file_path, gdrive_path, generation_method)
@@ -149,9 +154,10 @@ class GoogleDriveAutomation:
 
             except subprocess.CalledProcessError as e:
                 print(f"❌ Failed to upload {doc_type}: {e}")
+        invalidate(self.db_path, 'generated_documents')
 
         # Log bulk upload activity
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             conn.execute("""
                 INSERT INTO activity_log
                 (activity_type, entity_type, entity_id, description, metadata)
@@ -166,16 +172,21 @@ class GoogleDriveAutomation:
 
         return uploaded_paths
 
-    def create_application_package(self, job_id: int) -> str:
+    def create_application_package(self, job_id: int,
+                                   progress: Optional[Callable[[int, str], None]] = None) -> str:
         """
         Create complete application package with resume, cover letter, and portfolio samples
+
+        progress(percent, message) is called as each stage starts (the task queue passes one in).
         """
-        with sqlite3.connect(self.db_path) as conn:
+        progress = progress or (lambda percent, message: None)
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 raise ValueError(f"Job {job_id} not found")
 
         # Create folder structure
+        progress(5, 'Creating Google Drive folders')
         folder_path = self.create_application_folder_structure(job_id)
 
         # Prepare documents
@@ -187,6 +198,7 @@ class GoogleDriveAutomation:
             documents_to_upload['resume'] = resume_version
 
         # 2. Generate and upload cover letter
+        progress(30, 'Generating cover letter')
         try:
             from .cover_letter_generator import CoverLetterGenerator
 
@@ -208,9 +220,11 @@ class GoogleDriveAutomation:
             documents_to_upload[f'portfolio_sample_{i+1}'] = sample_path
 
         # Upload all documents
+        progress(50, f'Uploading {len(documents_to_upload)} documents')
         uploaded_paths = self.upload_application_documents(job_id, documents_to_upload)
 
         # Create application summary document
+        progress(85, 'Uploading application summary')
         summary_path = self._create_application_summary(job_id, uploaded_paths)
         if summary_path:
             self.upload_application_documents(job_id, {'application_summary': summary_path})
@@ -219,7 +233,7 @@ class GoogleDriveAutomation:
 
     def get_shareable_links(self, job_id: int) -> Dict[str, str]:
         """Get shareable Google Drive links for application documents"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             cursor = conn.execute("""
                 SELECT document_type, gdrive_path
                 FROM generated_documents
@@ -271,19 +285,11 @@ class GoogleDriveAutomation:
 
     def _get_or_create_folder_path(self, job_id: int) -> str:
         """Get existing folder path or create new one"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT metadata FROM activity_log
-                WHERE entity_type = 'job' AND entity_id = ?
-                AND activity_type = 'gdrive_folder_created'
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, (job_id,))
-
-            row = cursor.fetchone()
-            if row:
-                metadata = json.loads(row[0])
-                return metadata.get('folder_path')
+        # Indexed lookup of the generated folder_path column (falls back to archived activity)
+        with connection(self.db_path) as conn:
+            created = latest_activity(conn, 'job', job_id, 'gdrive_folder_created')
+            if created and created['folder_path']:
+                return created['folder_path']
 
         # Create new folder structure
         return self.create_application_folder_structure(job_id)
@@ -346,7 +352,7 @@ class GoogleDriveAutomation:
 
     def _create_application_summary(self, job_id: int, uploaded_documents: Dict[str, str]) -> Optional[str]:
         """Create application summary document"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 return None
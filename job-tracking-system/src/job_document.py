@@ -0,0 +1,113 @@
+"""
+Shared Job Document Analysis
+Normalizes a posting once and caches the result for scoring and cover letter generation
+"""
+
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+_WORD_RE = re.compile(r"\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, the same way JobDocument splits postings"""
+    return _WORD_RE.findall(text.lower())
+
+
+def _normalize(*parts: Optional[str]) -> str:
+    return _SPACE_RE.sub(' ', ' '.join(part or '' for part in parts)).strip().lower()
+
+
+class JobDocument:
+    """
+    Read-only analysis of one posting
+
+    ``text`` covers title, description and requirements; ``body`` covers just the
+    description and requirements, both lowercased with whitespace collapsed. The body
+    and keyword hits are computed on first use and then kept with the document.
+    """
+
+    def __init__(self, job_id: Optional[int], title: Optional[str],
+                 job_description: Optional[str], requirements: Optional[str],
+                 digest: Optional[str] = None):
+        self.job_id = job_id
+        self.content_hash = digest or content_hash(title, job_description, requirements)
+        self.text = _normalize(title, job_description, requirements)
+        self._body_parts = (job_description, requirements)
+        self._keyword_hits: 'weakref.WeakKeyDictionary[KeywordMatcher, FrozenSet[str]]' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_job(cls, job_data: Dict, digest: Optional[str] = None) -> 'JobDocument':
+        return cls(job_data.get('id'), job_data.get('title'),
+                   job_data.get('job_description'), job_data.get('requirements'), digest)
+
+    @cached_property
+    def body(self) -> str:
+        return _normalize(*self._body_parts)
+
+    def contains(self, phrase: str) -> bool:
+        """Case-insensitive substring test against the normalized text"""
+        return phrase.lower() in self.text
+
+    def keyword_hits(self, matcher: KeywordMatcher) -> FrozenSet[str]:
+        """Keywords of matcher that occur in the text, memoized per matcher"""
+        with self._lock:
+            hits = self._keyword_hits.get(matcher)
+        if hits is None:
+            hits = frozenset(matcher.find(self.text))
+            with self._lock:
+                self._keyword_hits[matcher] = hits
+        return hits
+
+
+def content_hash(title: Optional[str], job_description: Optional[str], requirements: Optional[str]) -> str:
+    content = '\x1f'.join(part or '' for part in (title, job_description, requirements))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class JobDocumentCache:
+    """LRU cache of JobDocuments keyed by (job id, content hash)"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._documents: 'OrderedDict[Tuple[Optional[int], str], JobDocument]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_data: Dict) -> JobDocument:
+        digest = content_hash(job_data.get('title'), job_data.get('job_description'),
+                              job_data.get('requirements'))
+        key = (job_data.get('id'), digest)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                return document
+
+        document = JobDocument.from_job(job_data, digest)
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+_cache = JobDocumentCache()
+
+
+def analyze_job(job_data: Dict) -> JobDocument:
+    """Return the cached analysis of a job row, building it on first use"""
+    return _cache.get(job_data)
@@ -0,0 +1,105 @@
+"""
+Full-Text Job Search
+Ranked FTS5 search over postings and company names, combined with the jobs list filters
+"""
+
+import re
+import sqlite3
+from typing import Dict, List, Optional
+
+from .db import connection
+
+# Column weights for bm25(), in job_search column order:
+# title, job_description, requirements, notes, company_name
+BM25_WEIGHTS = (10.0, 1.0, 2.0, 1.0, 5.0)
+
+# Snippet highlight markers; control characters so they never clash with posting text
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+
+_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    Turn a search box string into an FTS5 query
+
+    Words and "quoted phrases" must all match; a trailing * makes a word a prefix
+    search. Everything is quoted, so FTS5 operators and punctuation typed by the
+    user can't produce a syntax error.
+    """
+    terms = []
+    for phrase, word in _TERM_RE.findall(text or ''):
+        term = phrase or word
+        prefix = not phrase and term.endswith('*')
+        term = term.rstrip('*').replace('"', '').strip()
+        if not term:
+            continue
+        terms.append(f'"{term}"' + ('*' if prefix else ''))
+    return ' '.join(terms) or None
+
+
+def search_jobs(conn: sqlite3.Connection, text: str, status: str = '', priority: str = '',
+                min_score: int = 0, limit: int = 50) -> List[Dict]:
+    """
+    Jobs matching ``text``, best bm25 match first, with a highlighted snippet
+
+    The status/priority/min_score filters are applied in the same query as the
+    full-text match. Snippets mark matches with SNIPPET_START/SNIPPET_END.
+    """
+    query = fts_query(text)
+    if not query:
+        return []
+
+    # Rank first, then build snippets and load full rows for the top ``limit`` only
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    ranked = f"""
+        SELECT job_search.rowid AS id, bm25(job_search, {weights}) AS search_rank
+        FROM job_search
+        JOIN job_opportunities j ON j.id = job_search.rowid
+        WHERE job_search MATCH ?
+    """
+    params: List = [query]
+
+    if status:
+        ranked += " AND j.status = ?"
+        params.append(status)
+
+    if priority:
+        ranked += " AND j.priority = ?"
+        params.append(priority)
+
+    if min_score > 0:
+        ranked += " AND j.ai_score >= ?"
+        params.append(min_score)
+
+    ranked += " ORDER BY search_rank LIMIT ?"
+    params.append(limit)
+
+    sql = f"""
+        WITH ranked AS ({ranked})
+        SELECT j.*, c.name as company_name, c.industry,
+               snippet(job_search, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', 16) AS snippet,
+               ranked.search_rank
+        FROM ranked
+        JOIN job_search ON job_search.rowid = ranked.id
+        JOIN job_opportunities j ON j.id = ranked.id
+        LEFT JOIN companies c ON j.company_id = c.id
+        WHERE job_search MATCH ?
+        ORDER BY ranked.search_rank
+    """
+    params.append(query)
+
+    cursor = conn.execute(sql, params)
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Usage example:
+if __name__ == "__main__":
+    import sys
+
+    with connection("job_tracker.db") as conn:
+        for job in search_jobs(conn, ' '.join(sys.argv[1:]) or 'design systems', limit=10):
+            snippet = job['snippet'].replace(SNIPPET_START, '[').replace(SNIPPET_END, ']')
+            print(f"{job['search_rank']:7.2f}  {job['title']} @ {job['company_name']}: {snippet}")
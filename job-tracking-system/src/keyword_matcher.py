@@ -0,0 +1,110 @@
+"""
+Multi-Keyword Matcher
+Aho-Corasick automaton that finds every profile keyword in a single pass over a job posting
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """Case-insensitive, word-boundary aware multi-keyword matcher.
+
+    Keywords are matched literally (so "P&L" and "AI/ML" are not treated as regex
+    source). Every keyword must start on a word boundary. Acronym keywords (no
+    lowercase letters, e.g. "AI", "EA", "CTO") must also end on one, so they don't
+    fire inside ordinary words like "maintain" or "team". Other keywords may run
+    on into a longer word, which keeps stems such as "Digital Transform" and
+    "Process Optim" matching "Transformation" and "Optimization".
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._keyword_ids: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._needs_end_boundary: List[bool] = []
+        self._lengths: List[int] = []
+
+        for keyword in keywords:
+            self._add_keyword(keyword)
+        self._build_failure_links()
+
+    def _add_keyword(self, keyword: str):
+        pattern = keyword.lower()
+        if not pattern or keyword in self._keyword_ids:
+            return
+
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._keyword_ids[keyword] = keyword_id
+        self._needs_end_boundary.append(not any(c.islower() for c in keyword))
+        self._lengths.append(len(pattern))
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur in text"""
+        return {self.keywords[keyword_id] for keyword_id in self.find_ids(text)}
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Return the ids (positions in self.keywords) of keywords that occur in text"""
+        if not text:
+            return set()
+
+        haystack = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        total = len(self.keywords)
+        state = 0
+
+        for position, char in enumerate(haystack):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword_id in output[state]:
+                if keyword_id in found:
+                    continue
+                start = position - self._lengths[keyword_id] + 1
+                if start > 0 and _is_word_char(haystack[start - 1]):
+                    continue
+                end = position + 1
+                if (self._needs_end_boundary[keyword_id] and end < len(haystack)
+                        and _is_word_char(haystack[end])):
+                    continue
+                found.add(keyword_id)
+
+            if len(found) == total:
+                break
+
+        return found
@@ -0,0 +1,390 @@
+"""
+Request & SQL Metrics
+Route latency histograms and per-statement SQL timings, rendered for Prometheus or as a JSON summary
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import db
+from .slow_queries import SLOW_QUERIES
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+# Statements / connection borrows per request - N+1 loops land in the top buckets
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+# Distinct statement shapes tracked (dynamic SQL past this is counted under 'other')
+MAX_STATEMENTS = 500
+STATEMENT_LABEL_LENGTH = 160
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PLACEHOLDER_LIST_RE = re.compile(r'\?(?:\s*,\s*\?)+')
+
+
+def statement_shape(sql: str) -> str:
+    """One-line label for a statement: whitespace collapsed, IN (?, ?, ...) lists folded"""
+    shape = _PLACEHOLDER_LIST_RE.sub('?, ...', _WHITESPACE_RE.sub(' ', sql).strip())
+    return shape if len(shape) <= STATEMENT_LABEL_LENGTH else shape[:STATEMENT_LABEL_LENGTH - 1] + '…'
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: bucket le=x counts values <= x)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        samples = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            samples.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return samples
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (the max seen, for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+@dataclass
+class StatementStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class RouteStats:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    statements: Histogram = field(default_factory=lambda: Histogram(COUNT_BUCKETS))
+    borrows: Histogram = field(default_factory=lambda: Histogram(COUNT_BUCKETS))
+    sql_seconds: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    worst_repeat: int = 0               # most executions of one statement in a single request
+    worst_repeat_statement: str = ''
+
+
+@dataclass
+class RequestTrace:
+    """SQL done by the current request's thread"""
+    endpoint: str = ''
+    statements: int = 0
+    sql_seconds: float = 0.0
+    borrows: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+
+class MetricsRegistry:
+    """Process-wide metrics; every update takes one uncontended lock and a few dict operations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.sql = Histogram(SQL_BUCKETS)
+        self.statements: Dict[str, StatementStats] = {}
+        self._shapes: Dict[str, str] = {}
+        self.borrows = 0
+
+    def begin_request(self, endpoint: str = ''):
+        self._local.trace = RequestTrace(endpoint=endpoint)
+
+    def current_endpoint(self) -> str:
+        trace = getattr(self._local, 'trace', None)
+        return trace.endpoint if trace is not None else ''
+
+    def end_request(self, method: str, endpoint: str, status: int, seconds: float):
+        trace = getattr(self._local, 'trace', None) or RequestTrace()
+        self._local.trace = None
+        repeated, repeats = trace.shapes.most_common(1)[0] if trace.shapes else ('', 0)
+
+        with self._lock:
+            route = self.routes.get((method, endpoint))
+            if route is None:
+                route = self.routes[(method, endpoint)] = RouteStats()
+            route.latency.observe(seconds)
+            route.statements.observe(trace.statements)
+            route.borrows.observe(trace.borrows)
+            route.sql_seconds += trace.sql_seconds
+            route.statuses[status] += 1
+            if repeats > route.worst_repeat:
+                route.worst_repeat, route.worst_repeat_statement = repeats, repeated
+
+    def record_statement(self, sql: str, seconds: float) -> str:
+        """Count one execution; returns the statement's shape"""
+        shape = self._shapes.get(sql)
+        if shape is None:
+            shape = statement_shape(sql)
+            if len(self._shapes) < MAX_STATEMENTS * 4:
+                self._shapes[sql] = shape
+
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.statements += 1
+            trace.sql_seconds += seconds
+            trace.shapes[shape] += 1
+
+        with self._lock:
+            self.sql.observe(seconds)
+            stats = self.statements.get(shape)
+            if stats is None:
+                key = shape if len(self.statements) < MAX_STATEMENTS else 'other'
+                stats = self.statements.setdefault(key, StatementStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+        return shape
+
+    def record_borrow(self, db_path: str):
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.borrows += 1
+        with self._lock:
+            self.borrows += 1
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+            self.statements.clear()
+            self.sql = Histogram(SQL_BUCKETS)
+            self.borrows = 0
+
+    def summary(self, top: int = 20) -> Dict:
+        """Routes by total time and the top statements by total time, in milliseconds"""
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        with self._lock:
+            routes = [{
+                'method': method,
+                'endpoint': endpoint,
+                'requests': route.latency.count,
+                'errors': sum(count for status, count in route.statuses.items() if status >= 500),
+                'total_ms': ms(route.latency.sum),
+                'avg_ms': ms(route.latency.sum / route.latency.count),
+                'p50_ms': ms(route.latency.quantile(0.5)),
+                'p95_ms': ms(route.latency.quantile(0.95)),
+                'max_ms': ms(route.latency.max),
+                'sql_share': round(route.sql_seconds / route.latency.sum, 3) if route.latency.sum else None,
+                'avg_statements': round(route.statements.sum / route.latency.count, 1),
+                'avg_connection_borrows': round(route.borrows.sum / route.latency.count, 1),
+                'worst_repeat': {'statement': route.worst_repeat_statement, 'count': route.worst_repeat}
+                                if route.worst_repeat > 1 else None,
+            } for (method, endpoint), route in self.routes.items()]
+
+            statements = [{
+                'statement': shape,
+                'calls': stats.calls,
+                'total_ms': ms(stats.seconds),
+                'avg_ms': ms(stats.seconds / stats.calls),
+                'max_ms': ms(stats.max_seconds),
+            } for shape, stats in self.statements.items()]
+
+            totals = {
+                'statements': self.sql.count,
+                'sql_ms': ms(self.sql.sum),
+                'sql_p95_ms': ms(self.sql.quantile(0.95)),
+                'connection_borrows': self.borrows,
+            }
+
+        routes.sort(key=lambda route: route['total_ms'], reverse=True)
+        statements.sort(key=lambda statement: statement['total_ms'], reverse=True)
+        return {'routes': routes, 'statements': statements[:top], 'sql': totals}
+
+    def slow_query_report(self, top: int = 50) -> Dict:
+        """Statements ranked by total time, with the slow-log counts, last slow call and plan of each"""
+        slow = {stats.statement: stats for stats in SLOW_QUERIES.snapshot()}
+        with self._lock:
+            totals = [(shape, stats.calls, stats.seconds, stats.max_seconds)
+                      for shape, stats in self.statements.items()]
+        # Slow statements are always listed, even when the statement table overflowed into 'other'
+        listed = {shape for shape, *_ in totals}
+        totals += [(shape, stats.count, stats.total_ms / 1000, stats.max_ms / 1000)
+                   for shape, stats in slow.items() if shape not in listed]
+        totals.sort(key=lambda row: row[2], reverse=True)
+
+        statements = []
+        for shape, calls, seconds, max_seconds in totals[:top]:
+            stats = slow.get(shape)
+            statements.append({
+                'statement': shape,
+                'calls': calls,
+                'total_ms': round(seconds * 1000, 3),
+                'avg_ms': round(seconds * 1000 / calls, 3) if calls else None,
+                'max_ms': round(max_seconds * 1000, 3),
+                'slow_calls': stats.count if stats else 0,
+                'slow_ms': round(stats.total_ms, 3) if stats else 0,
+                'plan': stats.plan.lines if stats and stats.plan else None,
+                'full_scans': stats.plan.full_scans if stats and stats.plan else [],
+                'temp_btrees': stats.plan.temp_btrees if stats and stats.plan else [],
+                'last_slow': {
+                    'duration_ms': stats.last.duration_ms,
+                    'params': stats.last.params,
+                    'endpoint': stats.last.endpoint,
+                    'at': stats.last.at
+                } if stats and stats.last else None
+            })
+
+        return {
+            'threshold_ms': SLOW_QUERIES.threshold_ms,
+            'statements': statements,
+            'recent': [{
+                'statement': execution.statement,
+                'duration_ms': execution.duration_ms,
+                'params': execution.params,
+                'endpoint': execution.endpoint,
+                'at': execution.at
+            } for execution in reversed(SLOW_QUERIES.recent)]
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition of the route and SQL metrics"""
+        lines: List[str] = []
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines += _histogram_lines('http_request_duration_seconds', 'Request latency by route', [
+                ({'method': method, 'endpoint': endpoint}, route.latency) for (method, endpoint), route in routes
+            ])
+            lines += metric_lines('http_requests_total', 'Requests by route and status code', 'counter', [
+                ({'method': method, 'endpoint': endpoint, 'status': str(status)}, count)
+                for (method, endpoint), route in routes for status, count in sorted(route.statuses.items())
+            ])
+            lines += _histogram_lines('http_request_sql_statements', 'SQL statements executed per request', [
+                ({'method': method, 'endpoint': endpoint}, route.statements) for (method, endpoint), route in routes
+            ])
+            lines += _histogram_lines('http_request_db_borrows', 'Pooled connection borrows per request', [
+                ({'method': method, 'endpoint': endpoint}, route.borrows) for (method, endpoint), route in routes
+            ])
+            lines += metric_lines('http_request_sql_seconds_total', 'Time spent in SQL by route', 'counter', [
+                ({'method': method, 'endpoint': endpoint}, route.sql_seconds) for (method, endpoint), route in routes
+            ])
+            lines += _histogram_lines('sql_statement_duration_seconds', 'SQL statement execution time',
+                                      [({}, self.sql)])
+            statements = sorted(self.statements.items())
+            lines += metric_lines('sql_statements_total', 'Executions by statement', 'counter', [
+                ({'statement': shape}, stats.calls) for shape, stats in statements
+            ])
+            lines += metric_lines('sql_statement_seconds_total', 'Execution time by statement', 'counter', [
+                ({'statement': shape}, stats.seconds) for shape, stats in statements
+            ])
+            lines += metric_lines('db_connection_borrows_total', 'Pooled connections handed out', 'counter',
+                                  [({}, self.borrows)])
+        return '\n'.join(lines) + '\n'
+
+
+def _label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + '}'
+
+
+def metric_lines(name: str, help_text: str, metric_type: str,
+                 samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """HELP/TYPE header and one line per (labels, value) sample"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in samples]
+    return lines
+
+
+def _histogram_lines(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], Histogram]]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in samples:
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+    return lines
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _record(conn: sqlite3.Connection, sql: str, params, seconds: float):
+    shape = REGISTRY.record_statement(sql, seconds)
+    if seconds >= SLOW_QUERIES.threshold:
+        SLOW_QUERIES.record(conn, shape, sql, params, seconds, REGISTRY.current_endpoint())
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that reports every execute/executemany/commit to REGISTRY (and slow ones to SLOW_QUERIES)"""
+
+    def execute(self, sql, *args):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            _record(self, sql, args[0] if args else (), time.perf_counter() - start)
+
+    def executemany(self, sql, *args):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, *args)
+        finally:
+            # Parameter sets may be a generator (already consumed); a list's first row stands in
+            rows = args[0] if args else None
+            _record(self, sql, rows[0] if isinstance(rows, list) and rows else None,
+                    time.perf_counter() - start)
+
+    def executescript(self, script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            REGISTRY.record_statement('-- script: ' + script.strip().split('\n', 1)[0],
+                                      time.perf_counter() - start)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            REGISTRY.record_statement('COMMIT', time.perf_counter() - start)
+
+
+def install():
+    """Time every pooled connection opened from now on and count borrows (idempotent)"""
+    db.CONNECTION_FACTORY = TimedConnection
+    if REGISTRY.record_borrow not in db.ACQUIRE_LISTENERS:
+        db.ACQUIRE_LISTENERS.append(REGISTRY.record_borrow)
+
+
+# Usage example:
+if __name__ == "__main__":
+    install()
+    REGISTRY.begin_request()
+    with db.connection("job_tracker.db") as conn:
+        for job_id in range(1, 21):
+            conn.execute("SELECT title FROM job_opportunities WHERE id = ?", (job_id,)).fetchone()
+    REGISTRY.end_request('GET', 'example', 200, 0.012)
+    print(REGISTRY.summary()['routes'])
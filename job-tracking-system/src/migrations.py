@@ -0,0 +1,579 @@
+"""
+Database Migrations
+Brings existing job_tracker.db files up to date with database/schema.sql
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from .analytics import rebuild_rollups
+from .change_tracking import TRACKED_TABLES
+from .company_resolver import reindex_companies
+from .db import connection
+
+
+def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    # table_xinfo also lists generated columns, which table_info leaves out
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_xinfo({table})"))
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    """ALTER TABLE ... ADD COLUMN unless the column is already there (fresh schema.sql databases)"""
+    if not _column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _score_fingerprints(conn: sqlite3.Connection):
+    """Content fingerprints and profile versions for incremental scoring"""
+    _add_column(conn, 'job_opportunities', 'score_fingerprint', 'VARCHAR(64)')
+    _add_column(conn, 'job_opportunities', 'scored_profile_version', 'VARCHAR(64)')
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS scoring_profile_versions (
+            version VARCHAR(64) PRIMARY KEY,
+            profile TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_profile_version ON job_opportunities(scored_profile_version);
+    """)
+
+
+def _scoring_profile_state(conn: sqlite3.Connection):
+    """Scoring weights table and a revision counter bumped whenever the profile changes"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS scoring_weights (
+            component VARCHAR(100) PRIMARY KEY,
+            weight REAL NOT NULL
+        );
+        INSERT OR IGNORE INTO scoring_weights (component, weight) VALUES
+            ('executive_leadership', 0.25),
+            ('ai_technology', 0.30),
+            ('design_innovation', 0.25),
+            ('consulting_business', 0.20),
+            ('industry_fit', 0.10),
+            ('role_level', 0.10),
+            ('location_fit', 0.05);
+
+        CREATE TABLE IF NOT EXISTS scoring_profile_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO scoring_profile_state (id, revision) VALUES (1, 0);
+
+        CREATE TRIGGER IF NOT EXISTS trg_my_profile_insert AFTER INSERT ON my_profile
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_my_profile_update AFTER UPDATE ON my_profile
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_my_profile_delete AFTER DELETE ON my_profile
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_scoring_weights_insert AFTER INSERT ON scoring_weights
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_scoring_weights_update AFTER UPDATE ON scoring_weights
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_scoring_weights_delete AFTER DELETE ON scoring_weights
+        BEGIN UPDATE scoring_profile_state SET revision = revision + 1 WHERE id = 1; END;
+    """)
+
+
+def _job_requirements(conn: sqlite3.Connection):
+    """Indexed job_requirements written at scoring time, with the common requirements each line names"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS job_requirement_terms (
+            term VARCHAR(100) NOT NULL COLLATE NOCASE, -- 'mba' finds 'MBA'
+            requirement_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (term, requirement_id),
+            FOREIGN KEY (requirement_id) REFERENCES job_requirements (id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_job_requirements_job ON job_requirements(job_id, importance, match_score);
+        CREATE INDEX IF NOT EXISTS idx_job_requirement_terms_job ON job_requirement_terms(job_id);
+    """)
+    # Scores written before this migration have no requirement rows; the next
+    # incremental rescore picks these jobs up again
+    conn.execute("""
+        UPDATE job_opportunities SET scored_profile_version = NULL
+        WHERE scored_profile_version IS NOT NULL
+        AND id NOT IN (SELECT job_id FROM job_requirements)
+    """)
+
+
+_BREAKDOWN_COLUMNS = ('executive_leadership', 'ai_technology', 'design_innovation', 'consulting_business',
+                      'industry_fit', 'role_level', 'location_fit')
+
+
+def _job_scores(conn: sqlite3.Connection):
+    """Typed job_scores/job_score_history tables, backfilled from the job_scored activity log"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS job_scores (
+            job_id INTEGER PRIMARY KEY,
+            total_score INTEGER NOT NULL,
+            executive_leadership INTEGER,
+            ai_technology INTEGER,
+            design_innovation INTEGER,
+            consulting_business INTEGER,
+            industry_fit INTEGER,
+            role_level INTEGER,
+            location_fit INTEGER,
+            strong_matches TEXT,
+            missing_requirements TEXT,
+            recommendations TEXT,
+            fingerprint VARCHAR(64),
+            profile_version VARCHAR(64),
+            scored_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (job_id) REFERENCES job_opportunities (id)
+        );
+        CREATE TABLE IF NOT EXISTS job_score_history (
+            job_id INTEGER NOT NULL,
+            profile_version VARCHAR(64) NOT NULL,
+            total_score INTEGER NOT NULL,
+            executive_leadership INTEGER,
+            ai_technology INTEGER,
+            design_innovation INTEGER,
+            consulting_business INTEGER,
+            industry_fit INTEGER,
+            role_level INTEGER,
+            location_fit INTEGER,
+            scored_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, profile_version)
+        ) WITHOUT ROWID;
+    """)
+
+    breakdown = ', '.join(f"json_extract(a.metadata, '$.breakdown.{name}')" for name in _BREAKDOWN_COLUMNS)
+    columns = ', '.join(_BREAKDOWN_COLUMNS)
+
+    # Latest job_scored entry of every job that still has an ai_score
+    conn.execute(f"""
+        INSERT OR IGNORE INTO job_scores
+        (job_id, total_score, {columns}, strong_matches, missing_requirements, recommendations,
+         fingerprint, profile_version, scored_at)
+        SELECT j.id, j.ai_score, {breakdown},
+               json_extract(a.metadata, '$.strong_matches'),
+               json_extract(a.metadata, '$.missing_requirements'),
+               json_extract(a.metadata, '$.recommendations'),
+               j.score_fingerprint, j.scored_profile_version, a.created_at
+        FROM (
+            SELECT entity_id, MAX(id) AS id FROM activity_log
+            WHERE entity_type = 'job' AND activity_type = 'job_scored'
+            GROUP BY entity_id
+        ) latest
+        JOIN activity_log a ON a.id = latest.id
+        JOIN job_opportunities j ON j.id = latest.entity_id
+        WHERE j.ai_score IS NOT NULL AND json_valid(a.metadata)
+    """)
+    conn.execute(f"""
+        INSERT OR IGNORE INTO job_score_history (job_id, profile_version, total_score, {columns}, scored_at)
+        SELECT job_id, profile_version, total_score, {columns}, scored_at
+        FROM job_scores
+        WHERE profile_version IS NOT NULL
+    """)
+
+
+def _job_scores_state(conn: sqlite3.Connection):
+    """Revision counter bumped whenever job_scores changes (what-if reweighting cache)"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS job_scores_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO job_scores_state (id, revision) VALUES (1, 0);
+
+        CREATE TRIGGER IF NOT EXISTS trg_job_scores_insert AFTER INSERT ON job_scores
+        BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_scores_update AFTER UPDATE ON job_scores
+        BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_scores_delete AFTER DELETE ON job_scores
+        BEGIN UPDATE job_scores_state SET revision = revision + 1 WHERE id = 1; END;
+    """)
+
+
+def _job_dedupe(conn: sqlite3.Connection):
+    """MinHash signatures, LSH band index and duplicate_of links for near-duplicate postings"""
+    _add_column(conn, 'job_opportunities', 'duplicate_of', 'INTEGER')
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id INTEGER PRIMARY KEY,
+            content_hash VARCHAR(64) NOT NULL,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (job_id) REFERENCES job_opportunities (id)
+        );
+        CREATE TABLE IF NOT EXISTS job_lsh_bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_jobs_duplicate_of ON job_opportunities(duplicate_of);
+        CREATE INDEX IF NOT EXISTS idx_lsh_bands_job ON job_lsh_bands(job_id);
+    """)
+
+
+def _job_search(conn: sqlite3.Connection):
+    """FTS5 index over postings and company names, kept in sync by triggers"""
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5(
+            title, job_description, requirements, notes, company_name,
+            tokenize = 'porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_job_search_insert AFTER INSERT ON job_opportunities
+        BEGIN
+            INSERT INTO job_search (rowid, title, job_description, requirements, notes, company_name)
+            VALUES (new.id, new.title, new.job_description, new.requirements, new.notes,
+                    (SELECT name FROM companies WHERE id = new.company_id));
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_search_update
+        AFTER UPDATE OF title, job_description, requirements, notes, company_id ON job_opportunities
+        BEGIN
+            UPDATE job_search SET
+                title = new.title, job_description = new.job_description,
+                requirements = new.requirements, notes = new.notes,
+                company_name = (SELECT name FROM companies WHERE id = new.company_id)
+            WHERE rowid = new.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_search_delete AFTER DELETE ON job_opportunities
+        BEGIN
+            DELETE FROM job_search WHERE rowid = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_job_search_company AFTER UPDATE OF name ON companies
+        BEGIN
+            UPDATE job_search SET company_name = new.name
+            WHERE rowid IN (SELECT id FROM job_opportunities WHERE company_id = new.id);
+        END;
+    """)
+    conn.execute("""
+        INSERT INTO job_search (rowid, title, job_description, requirements, notes, company_name)
+        SELECT j.id, j.title, j.job_description, j.requirements, j.notes, c.name
+        FROM job_opportunities j
+        LEFT JOIN companies c ON j.company_id = c.id
+        WHERE j.id NOT IN (SELECT rowid FROM job_search)
+    """)
+
+
+
+def _create_company_aliases(conn: sqlite3.Connection):
+    # reindex_companies() maintains the aliases, so 011 needs the table as well as 018
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS company_aliases (
+            alias_key VARCHAR(255) PRIMARY KEY,
+            company_id INTEGER NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (company_id) REFERENCES companies (id)
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_company_aliases_delete AFTER DELETE ON companies
+        BEGIN
+            DELETE FROM company_aliases WHERE company_id = old.id;
+        END;
+    """)
+
+
+def _company_resolution(conn: sqlite3.Connection):
+    """Normalized company keys (duplicates merged first), trigram index and cached Notion page IDs"""
+    _add_column(conn, 'companies', 'normalized_name', 'VARCHAR(255)')
+    _add_column(conn, 'companies', 'notion_page_id', 'VARCHAR(64)')
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS company_trigrams (
+            trigram CHAR(3) NOT NULL,
+            company_id INTEGER NOT NULL,
+            PRIMARY KEY (trigram, company_id),
+            FOREIGN KEY (company_id) REFERENCES companies (id)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS trg_company_trigrams_delete AFTER DELETE ON companies
+        BEGIN
+            DELETE FROM company_trigrams WHERE company_id = old.id;
+        END;
+    """)
+    _create_company_aliases(conn)
+    reindex_companies(conn)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_normalized_name ON companies(normalized_name)")
+
+
+def _dashboard_stats(conn: sqlite3.Connection):
+    """Dashboard counters kept current by triggers, recounted once here"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS dashboard_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_jobs INTEGER NOT NULL DEFAULT 0,
+            high_priority INTEGER NOT NULL DEFAULT 0,
+            applications_sent INTEGER NOT NULL DEFAULT 0,
+            interviews_scheduled INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_jobs_insert AFTER INSERT ON job_opportunities
+        BEGIN
+            UPDATE dashboard_stats SET total_jobs = total_jobs + 1,
+                high_priority = high_priority + COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+            WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_jobs_update AFTER UPDATE OF priority, ai_score ON job_opportunities
+        WHEN COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0) != COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+        BEGIN
+            UPDATE dashboard_stats SET high_priority = high_priority
+                - COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0)
+                + COALESCE(new.priority = 'high' OR new.ai_score >= 80, 0)
+            WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_jobs_delete AFTER DELETE ON job_opportunities
+        BEGIN
+            UPDATE dashboard_stats SET total_jobs = total_jobs - 1,
+                high_priority = high_priority - COALESCE(old.priority = 'high' OR old.ai_score >= 80, 0)
+            WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_applications_insert AFTER INSERT ON applications
+        BEGIN UPDATE dashboard_stats SET applications_sent = applications_sent + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_applications_delete AFTER DELETE ON applications
+        BEGIN UPDATE dashboard_stats SET applications_sent = applications_sent - 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_interviews_insert AFTER INSERT ON interviews
+        BEGIN UPDATE dashboard_stats SET interviews_scheduled = interviews_scheduled + 1 WHERE id = 1; END;
+        CREATE TRIGGER IF NOT EXISTS trg_dashboard_interviews_delete AFTER DELETE ON interviews
+        BEGIN UPDATE dashboard_stats SET interviews_scheduled = interviews_scheduled - 1 WHERE id = 1; END;
+    """)
+    conn.execute("""
+        INSERT OR REPLACE INTO dashboard_stats (id, total_jobs, high_priority, applications_sent, interviews_scheduled)
+        SELECT 1,
+               (SELECT COUNT(*) FROM job_opportunities),
+               (SELECT COUNT(*) FROM job_opportunities WHERE priority = 'high' OR ai_score >= 80),
+               (SELECT COUNT(*) FROM applications),
+               (SELECT COUNT(*) FROM interviews)
+    """)
+
+
+
+def _keyset_indexes(conn: sqlite3.Connection):
+    """Composite indexes matching the paginated jobs/applications sort orders"""
+    conn.executescript("""
+        DROP INDEX IF EXISTS idx_jobs_score;
+        DROP INDEX IF EXISTS idx_jobs_status;
+        DROP INDEX IF EXISTS idx_jobs_priority;
+        DROP INDEX IF EXISTS idx_applications_status;
+        CREATE INDEX IF NOT EXISTS idx_jobs_ranked ON job_opportunities(COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_ranked ON job_opportunities(status, COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_jobs_priority_ranked ON job_opportunities(priority, COALESCE(ai_score, -1) DESC, COALESCE(created_at, '') DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_applications_recent ON applications(application_date DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_applications_status_recent ON applications(status, application_date DESC, id DESC);
+    """)
+
+
+
+def _analytics_rollups(conn: sqlite3.Connection):
+    """Score bucket, source and month rollups maintained by triggers, built once here"""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS analytics_score_buckets (
+            bucket INTEGER PRIMARY KEY, -- 0 (0-49), 50, 60, 70, 80, 90 (90-100)
+            jobs INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS analytics_sources (
+            source VARCHAR(100) PRIMARY KEY,
+            jobs INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            scored_jobs INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS analytics_months (
+            month CHAR(7) PRIMARY KEY, -- YYYY-MM of created_at
+            jobs_added INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            scored_jobs INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_analytics_jobs_insert AFTER INSERT ON job_opportunities
+        BEGIN
+            INSERT INTO analytics_score_buckets (bucket, jobs) VALUES (CASE WHEN new.ai_score >= 50 THEN MIN(CAST(new.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END, 1)
+            ON CONFLICT(bucket) DO UPDATE SET jobs = jobs + 1;
+            INSERT INTO analytics_sources (source, jobs, score_sum, scored_jobs)
+            SELECT new.source, 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL WHERE COALESCE(new.source, '') != ''
+            ON CONFLICT(source) DO UPDATE SET jobs = jobs + 1, score_sum = score_sum + excluded.score_sum,
+                scored_jobs = scored_jobs + excluded.scored_jobs;
+            INSERT INTO analytics_months (month, jobs_added, score_sum, scored_jobs)
+            SELECT strftime('%Y-%m', new.created_at), 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL
+            WHERE new.created_at IS NOT NULL
+            ON CONFLICT(month) DO UPDATE SET jobs_added = jobs_added + 1, score_sum = score_sum + excluded.score_sum,
+                scored_jobs = scored_jobs + excluded.scored_jobs;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_analytics_jobs_update AFTER UPDATE OF ai_score, source, created_at ON job_opportunities
+        WHEN old.ai_score IS NOT new.ai_score OR old.source IS NOT new.source OR old.created_at IS NOT new.created_at
+        BEGIN
+            UPDATE analytics_score_buckets SET jobs = jobs - 1 WHERE bucket = CASE WHEN old.ai_score >= 50 THEN MIN(CAST(old.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END;
+            UPDATE analytics_sources SET jobs = jobs - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+                scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+            WHERE source = old.source;
+            UPDATE analytics_months SET jobs_added = jobs_added - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+                scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+            WHERE month = strftime('%Y-%m', old.created_at);
+            DELETE FROM analytics_sources WHERE source = old.source AND jobs = 0;
+            INSERT INTO analytics_score_buckets (bucket, jobs) VALUES (CASE WHEN new.ai_score >= 50 THEN MIN(CAST(new.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END, 1)
+            ON CONFLICT(bucket) DO UPDATE SET jobs = jobs + 1;
+            INSERT INTO analytics_sources (source, jobs, score_sum, scored_jobs)
+            SELECT new.source, 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL WHERE COALESCE(new.source, '') != ''
+            ON CONFLICT(source) DO UPDATE SET jobs = jobs + 1, score_sum = score_sum + excluded.score_sum,
+                scored_jobs = scored_jobs + excluded.scored_jobs;
+            INSERT INTO analytics_months (month, jobs_added, score_sum, scored_jobs)
+            SELECT strftime('%Y-%m', new.created_at), 1, COALESCE(new.ai_score, 0), new.ai_score IS NOT NULL
+            WHERE new.created_at IS NOT NULL
+            ON CONFLICT(month) DO UPDATE SET jobs_added = jobs_added + 1, score_sum = score_sum + excluded.score_sum,
+                scored_jobs = scored_jobs + excluded.scored_jobs;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_analytics_jobs_delete AFTER DELETE ON job_opportunities
+        BEGIN
+            UPDATE analytics_score_buckets SET jobs = jobs - 1 WHERE bucket = CASE WHEN old.ai_score >= 50 THEN MIN(CAST(old.ai_score AS INTEGER) / 10 * 10, 90) ELSE 0 END;
+            UPDATE analytics_sources SET jobs = jobs - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+                scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+            WHERE source = old.source;
+            UPDATE analytics_months SET jobs_added = jobs_added - 1, score_sum = score_sum - COALESCE(old.ai_score, 0),
+                scored_jobs = scored_jobs - (old.ai_score IS NOT NULL)
+            WHERE month = strftime('%Y-%m', old.created_at);
+            DELETE FROM analytics_sources WHERE source = old.source AND jobs = 0;
+        END;
+    """)
+    rebuild_rollups(conn)
+
+
+
+def _table_versions(conn: sqlite3.Connection):
+    """Per-table change counters for conditional GETs, one trigger per table and operation"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name VARCHAR(64) PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+    """)
+    for table in TRACKED_TABLES:
+        conn.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_versions_{table}_{operation.lower()} AFTER {operation} ON {table}
+                BEGIN UPDATE table_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+                      WHERE table_name = '{table}'; END
+            """)
+
+
+def _task_queue(conn: sqlite3.Connection):
+    """Table backing the background task queue, with the index workers claim from"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_type VARCHAR(50) NOT NULL, -- handler name, e.g. application_package
+            dedupe_key VARCHAR(255), -- at most one queued/running task per (task_type, dedupe_key)
+            payload TEXT, -- JSON arguments for the handler
+            status VARCHAR(20) DEFAULT 'queued', -- queued, running, succeeded, failed
+            progress INTEGER DEFAULT 0, -- 0-100
+            progress_message TEXT,
+            result TEXT, -- JSON returned by the handler
+            error TEXT, -- last failure
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            run_after DATETIME DEFAULT CURRENT_TIMESTAMP, -- retries are pushed back with exponential backoff
+            locked_by VARCHAR(64), -- worker running it
+            locked_at DATETIME,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            finished_at DATETIME
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks(status, run_after, id)")
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_active_key ON tasks(task_type, dedupe_key)
+        WHERE status IN ('queued', 'running')
+    """)
+
+
+def _activity_archive(conn: sqlite3.Connection):
+    """Indexed JSON fields and entity lookups on activity_log, plus the compressed archive for retention"""
+    # VIRTUAL (the only kind ALTER TABLE can add): computed on read, stored only in their indexes
+    json_field = "GENERATED ALWAYS AS (CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.{}') END) VIRTUAL"
+    _add_column(conn, 'activity_log', 'folder_path', 'VARCHAR(500) ' + json_field.format('folder_path'))
+    _add_column(conn, 'activity_log', 'notion_page_id', 'VARCHAR(64) ' + json_field.format('notion_page_id'))
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_activity_entity
+            ON activity_log(entity_type, entity_id, activity_type, created_at);
+        CREATE INDEX IF NOT EXISTS idx_activity_notion_page
+            ON activity_log(notion_page_id) WHERE notion_page_id IS NOT NULL;
+        CREATE TABLE IF NOT EXISTS activity_archive (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_id INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,
+            first_created_at DATETIME,
+            last_created_at DATETIME,
+            row_count INTEGER NOT NULL,
+            raw_bytes INTEGER NOT NULL,
+            payload BLOB NOT NULL, -- zlib-compressed JSON {"columns": [...], "rows": [...]}
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS activity_archive_entities (
+            entity_type VARCHAR(50) NOT NULL,
+            entity_id INTEGER NOT NULL,
+            activity_type VARCHAR(100) NOT NULL,
+            segment_id INTEGER NOT NULL,
+            PRIMARY KEY (entity_type, entity_id, activity_type, segment_id)
+        ) WITHOUT ROWID;
+    """)
+
+
+def _company_aliases(conn: sqlite3.Connection):
+    """Explicit company aliases; keys are recomputed with legal-form-only suffix stripping (old keys kept as aliases)"""
+    _create_company_aliases(conn)
+    reindex_companies(conn)
+
+
+def _job_dedupe_cleanup(conn: sqlite3.Connection):
+    """Drop the MinHash/LSH rows and duplicate_of links of deleted jobs, now and on every delete"""
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_job_dedupe_delete AFTER DELETE ON job_opportunities
+        BEGIN
+            DELETE FROM job_minhash WHERE job_id = old.id;
+            DELETE FROM job_lsh_bands WHERE job_id = old.id;
+            UPDATE job_opportunities SET duplicate_of = NULL WHERE duplicate_of = old.id;
+        END;
+        DELETE FROM job_minhash WHERE job_id NOT IN (SELECT id FROM job_opportunities);
+        DELETE FROM job_lsh_bands WHERE job_id NOT IN (SELECT id FROM job_opportunities);
+        UPDATE job_opportunities SET duplicate_of = NULL
+        WHERE duplicate_of IS NOT NULL AND duplicate_of NOT IN (SELECT id FROM job_opportunities);
+    """)
+
+
+# Applied in order; each migration must be safe to run against a database created from schema.sql
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ('004_score_fingerprints', _score_fingerprints),
+    ('005_scoring_profile_state', _scoring_profile_state),
+    ('006_job_requirements', _job_requirements),
+    ('007_job_scores', _job_scores),
+    ('008_job_scores_state', _job_scores_state),
+    ('009_job_dedupe', _job_dedupe),
+    ('010_job_search', _job_search),
+    ('011_company_resolution', _company_resolution),
+    ('012_dashboard_stats', _dashboard_stats),
+    ('013_keyset_indexes', _keyset_indexes),
+    ('014_analytics_rollups', _analytics_rollups),
+    ('015_table_versions', _table_versions),
+    ('016_task_queue', _task_queue),
+    ('017_activity_archive', _activity_archive),
+    ('018_company_aliases', _company_aliases),
+    ('019_job_dedupe_cleanup', _job_dedupe_cleanup),
+]
+
+
+def migrate_database(db_path: str) -> List[str]:
+    """Apply any pending migrations and return the names of those applied"""
+    applied = []
+
+    with connection(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name VARCHAR(100) PRIMARY KEY,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        done = {row[0] for row in conn.execute("SELECT name FROM schema_migrations")}
+
+        for name, migration in MIGRATIONS:
+            if name in done:
+                continue
+            migration(conn)
+            conn.execute("INSERT INTO schema_migrations (name) VALUES (?)", (name,))
+            conn.commit()
+            applied.append(name)
+
+    return applied
+
+
+if __name__ == "__main__":
+    for name in migrate_database("job_tracker.db"):
+        print(f"✅ Applied migration: {name}")
@@ -10,6 +10,8 @@ from datetime import datetime, date
 from typing import Dict, List, Optional, Any
 import os
 from dataclasses import dataclass
+from .db import connection
+from .query_cache import invalidate
 
 @dataclass
 class NotionConfig:
@@ -199,10 +201,10 @@ class NotionJobTracker:
 
     def sync_job_to_notion(self, job_id: int) -> Optional[str]:
         """Sync a single job from SQLite to Notion"""
-        with sqlite3.connect(self.local_db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with connection(self.local_db_path, row_factory=sqlite3.Row) as conn:
             job = conn.execute("""
-                SELECT j.*, c.name as company_name, c.industry, c.website, c.description as company_description
+                SELECT j.*, c.name as company_name, c.industry, c.website, c.description as company_description,
+                       c.notion_page_id as company_notion_page_id
                 FROM job_opportunities j
                 LEFT JOIN companies c ON j.company_id = c.id
                 WHERE j.id = ?
@@ -293,7 +295,7 @@ class NotionJobTracker:
             notion_page = response.json()
 
             # Store Notion page ID in local database
-            with sqlite3.connect(self.local_db_path) as conn:
+            with connection(self.local_db_path) as conn:
                 conn.execute("""
                     UPDATE job_opportunities
                     SET notes = COALESCE(notes, '') || ?
@@ -312,6 +314,7 @@ class NotionJobTracker:
                     'Job synced to Notion database',
                     json.dumps({'notion_page_id': notion_page['id']})
                 ))
+            invalidate(self.local_db_path, 'job_opportunities')
 
             return notion_page['id']
 
@@ -336,13 +339,19 @@ class NotionJobTracker:
             response.raise_for_status()
             notion_jobs = response.json()
 
-            with sqlite3.connect(self.local_db_path) as conn:
+            with connection(self.local_db_path) as conn:
                 for notion_page in notion_jobs['results']:
                     job_data = self._parse_notion_job(notion_page)
 
                     if job_data:
-                        # Check if job exists locally
+                        # Check if job exists locally: the indexed sync log first, then the notes
+                        # (jobs synced before the log was indexed, or whose entries were archived)
                         existing = conn.execute("""
+                            SELECT entity_id FROM activity_log
+                            WHERE notion_page_id = ? AND entity_type = 'job'
+                            ORDER BY id DESC
+                            LIMIT 1
+                        """, (notion_page['id'],)).fetchone() or conn.execute("""
                             SELECT id FROM job_opportunities
                             WHERE notes LIKE ?
                         """, (f"%Notion Page ID: {notion_page['id']}%",)).fetchone()
@@ -354,6 +363,7 @@ class NotionJobTracker:
                             # Create new job
                             job_id = self._create_local_job(conn, job_data, notion_page['id'])
                             synced_jobs.append({'action': 'created', 'job_id': job_id, 'title': job_data['title']})
+            invalidate(self.local_db_path, 'job_opportunities', 'companies')
 
         except requests.exceptions.RequestException as e:
             print(f"Failed to sync from Notion: {e}")
@@ -389,7 +399,7 @@ class NotionJobTracker:
 
         # Link to job if provided
         if job_id:
-            with sqlite3.connect(self.local_db_path) as conn:
+            with connection(self.local_db_path) as conn:
                 job = conn.execute("SELECT title FROM job_opportunities WHERE id = ?", (job_id,)).fetchone()
                 if job:
                     reading_data['properties']['Related Job'] = {
@@ -445,6 +455,19 @@ class NotionJobTracker:
         if not job['company_name']:
             return None
 
+        # Jobs point at canonical local companies, so one Notion page per company is cached locally
+        if job['company_notion_page_id']:
+            return job['company_notion_page_id']
+
+        page_id = self._find_or_create_company_page(job)
+        if page_id:
+            with connection(self.local_db_path) as conn:
+                conn.execute("UPDATE companies SET notion_page_id = ? WHERE id = ?", (page_id, job['company_id']))
+            invalidate(self.local_db_path, 'companies')
+        return page_id
+
+    def _find_or_create_company_page(self, job: sqlite3.Row) -> Optional[str]:
+        """Search the Notion companies database by name, creating the page if it is missing"""
         # Search for existing company
         try:
             response = requests.post(
@@ -0,0 +1,139 @@
+"""
+Keyset Pagination
+Cursor-based pages over the jobs and applications lists, so page N costs the same as page 1
+"""
+
+import base64
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sort keys (all descending), each backed by a composite expression index ending in id DESC.
+# Nullable columns are COALESCEd below every real value, so rows never scored (or with no
+# created_at) sort last instead of dropping out of the keyset comparison.
+JOB_ORDER = ('COALESCE(j.ai_score, -1)', "COALESCE(j.created_at, '')", 'j.id')
+APPLICATION_ORDER = ('a.application_date', 'a.id')
+
+
+@dataclass
+class Page:
+    items: List[sqlite3.Row]
+    next_cursor: Optional[str]
+    limit: int
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key from a cursor; raises ValueError for anything encode_cursor didn't produce"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def page_size(limit: Optional[int]) -> int:
+    return min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+
+
+def order_by(order: Sequence[str]) -> str:
+    """ORDER BY list for a sort key, matching its index"""
+    return ', '.join(f"{expression} DESC" for expression in order)
+
+
+def sort_columns(order: Sequence[str]) -> str:
+    """Select list exposing the sort key of each row as sort_0, sort_1, ..."""
+    return ', '.join(f"{expression} AS sort_{i}" for i, expression in enumerate(order))
+
+
+def _page(conn: sqlite3.Connection, sql: str, params: List, order: Sequence[str],
+          cursor: Optional[str], limit: int) -> Page:
+    """Append the keyset condition, ORDER BY and LIMIT to sql and fetch one page"""
+    if cursor:
+        values = decode_cursor(cursor, len(order))
+        # The bound on the leading expression lets SQLite seek the expression index;
+        # the row-value comparison alone would scan it from the top
+        sql += f" AND {order[0]} <= ? AND ({', '.join(order)}) < ({', '.join('?' for _ in order)})"
+        params = params + values[:1] + values
+    sql += f" ORDER BY {order_by(order)} LIMIT ?"
+
+    # One extra row tells us whether there is a next page without a COUNT(*)
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][f'sort_{i}'] for i in range(len(order))])
+    return Page(items=rows, next_cursor=next_cursor, limit=limit)
+
+
+def jobs_page(conn: sqlite3.Connection, status: str = '', priority: str = '', min_score: int = 0,
+              cursor: Optional[str] = None, limit: Optional[int] = None) -> Page:
+    """One page of jobs, highest score first (newest first within a score); conn needs sqlite3.Row"""
+    sql = f"""
+        SELECT j.*, c.name as company_name, c.industry, {sort_columns(JOB_ORDER)}
+        FROM job_opportunities j
+        LEFT JOIN companies c ON j.company_id = c.id
+        WHERE 1=1
+    """
+    params: List = []
+
+    if status:
+        sql += " AND j.status = ?"
+        params.append(status)
+
+    if priority:
+        sql += " AND j.priority = ?"
+        params.append(priority)
+
+    if min_score > 0:
+        sql += " AND j.ai_score >= ?"
+        params.append(min_score)
+
+    return _page(conn, sql, params, JOB_ORDER, cursor, page_size(limit))
+
+
+def applications_page(conn: sqlite3.Connection, status: str = '', cursor: Optional[str] = None,
+                      limit: Optional[int] = None) -> Page:
+    """One page of applications, most recent first; conn needs sqlite3.Row"""
+    sql = f"""
+        SELECT
+            a.*,
+            j.title as job_title,
+            c.name as company_name,
+            j.ai_score,
+            {sort_columns(APPLICATION_ORDER)}
+        FROM applications a
+        JOIN job_opportunities j ON a.job_id = j.id
+        JOIN companies c ON j.company_id = c.id
+        WHERE 1=1
+    """
+    params: List = []
+
+    if status:
+        sql += " AND a.status = ?"
+        params.append(status)
+
+    return _page(conn, sql, params, APPLICATION_ORDER, cursor, page_size(limit))
+
+
+# Usage example:
+if __name__ == "__main__":
+    from .db import connection
+
+    with connection("job_tracker.db", row_factory=sqlite3.Row) as conn:
+        page = jobs_page(conn, limit=10)
+        while page.items:
+            print(f"{len(page.items)} jobs, first: {page.items[0]['title']} ({page.items[0]['ai_score']})")
+            if not page.next_cursor:
+                break
+            page = jobs_page(conn, cursor=page.next_cursor, limit=10)
@@ -0,0 +1,131 @@
+"""
+Parallel Job Rescoring
+Spreads JobScoringAlgorithm scoring across a process pool with a single database writer
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Tuple
+
+from .db import connection
+from .scoring_algorithm import BatchScoreResult, JobScore, JobScoringAlgorithm
+
+# Set once per worker process by _init_worker
+_worker_scorer: Optional[JobScoringAlgorithm] = None
+
+
+def _init_worker(scorer: JobScoringAlgorithm):
+    """Receive the compiled scorer (profile + keyword automaton) once per worker"""
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _score_chunk(job_ids: List[int], force: bool) -> Tuple[List[Tuple[int, JobScore]], int]:
+    """Read and score one chunk of jobs inside a worker process; returns (results, skipped)"""
+    results = []
+    skipped = 0
+
+    with connection(_worker_scorer.db_path) as conn:
+        for job_data in _worker_scorer.load_jobs(conn, job_ids):
+            if not force and _worker_scorer.is_score_current(job_data):
+                skipped += 1
+                continue
+            results.append((job_data['id'], _worker_scorer.score_job_data(job_data)))
+
+    return results, skipped
+
+
+def default_worker_count() -> int:
+    """Worker count from SCORING_WORKERS, falling back to the number of CPUs"""
+    configured = os.getenv('SCORING_WORKERS')
+    if configured:
+        return max(int(configured), 1)
+    return os.cpu_count() or 1
+
+
+def rescore_parallel(scorer: JobScoringAlgorithm, job_ids: Optional[Iterable[int]] = None,
+                     workers: Optional[int] = None, chunk_size: int = 250,
+                     commit_every: int = 2000, force: bool = False,
+                     query: Optional[str] = None, params: Tuple = ()) -> BatchScoreResult:
+    """
+    Rescore jobs on a process pool
+
+    Job IDs are split into chunks of ``chunk_size`` and scored by the workers; the
+    calling process is the only writer and commits every ``commit_every`` results.
+    Scores are identical to JobScoringAlgorithm.score_jobs().
+
+    Args:
+        scorer: Scorer whose profile is shipped to every worker
+        job_ids: Jobs to rescore (all jobs when omitted)
+        workers: Process count (defaults to default_worker_count())
+        chunk_size: Job IDs per worker task
+        commit_every: Results written per transaction
+        force: Rescore even jobs whose content and profile version are unchanged
+        query: Optional SQL condition on the job row (alias ``j``), as in score_jobs()
+        params: Parameters for ``query``
+    """
+    started = time.perf_counter()
+    workers = workers or default_worker_count()
+
+    sql = "SELECT j.id FROM job_opportunities j WHERE 1=1"
+    sql_params: List = []
+    if job_ids is not None:
+        sql += " AND j.id IN (SELECT value FROM json_each(?))"
+        sql_params.append(json.dumps(list(job_ids)))
+    if query:
+        sql += f" AND ({query})"
+        sql_params.extend(params)
+
+    with connection(scorer.db_path) as conn:
+        job_ids = [row[0] for row in conn.execute(sql + " ORDER BY j.id", sql_params)]
+
+    if workers <= 1 or len(job_ids) <= chunk_size:
+        return scorer.score_jobs(job_ids, force=force)
+
+    scorer.profile  # compile the profile here so every worker gets the same one
+    chunks = [job_ids[i:i + chunk_size] for i in range(0, len(job_ids), chunk_size)]
+    scores = {}
+    skipped = 0
+    pending: List[Tuple[int, JobScore]] = []
+
+    # spawn keeps workers from inheriting the parent's open SQLite handles
+    context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(scorer,)) as pool, \
+            connection(scorer.db_path) as conn:
+        futures = [pool.submit(_score_chunk, chunk, force) for chunk in chunks]
+
+        for future in as_completed(futures):
+            results, chunk_skipped = future.result()
+            skipped += chunk_skipped
+            pending.extend(results)
+            scores.update((job_id, result.total_score) for job_id, result in results)
+
+            if len(pending) >= commit_every:
+                scorer.write_scores(conn, pending)
+                conn.commit()
+                pending = []
+
+        if pending:
+            scorer.write_scores(conn, pending)
+            conn.commit()
+
+    elapsed = time.perf_counter() - started
+    return BatchScoreResult(
+        jobs_scored=len(scores),
+        elapsed_seconds=elapsed,
+        jobs_per_second=len(scores) / elapsed if elapsed > 0 else 0.0,
+        scores=scores,
+        jobs_skipped=skipped
+    )
+
+
+# Usage example:
+if __name__ == "__main__":
+    result = rescore_parallel(JobScoringAlgorithm("job_tracker.db"))
+    print(f"Rescored {result.jobs_scored} jobs in {result.elapsed_seconds:.2f}s "
+          f"({result.jobs_per_second:.0f} jobs/s)")
@@ -0,0 +1,197 @@
+"""
+Scoring Profile Index
+Compiles the my_profile and scoring_weights tables into an immutable, cached index for the scorer
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .db import connection
+from .keyword_matcher import KeywordMatcher
+
+# Skill categories scored by JobScoringAlgorithm, in scoring order
+SKILL_CATEGORIES = ('executive_leadership', 'ai_technology', 'design_innovation', 'consulting_business')
+
+# Fit components scored from company/title/location rather than skills
+FIT_COMPONENTS = ('industry_fit', 'role_level', 'location_fit')
+
+DEFAULT_WEIGHTS = {
+    'executive_leadership': 0.25,
+    'ai_technology': 0.30,
+    'design_innovation': 0.25,
+    'consulting_business': 0.20,
+    'industry_fit': 0.10,
+    'role_level': 0.10,
+    'location_fit': 0.05,
+}
+
+# Used when my_profile has not been populated yet (see setup.populate_jason_profile)
+DEFAULT_SKILLS = {
+    'executive_leadership': [
+        ('Chief Design Officer', 10, 5, ['CDO', 'Chief Design', 'Head of Design']),
+        ('Chief Technology Officer', 8, 2, ['CTO', 'Chief Technology', 'Technical Director']),
+        ('Strategic Planning', 10, 13, ['Strategy', 'Strategic', 'Planning', 'Vision']),
+        ('P&L Management', 9, 8, ['P&L', 'Budget', 'Financial', 'Revenue']),
+        ('Digital Transformation', 10, 13, ['Digital Transform', 'Transformation', 'Change']),
+        ('Team Leadership', 10, 13, ['Team Lead', 'Management', 'Leadership', 'Mentor']),
+    ],
+    'ai_technology': [
+        ('AI/ML Integration', 9, 2, ['AI', 'Machine Learning', 'ML', 'Artificial Intelligence']),
+        ('AWS Bedrock', 8, 1, ['AWS', 'Bedrock', 'Claude', 'Amazon']),
+        ('Multi-Agent Systems', 9, 1, ['Multi-agent', 'Agent', 'LangChain']),
+        ('Solution Architecture', 10, 8, ['Solution Architect', 'Architecture', 'System Design']),
+        ('Enterprise Architecture', 9, 6, ['Enterprise Arch', 'TOGAF', 'EA']),
+        ('Natural Language Processing', 8, 2, ['NLP', 'Natural Language', 'Text Processing']),
+    ],
+    'design_innovation': [
+        ('Multi-Modal Design', 10, 1, ['Multi-modal', 'Design Innovation', 'Design Framework']),
+        ('AI+UX Integration', 10, 1, ['AI UX', 'AI Design', 'UX AI']),
+        ('Design Strategy', 10, 13, ['Design Strategy', 'Design Vision', 'Design Lead']),
+        ('User Experience Design', 10, 13, ['UX', 'User Experience', 'UX Design']),
+        ('Human-Centered Design', 10, 13, ['Human-centered', 'HCD', 'User-centered']),
+        ('Design Systems', 9, 8, ['Design System', 'Design Library', 'Component']),
+        ('Design Operations', 8, 5, ['DesignOps', 'Design Ops', 'Design Operation']),
+    ],
+    'consulting_business': [
+        ('Management Consulting', 9, 8, ['Management Consult', 'Strategy Consult', 'Consulting']),
+        ('Business Analysis', 9, 13, ['Business Analysis', 'Process', 'Analysis']),
+        ('Process Optimization', 9, 13, ['Process Optim', 'Efficiency', 'Optimization']),
+        ('ROI Analysis', 8, 10, ['ROI', 'Return on Investment', 'Business Case']),
+        ('Strategic Roadmaps', 9, 10, ['Roadmap', 'Strategy', 'Planning']),
+        ('Stakeholder Management', 10, 13, ['Stakeholder', 'Stakeholder Management']),
+    ],
+}
+
+
+class SkillProfile(NamedTuple):
+    skill: str
+    proficiency: int
+    years: int
+    keywords: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CategoryProfile:
+    name: str
+    weight: float
+    skills: Tuple[SkillProfile, ...]
+
+
+@dataclass(frozen=True)
+class ProfileIndex:
+    revision: Optional[int]
+    categories: Tuple[CategoryProfile, ...]
+    fit_weights: Tuple[Tuple[str, float], ...]
+    keyword_matcher: KeywordMatcher
+
+    def category(self, name: str) -> CategoryProfile:
+        for category in self.categories:
+            if category.name == name:
+                return category
+        raise KeyError(name)
+
+    def fit_weight(self, name: str) -> float:
+        return dict(self.fit_weights)[name]
+
+
+_cache: Dict[str, ProfileIndex] = {}
+_cache_lock = threading.Lock()
+
+
+def _missing_table(error: sqlite3.OperationalError) -> bool:
+    """True for "no such table" (an older database); other errors such as a locked database propagate"""
+    return 'no such table' in str(error)
+
+
+def _profile_revision(conn: sqlite3.Connection) -> Optional[int]:
+    """Counter bumped by triggers whenever my_profile or scoring_weights change"""
+    try:
+        row = conn.execute("SELECT revision FROM scoring_profile_state WHERE id = 1").fetchone()
+    except sqlite3.OperationalError as e:
+        if not _missing_table(e):
+            raise
+        return None  # database predates the profile state table
+    return row[0] if row else None
+
+
+def _load_skills(conn: sqlite3.Connection) -> Dict[str, Tuple[SkillProfile, ...]]:
+    try:
+        rows = conn.execute("""
+            SELECT category, skill, proficiency_level, years_experience, keywords
+            FROM my_profile
+            ORDER BY id
+        """).fetchall()
+    except sqlite3.OperationalError as e:
+        if not _missing_table(e):
+            raise
+        rows = []
+
+    skills: Dict[str, list] = {name: [] for name in SKILL_CATEGORIES}
+    for category, skill, proficiency, years, keywords in rows:
+        if category not in skills:
+            continue
+        keyword_list = tuple(k.strip() for k in (keywords or '').split(',') if k.strip())
+        skills[category].append(SkillProfile(skill, proficiency or 0, years or 0, keyword_list))
+
+    if not any(skills.values()):
+        skills = {
+            name: [SkillProfile(skill, proficiency, years, tuple(keywords))
+                   for skill, proficiency, years, keywords in DEFAULT_SKILLS[name]]
+            for name in SKILL_CATEGORIES
+        }
+
+    return {name: tuple(entries) for name, entries in skills.items()}
+
+
+def _load_weights(conn: sqlite3.Connection) -> Dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+    try:
+        weights.update(conn.execute("SELECT component, weight FROM scoring_weights").fetchall())
+    except sqlite3.OperationalError as e:
+        if not _missing_table(e):
+            raise
+    return weights
+
+
+def _build_index(conn: sqlite3.Connection, revision: Optional[int]) -> ProfileIndex:
+    skills = _load_skills(conn)
+    weights = _load_weights(conn)
+
+    categories = tuple(
+        CategoryProfile(name=name, weight=weights[name], skills=skills[name])
+        for name in SKILL_CATEGORIES
+    )
+
+    return ProfileIndex(
+        revision=revision,
+        categories=categories,
+        fit_weights=tuple((name, weights[name]) for name in FIT_COMPONENTS),
+        keyword_matcher=KeywordMatcher(
+            keyword
+            for category in categories
+            for skill in category.skills
+            for keyword in skill.keywords
+        )
+    )
+
+
+def load_profile_index(db_path: str) -> ProfileIndex:
+    """
+    Return the compiled profile for db_path
+
+    The index is rebuilt only when scoring_profile_state.revision has moved since it
+    was cached, so the usual cost is a single primary-key read.
+    """
+    with connection(db_path) as conn:
+        revision = _profile_revision(conn)
+        cached = _cache.get(db_path)
+        if cached is not None and revision is not None and cached.revision == revision:
+            return cached
+
+        index = _build_index(conn, revision)
+
+    with _cache_lock:
+        _cache[db_path] = index
+    return index
@@ -0,0 +1,140 @@
+"""
+Query Result Cache
+Bounded LRU of read results tagged by the tables they touch, invalidated by writes and table change counters
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+from .change_tracking import data_version
+
+
+class QueryCache:
+    """
+    LRU of key -> result, each entry tagged with the tables it was read from
+
+    Writers call invalidate(tables) to drop entries eagerly. Every hit is also
+    checked against the tables' change counters (table_versions), so writes made
+    by other processes, or committed after an invalidation, are never served stale.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, Tuple[Tuple[str, ...], str, Any]]' = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_or_load(self, conn: sqlite3.Connection, key: Hashable, tables: Sequence[str],
+                    load: Callable[[], Any]) -> Any:
+        """Cached result for key, or load() it (and cache it) if missing or stale"""
+        tables = tuple(sorted(set(tables)))
+        # Read the version before loading: a write landing in between then only makes the entry stale
+        version = data_version(conn, tables)
+        if version is None:
+            with self._lock:
+                self.misses += 1
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == version.token:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            if entry is not None:
+                self.stale += 1
+
+        value = load()
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (tables, version.token, value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def fetchall(self, conn: sqlite3.Connection, sql: str, params: Iterable = (),
+                 tables: Sequence[str] = ()) -> List:
+        """conn.execute(sql, params).fetchall() through the cache"""
+        params = tuple(params)
+        key = ('sql', sql, params, conn.row_factory)
+        return self.get_or_load(conn, key, tables, lambda: conn.execute(sql, params).fetchall())
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for table in entry[0]:
+                keys = self._by_table.get(table)
+                if keys is not None:
+                    keys.discard(key)
+
+    def invalidate(self, *tables: str) -> int:
+        """Drop every entry that read any of tables; returns the number dropped"""
+        with self._lock:
+            keys = set().union(*(self._by_table.get(table, ()) for table in tables))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+
+
+_caches: Dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(db_path: str) -> QueryCache:
+    """Shared result cache for db_path"""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = _caches[db_path] = QueryCache()
+        return cache
+
+
+def invalidate(db_path: str, *tables: str) -> int:
+    """Drop cached results that read any of tables (call after writing to them)"""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+    return cache.invalidate(*tables) if cache is not None else 0
+
+
+# Usage example:
+if __name__ == "__main__":
+    from .db import connection
+
+    cache = get_query_cache("job_tracker.db")
+    with connection("job_tracker.db") as conn:
+        for _ in range(3):
+            cache.fetchall(conn, "SELECT COUNT(*) FROM job_opportunities", tables=['job_opportunities'])
+        invalidate("job_tracker.db", 'job_opportunities')
+        cache.fetchall(conn, "SELECT COUNT(*) FROM job_opportunities", tables=['job_opportunities'])
+    print(cache.stats())
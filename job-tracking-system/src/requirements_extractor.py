@@ -0,0 +1,176 @@
+"""
+Job Requirement Extraction
+Splits a posting into requirement lines, classifies each one and scores it against the profile
+"""
+
+import re
+import sqlite3
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .db import connection
+from .job_document import tokenize
+from .keyword_matcher import KeywordMatcher
+from .profile_index import ProfileIndex
+
+# Requirements Jason's profile does not cover; the ones a line names are stored in job_requirement_terms
+COMMON_REQUIREMENTS = [
+    'MBA', 'PhD', 'Certification', 'Agile Coach', 'Scrum Master',
+    'Product Management', 'Data Science', 'DevOps', 'Cloud Native'
+]
+
+# Checked in order, so "nice to have" wins over "required" on the same line
+IMPORTANCE_CUES = (
+    ('nice-to-have', ('nice to have', 'nice-to-have', 'bonus', 'a plus', 'advantageous', 'an advantage')),
+    ('preferred', ('preferred', 'desirable', 'desired', 'ideally', 'highly regarded')),
+    ('required', ('required', 'requirement', 'must', 'essential', 'mandatory', 'minimum', 'qualifications')),
+)
+
+CATEGORY_TERMS = (
+    ('education', {'mba', 'phd', 'degree', 'bachelor', 'bachelors', 'master', 'masters', 'diploma',
+                   'certification', 'certified', 'certificate', 'tertiary'}),
+    ('leadership', {'lead', 'leading', 'leadership', 'manage', 'managing', 'management', 'executive',
+                    'team', 'teams', 'stakeholder', 'stakeholders', 'mentor', 'mentoring', 'director'}),
+    ('industry', {'industry', 'sector', 'domain', 'banking', 'financial', 'insurance', 'fintech',
+                  'government', 'telecommunications', 'healthcare', 'retail'}),
+    ('experience', {'experience', 'years', 'track', 'background', 'proven'}),
+)
+
+MAX_REQUIREMENT_LENGTH = 500
+
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·▪◦]|\d+[.)])\s*")
+_YEARS_RE = re.compile(r"\d+\s*\+?\s*years?")
+_term_matcher = KeywordMatcher(COMMON_REQUIREMENTS)
+
+# keyword_scores() per compiled profile, keyed by its matcher
+_keyword_scores: 'weakref.WeakKeyDictionary[KeywordMatcher, Dict[str, int]]' = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class RequirementMatch:
+    requirement: str
+    category: str
+    importance: str
+    match_score: int
+    terms: List[str] = field(default_factory=list)
+
+
+def _importance_cue(line: str) -> Optional[str]:
+    lowered = line.lower()
+    for importance, cues in IMPORTANCE_CUES:
+        if any(cue in lowered for cue in cues):
+            return importance
+    return None
+
+
+def _is_heading(line: str) -> bool:
+    return line.endswith(':') and len(line) <= 60
+
+
+def classify_category(requirement: str) -> str:
+    """technical, leadership, experience, industry or education"""
+    words = set(tokenize(requirement))
+    if _YEARS_RE.search(requirement.lower()):
+        return 'education' if words & CATEGORY_TERMS[0][1] else 'experience'
+    for category, terms in CATEGORY_TERMS:
+        if words & terms:
+            return category
+    return 'technical'
+
+
+def _requirement_lines(text: Optional[str], in_requirements_field: bool):
+    """Yield (line, importance) for every requirement line of one field"""
+    section = 'required' if in_requirements_field else None
+
+    for raw_line in (text or '').splitlines():
+        line = _BULLET_RE.sub('', raw_line).strip()
+        if not line:
+            continue
+
+        cue = _importance_cue(line)
+        if _is_heading(line):
+            # A heading sets the importance of the lines below it; description
+            # sections without a cue (e.g. "About the role:") are not requirements
+            section = cue or ('required' if in_requirements_field else None)
+            continue
+
+        importance = cue or section
+        if importance:
+            yield line, importance
+
+
+def keyword_scores(profile: ProfileIndex) -> Dict[str, int]:
+    """Best skill match score (as used by JobScoringAlgorithm) for each profile keyword"""
+    scores = _keyword_scores.get(profile.keyword_matcher)
+    if scores is not None:
+        return scores
+
+    scores = {}
+    for category in profile.categories:
+        for skill in category.skills:
+            match_score = min(skill.proficiency * 10 + skill.years * 2, 100)
+            for keyword in skill.keywords:
+                scores[keyword] = max(scores.get(keyword, 0), match_score)
+    _keyword_scores[profile.keyword_matcher] = scores
+    return scores
+
+
+def extract_requirements(job_data: Dict, profile: ProfileIndex) -> List[RequirementMatch]:
+    """
+    Requirement lines of a posting with their category, importance and match score
+
+    Every line of the requirements field is a requirement (required unless a cue or
+    heading says otherwise); description lines count only under a requirement heading
+    or when they carry an importance cue. Each line is one requirement with its own
+    match score, tagged with every COMMON_REQUIREMENTS term it names.
+    """
+    scores = keyword_scores(profile)
+    matcher = profile.keyword_matcher
+    requirements = []
+
+    for field_name, in_requirements_field in (('requirements', True), ('job_description', False)):
+        for line, importance in _requirement_lines(job_data.get(field_name), in_requirements_field):
+            hits = matcher.find(line)
+            requirements.append(RequirementMatch(
+                requirement=line[:MAX_REQUIREMENT_LENGTH],
+                category=classify_category(line),
+                importance=importance,
+                match_score=max((scores.get(keyword, 0) for keyword in hits), default=0),
+                terms=sorted(_term_matcher.find(line), key=COMMON_REQUIREMENTS.index)
+            ))
+
+    return requirements
+
+
+def jobs_requiring(conn: sqlite3.Connection, term: str, importance: Optional[str] = None) -> List[int]:
+    """IDs of jobs whose extracted requirements name ``term`` (e.g. 'MBA'; any case)"""
+    sql = """
+        SELECT DISTINCT t.job_id
+        FROM job_requirement_terms t
+        JOIN job_requirements r ON r.id = t.requirement_id
+        WHERE t.term = ?
+    """
+    params: List = [term.strip()]
+    if importance:
+        sql += " AND r.importance = ?"
+        params.append(importance)
+    return [row[0] for row in conn.execute(sql + " ORDER BY t.job_id", params)]
+
+
+def match_by_importance(conn: sqlite3.Connection, job_id: Optional[int] = None) -> Dict[str, float]:
+    """Average match_score per importance level, for one job or the whole corpus"""
+    sql = "SELECT importance, AVG(match_score) FROM job_requirements"
+    params: List = []
+    if job_id is not None:
+        sql += " WHERE job_id = ?"
+        params.append(job_id)
+    return {importance: round(average, 1)
+            for importance, average in conn.execute(sql + " GROUP BY importance", params)}
+
+
+# Usage example:
+if __name__ == "__main__":
+    with connection("job_tracker.db") as conn:
+        print(f"Jobs requiring an MBA: {jobs_requiring(conn, 'MBA', 'required')}")
+        print(f"Average match by importance: {match_by_importance(conn)}")
@@ -0,0 +1,190 @@
+"""
+What-If Reweighting
+Reranks every scored job under alternative weights from the stored job_scores components
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, pure Python fallback below
+    np = None
+
+from .db import connection
+from .profile_index import FIT_COMPONENTS, SKILL_CATEGORIES, ProfileIndex
+
+COMPONENTS = SKILL_CATEGORIES + FIT_COMPONENTS
+
+# Skill categories are stored as 0-100 percentages, fit components as 0-100 scores that the
+# scorer divides by 10, so a weight w contributes component * w * SCALE[c] points
+SCALE = tuple([1.0] * len(SKILL_CATEGORIES) + [10.0] * len(FIT_COMPONENTS))
+
+
+@dataclass
+class ScoreMatrix:
+    """job_scores components of every scored job, loaded once per job_scores revision"""
+    revision: Optional[int]
+    job_ids: List[int]
+    rows: List[Tuple[int, ...]]
+    array: Optional['np.ndarray'] = None
+    _baselines: Dict[Tuple[float, ...], Tuple[List[float], List[int]]] = field(default_factory=dict)
+
+
+@dataclass
+class WhatIfResult:
+    weights: Dict[str, float]
+    jobs_ranked: int
+    jobs_moved: int
+    elapsed_ms: float
+    top: List[Dict]
+
+
+_cache: Dict[str, ScoreMatrix] = {}
+_cache_lock = threading.Lock()
+
+
+def _scores_revision(conn: sqlite3.Connection) -> Optional[int]:
+    """Counter bumped by triggers on every job_scores write"""
+    try:
+        row = conn.execute("SELECT revision FROM job_scores_state WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def load_score_matrix(conn: sqlite3.Connection, db_path: str) -> ScoreMatrix:
+    """Cached component matrix for db_path, reloaded only after job_scores changes"""
+    revision = _scores_revision(conn)
+    cached = _cache.get(db_path)
+    if cached is not None and revision is not None and cached.revision == revision:
+        return cached
+
+    columns = ', '.join(f"COALESCE({name}, 0)" for name in COMPONENTS)
+    job_ids, rows = [], []
+    for row in conn.execute(f"SELECT job_id, {columns} FROM job_scores ORDER BY job_id"):
+        job_ids.append(row[0])
+        rows.append(row[1:])
+
+    matrix = ScoreMatrix(revision=revision, job_ids=job_ids, rows=rows)
+    if np is not None:
+        matrix.array = np.array(rows, dtype=np.float64).reshape(len(rows), len(COMPONENTS))
+
+    with _cache_lock:
+        _cache[db_path] = matrix
+    return matrix
+
+
+def profile_weights(profile: ProfileIndex) -> Dict[str, float]:
+    """The weights the stored scores were computed with"""
+    weights = {category.name: category.weight for category in profile.categories}
+    weights.update(profile.fit_weights)
+    return weights
+
+
+def _rank(matrix: ScoreMatrix, weights: Tuple[float, ...]) -> Tuple[List[float], List[int]]:
+    """Unrounded totals and 1-based ranks (highest total first, ties by job ID)"""
+    factors = [weight * scale for weight, scale in zip(weights, SCALE)]
+
+    if matrix.array is not None:
+        totals = matrix.array @ np.array(factors)
+        order = np.lexsort((np.array(matrix.job_ids), -totals))
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(1, len(order) + 1)
+        return totals.tolist(), ranks.tolist()
+
+    totals = [sum(value * factor for value, factor in zip(row, factors)) for row in matrix.rows]
+    order = sorted(range(len(totals)), key=lambda i: (-totals[i], matrix.job_ids[i]))
+    ranks = [0] * len(totals)
+    for position, i in enumerate(order, start=1):
+        ranks[i] = position
+    return totals, ranks
+
+
+def _baseline(matrix: ScoreMatrix, weights: Tuple[float, ...]) -> Tuple[List[float], List[int]]:
+    baseline = matrix._baselines.get(weights)
+    if baseline is None:
+        baseline = matrix._baselines[weights] = _rank(matrix, weights)
+    return baseline
+
+
+def what_if(conn: sqlite3.Connection, db_path: str, profile: ProfileIndex,
+            weights: Dict[str, float], top_k: int = 20) -> WhatIfResult:
+    """
+    Rerank all scored jobs with some weights changed
+
+    Args:
+        weights: Component -> weight overrides; other components keep the profile weight
+        top_k: Number of top jobs to return
+
+    Totals are recomputed from the per-component columns with the scorer's formula and
+    compared with the same recomputation under the current weights, so rank deltas only
+    reflect the weight change.
+    """
+    started = time.perf_counter()
+
+    unknown = set(weights) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown scoring components: {', '.join(sorted(unknown))}")
+    if any(not isinstance(value, (int, float)) or value < 0 for value in weights.values()):
+        raise ValueError("Weights must be non-negative numbers")
+
+    current = profile_weights(profile)
+    merged = {**current, **{name: float(value) for name, value in weights.items()}}
+
+    matrix = load_score_matrix(conn, db_path)
+    base_totals, base_ranks = _baseline(matrix, tuple(current[name] for name in COMPONENTS))
+    totals, ranks = _rank(matrix, tuple(merged[name] for name in COMPONENTS))
+
+    top = [{
+        'job_id': matrix.job_ids[i],
+        'score': min(int(totals[i]), 100),
+        'baseline_score': min(int(base_totals[i]), 100),
+        'rank': ranks[i],
+        'baseline_rank': base_ranks[i],
+        'rank_delta': base_ranks[i] - ranks[i],
+    } for i in _top_positions(ranks, min(top_k, len(ranks)))]
+
+    if top:
+        details = {row[0]: row[1:] for row in conn.execute("""
+            SELECT j.id, j.title, c.name
+            FROM job_opportunities j
+            LEFT JOIN companies c ON j.company_id = c.id
+            WHERE j.id IN (SELECT value FROM json_each(?))
+        """, (json.dumps([entry['job_id'] for entry in top]),))}
+        for entry in top:
+            entry['title'], entry['company_name'] = details.get(entry['job_id'], (None, None))
+
+    return WhatIfResult(
+        weights=merged,
+        jobs_ranked=len(ranks),
+        jobs_moved=sum(1 for old, new in zip(base_ranks, ranks) if old != new),
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        top=top
+    )
+
+
+def _top_positions(ranks: List[int], top_k: int) -> List[int]:
+    """Positions holding ranks 1..top_k, in rank order"""
+    positions = [0] * top_k
+    for i, rank in enumerate(ranks):
+        if rank <= top_k:
+            positions[rank - 1] = i
+    return positions
+
+
+# Usage example:
+if __name__ == "__main__":
+    from .scoring_algorithm import JobScoringAlgorithm
+
+    scorer = JobScoringAlgorithm("job_tracker.db")
+    with connection("job_tracker.db") as conn:
+        result = what_if(conn, "job_tracker.db", scorer.profile, {'ai_technology': 0.40})
+
+    print(f"Reranked {result.jobs_ranked} jobs in {result.elapsed_ms:.1f}ms ({result.jobs_moved} moved)")
+    for entry in result.top:
+        print(f"#{entry['rank']} ({entry['rank_delta']:+d}) {entry['score']} {entry['title']}")
@@ -3,12 +3,20 @@ AI-Powered Job Opportunity Scoring Algorithm
 Analyzes job postings and scores compatibility against Jason's profile
 """
 
-import re
+import hashlib
 import sqlite3
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple, Optional
+from dataclasses import dataclass, field
 import json
 from datetime import datetime
+from .db import connection
+from .job_document import JobDocument, analyze_job
+from .keyword_matcher import KeywordMatcher
+from .query_cache import invalidate
+from .profile_index import FIT_COMPONENTS, SKILL_CATEGORIES, CategoryProfile, ProfileIndex, load_profile_index
+from .requirements_extractor import COMMON_REQUIREMENTS, RequirementMatch, extract_requirements
 
 @dataclass
 class SkillMatch:
@@ -25,6 +33,41 @@ class JobScore:
     missing_requirements: List[str]
     strong_matches: List[str]
     recommendations: List[str]
+    fingerprint: Optional[str] = None
+    profile_version: Optional[str] = None
+    requirements: List[RequirementMatch] = field(default_factory=list)
+
+@dataclass
+class BatchScoreResult:
+    jobs_scored: int
+    elapsed_seconds: float
+    jobs_per_second: float
+    scores: Dict[int, int] = field(default_factory=dict)
+    jobs_skipped: int = 0
+
+# Job fields that feed the score; a change to any of them invalidates ai_score
+SCORED_FIELDS = ('title', 'job_description', 'requirements', 'industry', 'location', 'remote_option')
+
+def job_fingerprint(job_data: Dict) -> str:
+    """Hash of the scored fields of a job row"""
+    content = '\x1f'.join(str(job_data.get(name) or '') for name in SCORED_FIELDS)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+# JobScore.breakdown keys, which are also the per-component columns of job_scores
+BREAKDOWN_COLUMNS = SKILL_CATEGORIES + FIT_COMPONENTS
+
+def load_stored_breakdown(conn: sqlite3.Connection, job_id: int) -> Optional[Dict]:
+    """The job_scores row of a job as a dict with a nested 'breakdown', or None if never scored"""
+    cursor = conn.execute("SELECT * FROM job_scores WHERE job_id = ?", (job_id,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    stored = dict(zip([desc[0] for desc in cursor.description], row))
+    stored['breakdown'] = {name: stored.pop(name) for name in BREAKDOWN_COLUMNS}
+    for name in ('strong_matches', 'missing_requirements', 'recommendations'):
+        stored[name] = json.loads(stored[name] or '[]')
+    return stored
 
 class JobScoringAlgorithm:
     def __init__(self, db_path: str):
@@ -32,54 +75,14 @@ class JobScoringAlgorithm:
         self.init_jason_profile()
 
     def init_jason_profile(self):
-        """Initialize Jason's profile data for scoring"""
-        self.jason_profile = {
-            'executive_leadership': {
-                'skills': [
-                    ('Chief Design Officer', 10, 5, ['CDO', 'Chief Design', 'Head of Design']),
-                    ('Chief Technology Officer', 8, 2, ['CTO', 'Chief Technology', 'Technical Director']),
-                    ('Strategic Planning', 10, 13, ['Strategy', 'Strategic', 'Planning', 'Vision']),
-                    ('P&L Management', 9, 8, ['P&L', 'Budget', 'Financial', 'Revenue']),
-                    ('Digital Transformation', 10, 13, ['Digital Transform', 'Transformation', 'Change']),
-                    ('Team Leadership', 10, 13, ['Team Lead', 'Management', 'Leadership', 'Mentor']),
-                ],
-                'weight': 0.25
-            },
-            'ai_technology': {
-                'skills': [
-                    ('AI/ML Integration', 9, 2, ['AI', 'Machine Learning', 'ML', 'Artificial Intelligence']),
-                    ('AWS Bedrock', 8, 1, ['AWS', 'Bedrock', 'Claude', 'Amazon']),
-                    ('Multi-Agent Systems', 9, 1, ['Multi-agent', 'Agent', 'LangChain']),
-                    ('Solution Architecture', 10, 8, ['Solution Architect', 'Architecture', 'System Design']),
-                    ('Enterprise Architecture', 9, 6, ['Enterprise Arch', 'TOGAF', 'EA']),
-                    ('Natural Language Processing', 8, 2, ['NLP', 'Natural Language', 'Text Processing']),
-                ],
-                'weight': 0.30
-            },
-            'design_innovation': {
-                'skills': [
-                    ('Multi-Modal Design', 10, 1, ['Multi-modal', 'Design Innovation', 'Design Framework']),
-                    ('AI+UX Integration', 10, 1, ['AI UX', 'AI Design', 'UX AI']),
-                    ('Design Strategy', 10, 13, ['Design Strategy', 'Design Vision', 'Design Lead']),
-                    ('User Experience Design', 10, 13, ['UX', 'User Experience', 'UX Design']),
-                    ('Human-Centered Design', 10, 13, ['Human-centered', 'HCD', 'User-centered']),
-                    ('Design Systems', 9, 8, ['Design System', 'Design Library', 'Component']),
-                    ('Design Operations', 8, 5, ['DesignOps', 'Design Ops', 'Design Operation']),
-                ],
-                'weight': 0.25
-            },
-            'consulting_business': {
-                'skills': [
-                    ('Management Consulting', 9, 8, ['Management Consult', 'Strategy Consult', 'Consulting']),
-                    ('Business Analysis', 9, 13, ['Business Analysis', 'Process', 'Analysis']),
-                    ('Process Optimization', 9, 13, ['Process Optim', 'Efficiency', 'Optimization']),
-                    ('ROI Analysis', 8, 10, ['ROI', 'Return on Investment', 'Business Case']),
-                    ('Strategic Roadmaps', 9, 10, ['Roadmap', 'Strategy', 'Planning']),
-                    ('Stakeholder Management', 10, 13, ['Stakeholder', 'Stakeholder Management']),
-                ],
-                'weight': 0.20
-            }
-        }
+        """Initialize Jason's profile data for scoring
+
+        Skills, proficiency and keywords come from the my_profile table and the weights
+        from scoring_weights, compiled into a cached ProfileIndex on first use.
+        """
+        self._loaded: Optional[Tuple[ProfileIndex, str]] = None
+        # Serialises profile reloads so exactly one caller sees each profile change
+        self._profile_lock = threading.RLock()
 
         # Industry expertise
         self.industry_experience = {
@@ -101,15 +104,99 @@ class JobScoringAlgorithm:
             'Lead': 7,        # Lead roles
         }
 
+    def __getstate__(self):
+        # Shipped to rescore_parallel workers; locks can't be pickled
+        state = self.__dict__.copy()
+        del state['_profile_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._profile_lock = threading.RLock()
+
+    def _profile_state(self) -> Tuple[ProfileIndex, str]:
+        """The compiled profile and its version, loaded on first use"""
+        loaded = self._loaded
+        if loaded is None:
+            with self._profile_lock:
+                if self._loaded is None:
+                    self._set_profile(load_profile_index(self.db_path))
+                loaded = self._loaded
+        return loaded
+
+    def _set_profile(self, index: ProfileIndex):
+        snapshot = self.profile_snapshot(index)
+        version = hashlib.sha1(json.dumps(snapshot, sort_keys=True).encode('utf-8')).hexdigest()
+        self._loaded = (index, version)
+
+    @property
+    def profile(self) -> ProfileIndex:
+        return self._profile_state()[0]
+
+    @property
+    def profile_version(self) -> str:
+        return self._profile_state()[1]
+
+    def refresh_profile(self) -> bool:
+        """
+        Reload the profile if my_profile or scoring_weights changed since it was compiled
+
+        Returns:
+            True when a new profile was loaded (its version is recorded and affected
+            jobs are marked stale via sync_profile_version); concurrent callers that
+            see the same change get True only once
+        """
+        with self._profile_lock:
+            current = self._loaded
+            index = load_profile_index(self.db_path)
+            if current is not None and index is current[0]:
+                return False
+
+            self._set_profile(index)
+            if current is not None and current[1] == self._loaded[1]:
+                return False
+
+            self.sync_profile_version()
+            return True
+
+    def profile_snapshot(self, index: Optional[ProfileIndex] = None) -> Dict:
+        """JSON-serialisable copy of everything that influences a score"""
+        index = index or self.profile
+        return {
+            'categories': {
+                category.name: {
+                    'weight': category.weight,
+                    'skills': [[skill.skill, skill.proficiency, skill.years, list(skill.keywords)]
+                               for skill in category.skills]
+                }
+                for category in index.categories
+            },
+            'fit_weights': dict(index.fit_weights),
+            'industry_experience': self.industry_experience,
+            'role_preferences': self.role_preferences,
+        }
+
+    def is_score_current(self, job_data: Dict) -> bool:
+        """True when ai_score was produced from this content by the current profile"""
+        return (job_data.get('scored_profile_version') == self.profile_version
+                and job_data.get('score_fingerprint') == job_fingerprint(job_data))
+
     def score_job(self, job_id: int) -> JobScore:
         """Score a job opportunity against Jason's profile"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connection(self.db_path) as conn:
             job_data = self._get_job_data(conn, job_id)
             if not job_data:
                 raise ValueError(f"Job {job_id} not found")
 
-        # Parse job requirements
-        job_text = f"{job_data['title']} {job_data['job_description']} {job_data['requirements']}"
+        return self.score_job_data(job_data)
+
+    def score_job_data(self, job_data: Dict) -> JobScore:
+        """Score an already-loaded job row (job_opportunities joined with company name/industry)"""
+        profile, profile_version = self._profile_state()
+
+        # Parse job requirements (shared, cached analysis of the posting)
+        document = analyze_job(job_data)
+        keyword_hits = document.keyword_hits(profile.keyword_matcher)
 
         # Score different categories
         scores = {}
@@ -118,28 +205,28 @@ class JobScoringAlgorithm:
 
         # 1. Executive Leadership Score (25%)
         exec_score, exec_matches = self._score_category(
-            job_text, self.jason_profile['executive_leadership']
+            keyword_hits, profile.category('executive_leadership')
         )
         scores['executive_leadership'] = int(exec_score * 100)
         skill_matches.extend(exec_matches)
 
         # 2. AI/Technology Score (30%)
         tech_score, tech_matches = self._score_category(
-            job_text, self.jason_profile['ai_technology']
+            keyword_hits, profile.category('ai_technology')
         )
         scores['ai_technology'] = int(tech_score * 100)
         skill_matches.extend(tech_matches)
 
         # 3. Design Innovation Score (25%)
         design_score, design_matches = self._score_category(
-            job_text, self.jason_profile['design_innovation']
+            keyword_hits, profile.category('design_innovation')
         )
         scores['design_innovation'] = int(design_score * 100)
         skill_matches.extend(design_matches)
 
         # 4. Consulting/Business Score (20%)
         business_score, business_matches = self._score_category(
-            job_text, self.jason_profile['consulting_business']
+            keyword_hits, profile.category('consulting_business')
         )
         scores['consulting_business'] = int(business_score * 100)
         skill_matches.extend(business_matches)
@@ -158,13 +245,13 @@ class JobScoringAlgorithm:
 
         # Calculate weighted total score
         total_score = (
-            exec_score * self.jason_profile['executive_leadership']['weight'] * 100 +
-            tech_score * self.jason_profile['ai_technology']['weight'] * 100 +
-            design_score * self.jason_profile['design_innovation']['weight'] * 100 +
-            business_score * self.jason_profile['consulting_business']['weight'] * 100 +
-            (industry_score / 10) * 0.1 * 100 +  # 10% weight
-            (role_level_score / 10) * 0.1 * 100 +  # 10% weight
-            (location_score / 10) * 0.05 * 100     # 5% weight
+            exec_score * profile.category('executive_leadership').weight * 100 +
+            tech_score * profile.category('ai_technology').weight * 100 +
+            design_score * profile.category('design_innovation').weight * 100 +
+            business_score * profile.category('consulting_business').weight * 100 +
+            (industry_score / 10) * profile.fit_weight('industry_fit') * 100 +  # 10% weight
+            (role_level_score / 10) * profile.fit_weight('role_level') * 100 +  # 10% weight
+            (location_score / 10) * profile.fit_weight('location_fit') * 100     # 5% weight
         )
 
         # Generate recommendations
@@ -172,28 +259,31 @@ class JobScoringAlgorithm:
 
         # Identify strong matches and missing requirements
         strong_matches = [m.skill for m in skill_matches if m.match_score >= 80]
-        missing_requirements = self._identify_missing_requirements(job_text, skill_matches)
+        missing_requirements = self._identify_missing_requirements(document, skill_matches)
 
         return JobScore(
             total_score=min(int(total_score), 100),
             breakdown=scores,
             missing_requirements=missing_requirements,
             strong_matches=strong_matches,
-            recommendations=recommendations
+            recommendations=recommendations,
+            fingerprint=job_fingerprint(job_data),
+            profile_version=profile_version,
+            requirements=extract_requirements(job_data, profile)
         )
 
-    def _score_category(self, job_text: str, category: Dict) -> Tuple[float, List[SkillMatch]]:
-        """Score a specific skill category"""
+    def _score_category(self, keyword_hits: FrozenSet[str], category: CategoryProfile) -> Tuple[float, List[SkillMatch]]:
+        """Score a specific skill category from the keywords found in the job text"""
         total_score = 0
         matches_found = 0
         skill_matches = []
 
-        for skill_name, proficiency, years, keywords in category['skills']:
+        for skill_name, proficiency, years, keywords in category.skills:
             match_score = 0
 
             # Check for keyword matches
             for keyword in keywords:
-                if re.search(keyword, job_text, re.IGNORECASE):
+                if keyword in keyword_hits:
                     # Higher proficiency and experience = higher match score
                     match_score = min(proficiency * 10 + years * 2, 100)
                     break
@@ -210,7 +300,7 @@ class JobScoringAlgorithm:
                 ))
 
         # Average score for this category
-        category_score = total_score / (len(category['skills']) * 100) if category['skills'] else 0
+        category_score = total_score / (len(category.skills) * 100) if category.skills else 0
         return category_score, skill_matches
 
     def _score_industry(self, industry: str) -> int:
@@ -281,19 +371,14 @@ class JobScoringAlgorithm:
 
         return recommendations
 
-    def _identify_missing_requirements(self, job_text: str, matches: List[SkillMatch]) -> List[str]:
+    def _identify_missing_requirements(self, document: JobDocument, matches: List[SkillMatch]) -> List[str]:
         """Identify requirements mentioned in job but not in Jason's profile"""
         # This would be more sophisticated with NLP, but for now we'll use keyword analysis
-        common_requirements = [
-            'MBA', 'PhD', 'Certification', 'Agile Coach', 'Scrum Master',
-            'Product Management', 'Data Science', 'DevOps', 'Cloud Native'
-        ]
-
         missing = []
         matched_skills = {m.skill.lower() for m in matches}
 
-        for req in common_requirements:
-            if req.lower() in job_text.lower() and req.lower() not in matched_skills:
+        for req in COMMON_REQUIREMENTS:
+            if document.contains(req) and req.lower() not in matched_skills:
                 missing.append(req)
 
         return missing
@@ -314,36 +399,276 @@ class JobScoringAlgorithm:
         columns = [desc[0] for desc in cursor.description]
         return dict(zip(columns, row))
 
-    def update_job_score(self, job_id: int) -> JobScore:
-        """Update job score in database"""
-        score_result = self.score_job(job_id)
+    def update_job_score(self, job_id: int, force: bool = False) -> JobScore:
+        """Update job score in database, reusing the stored score when the job and profile are unchanged"""
+        with connection(self.db_path) as conn:
+            job_data = self._get_job_data(conn, job_id)
+            if not job_data:
+                raise ValueError(f"Job {job_id} not found")
+
+            if not force and self.is_score_current(job_data):
+                stored = self._load_stored_score(conn, job_data)
+                if stored:
+                    return stored
+
+            score_result = self.score_job_data(job_data)
+            self.write_scores(conn, [(job_id, score_result)])
+
+        return score_result
+
+    def score_jobs(self, job_ids: Optional[Iterable[int]] = None, query: Optional[str] = None,
+                   params: Tuple = (), force: bool = False) -> BatchScoreResult:
+        """
+        Score many jobs with one read cursor and write the results back in a single transaction
+
+        Args:
+            job_ids: Specific jobs to score
+            query: Optional SQL condition on the job row (alias ``j``), e.g. "j.status = ?"
+            params: Parameters for ``query``
+            force: Rescore even jobs whose content and profile version are unchanged
+
+        With neither job_ids nor query every job is considered.
+        """
+        started = time.perf_counter()
+        skipped = 0
+
+        with connection(self.db_path) as conn:
+            results = []
+            for job_data in self.load_jobs(conn, job_ids, query, params):
+                if not force and self.is_score_current(job_data):
+                    skipped += 1
+                    continue
+                results.append((job_data['id'], self.score_job_data(job_data)))
+
+            self.write_scores(conn, results)
+
+        elapsed = time.perf_counter() - started
+        return BatchScoreResult(
+            jobs_scored=len(results),
+            elapsed_seconds=elapsed,
+            jobs_per_second=len(results) / elapsed if elapsed > 0 else 0.0,
+            scores={job_id: result.total_score for job_id, result in results},
+            jobs_skipped=skipped
+        )
+
+    def load_jobs(self, conn: sqlite3.Connection, job_ids: Optional[Iterable[int]] = None,
+                  query: Optional[str] = None, params: Tuple = ()) -> Iterator[Dict]:
+        """Stream job rows (joined with company name/industry) through a single cursor"""
+        sql = """
+            SELECT j.*, c.name as company_name, c.industry
+            FROM job_opportunities j
+            LEFT JOIN companies c ON j.company_id = c.id
+            WHERE 1=1
+        """
+        sql_params: List = []
+
+        if job_ids is not None:
+            sql += " AND j.id IN (SELECT value FROM json_each(?))"
+            sql_params.append(json.dumps(list(job_ids)))
+
+        if query:
+            sql += f" AND ({query})"
+            sql_params.extend(params)
+
+        cursor = conn.execute(sql + " ORDER BY j.id", sql_params)
+        columns = [desc[0] for desc in cursor.description]
+
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def write_scores(self, conn: sqlite3.Connection, results: List[Tuple[int, JobScore]]):
+        """Write ai_score, the job_scores breakdown and the extracted requirements for each (job_id, JobScore) pair"""
+        conn.executemany("""
+            UPDATE job_opportunities
+            SET ai_score = ?, score_fingerprint = ?, scored_profile_version = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [(result.total_score, result.fingerprint, result.profile_version, job_id)
+              for job_id, result in results])
+
+        # Current breakdown (one row per job) and its history per profile version
+        columns = ', '.join(BREAKDOWN_COLUMNS)
+        placeholders = ', '.join('?' for _ in BREAKDOWN_COLUMNS)
+        updates = ', '.join(f"{name} = excluded.{name}" for name in BREAKDOWN_COLUMNS)
+
+        conn.executemany(f"""
+            INSERT INTO job_scores
+            (job_id, total_score, {columns}, strong_matches, missing_requirements, recommendations,
+             fingerprint, profile_version, scored_at)
+            VALUES (?, ?, {placeholders}, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (job_id) DO UPDATE SET
+                total_score = excluded.total_score, {updates},
+                strong_matches = excluded.strong_matches,
+                missing_requirements = excluded.missing_requirements,
+                recommendations = excluded.recommendations,
+                fingerprint = excluded.fingerprint,
+                profile_version = excluded.profile_version,
+                scored_at = excluded.scored_at
+        """, [(
+            job_id,
+            result.total_score,
+            *(result.breakdown[name] for name in BREAKDOWN_COLUMNS),
+            json.dumps(result.strong_matches),
+            json.dumps(result.missing_requirements),
+            json.dumps(result.recommendations),
+            result.fingerprint,
+            result.profile_version
+        ) for job_id, result in results])
+
+        conn.executemany(f"""
+            INSERT INTO job_score_history (job_id, profile_version, total_score, {columns}, scored_at)
+            VALUES (?, ?, ?, {placeholders}, CURRENT_TIMESTAMP)
+            ON CONFLICT (job_id, profile_version) DO UPDATE SET
+                total_score = excluded.total_score, {updates},
+                scored_at = excluded.scored_at
+        """, [(
+            job_id,
+            result.profile_version,
+            result.total_score,
+            *(result.breakdown[name] for name in BREAKDOWN_COLUMNS)
+        ) for job_id, result in results if result.profile_version])
+
+        # Replace the extracted requirements of every rescored job
+        rescored = json.dumps([job_id for job_id, _ in results])
+        conn.execute("DELETE FROM job_requirement_terms WHERE job_id IN (SELECT value FROM json_each(?))", (rescored,))
+        conn.execute("DELETE FROM job_requirements WHERE job_id IN (SELECT value FROM json_each(?))", (rescored,))
+        requirements = [(job_id, req) for job_id, result in results for req in result.requirements]
+        if requirements:
+            conn.executemany("""
+                INSERT INTO job_requirements
+                (job_id, category, requirement, importance, match_score)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(job_id, req.category, req.requirement, req.importance, req.match_score)
+                  for job_id, req in requirements])
+            # The write lock is held for the whole batch, so AUTOINCREMENT ids are consecutive
+            first_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(requirements) + 1
+            conn.executemany("""
+                INSERT INTO job_requirement_terms (term, requirement_id, job_id) VALUES (?, ?, ?)
+            """, [(term, first_id + offset, job_id)
+                  for offset, (job_id, req) in enumerate(requirements) for term in req.terms])
+
+        # Cached page reads of these jobs are now out of date
+        invalidate(self.db_path, 'job_opportunities', 'job_scores')
+
+    def _load_stored_score(self, conn: sqlite3.Connection, job_data: Dict) -> Optional[JobScore]:
+        """Rebuild the last JobScore written for a job from job_scores"""
+        stored = load_stored_breakdown(conn, job_data['id'])
+        if not stored:
+            return None
+
+        requirements = [
+            RequirementMatch(requirement, category, importance, match_score,
+                             sorted(json.loads(terms), key=COMMON_REQUIREMENTS.index))
+            for requirement, category, importance, match_score, terms in conn.execute("""
+                SELECT r.requirement, r.category, r.importance, r.match_score,
+                       (SELECT json_group_array(t.term) FROM job_requirement_terms t WHERE t.requirement_id = r.id)
+                FROM job_requirements r WHERE r.job_id = ?
+                ORDER BY r.id
+            """, (job_data['id'],))
+        ]
+        return JobScore(
+            total_score=stored['total_score'],
+            breakdown=stored['breakdown'],
+            missing_requirements=stored['missing_requirements'],
+            strong_matches=stored['strong_matches'],
+            recommendations=stored['recommendations'],
+            fingerprint=job_data['score_fingerprint'],
+            profile_version=job_data['scored_profile_version'],
+            requirements=requirements
+        )
+
+    def sync_profile_version(self) -> int:
+        """
+        Record the current profile version and mark the jobs a profile edit affects as stale
+
+        Jobs scored with the previous version whose text matches none of the changed
+        skills keep their score and are moved to the new version; affected jobs get
+        scored_profile_version = NULL so the next incremental score_jobs() picks them up.
+
+        Returns:
+            Number of jobs marked stale
+        """
+        with connection(self.db_path) as conn:
+            latest = conn.execute("""
+                SELECT version, profile FROM scoring_profile_versions
+                ORDER BY rowid DESC
+                LIMIT 1
+            """).fetchone()
+
+            if latest and latest[0] == self.profile_version:
+                return 0
 
-        with sqlite3.connect(self.db_path) as conn:
             conn.execute("""
-                UPDATE job_opportunities
-                SET ai_score = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (score_result.total_score, job_id))
+                INSERT OR REPLACE INTO scoring_profile_versions (version, profile)
+                VALUES (?, ?)
+            """, (self.profile_version, json.dumps(self.profile_snapshot(), sort_keys=True)))
+
+            if not latest:
+                return 0
+
+            previous_version = latest[0]
+            affected_keywords = self._keywords_affected_by(json.loads(latest[1]))
+
+            if affected_keywords is None:
+                return conn.execute("""
+                    UPDATE job_opportunities SET scored_profile_version = NULL
+                    WHERE scored_profile_version = ?
+                """, (previous_version,)).rowcount
+
+            matcher = KeywordMatcher(affected_keywords)
+            stale_ids = [
+                job_data['id']
+                for job_data in self.load_jobs(conn, query='j.scored_profile_version = ?',
+                                               params=(previous_version,))
+                if JobDocument.from_job(job_data).keyword_hits(matcher)
+            ]
 
-            # Store detailed scoring breakdown
             conn.execute("""
-                INSERT OR REPLACE INTO activity_log
-                (activity_type, entity_type, entity_id, description, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                'job_scored',
-                'job',
-                job_id,
-                f"AI scoring completed with score {score_result.total_score}",
-                json.dumps({
-                    'breakdown': score_result.breakdown,
-                    'strong_matches': score_result.strong_matches,
-                    'missing_requirements': score_result.missing_requirements,
-                    'recommendations': score_result.recommendations
-                })
-            ))
+                UPDATE job_opportunities SET scored_profile_version = NULL
+                WHERE id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(stale_ids),))
+            conn.execute("""
+                UPDATE job_opportunities SET scored_profile_version = ?
+                WHERE scored_profile_version = ?
+            """, (self.profile_version, previous_version))
+
+            return len(stale_ids)
+
+    def _keywords_affected_by(self, previous: Dict) -> Optional[Set[str]]:
+        """
+        Keywords whose presence in a job means its score changes between the previous
+        profile snapshot and this one, or None when every job is affected
+        """
+        current = json.loads(json.dumps(self.profile_snapshot()))
+
+        if (previous.get('fit_weights') != current['fit_weights']
+                or previous.get('industry_experience') != current['industry_experience']
+                or previous.get('role_preferences') != current['role_preferences']
+                or set(previous.get('categories', {})) != set(current['categories'])):
+            return None
 
-        return score_result
+        affected: Set[str] = set()
+        for name, category in current['categories'].items():
+            old_category = previous['categories'][name]
+            if old_category['weight'] != category['weight']:
+                return None
+
+            old_skills, new_skills = old_category['skills'], category['skills']
+            if len(old_skills) != len(new_skills):
+                # The category average changes for every job with a hit in this category
+                affected.update(keyword for skill in old_skills + new_skills for keyword in skill[3])
+                continue
+
+            for old_skill, new_skill in zip(old_skills, new_skills):
+                if old_skill != new_skill:
+                    affected.update(old_skill[3])
+                    affected.update(new_skill[3])
+
+        return affected
 
 # Usage example:
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+"""
+Slow Query Log
+Statements over a time threshold, with their parameters and EXPLAIN QUERY PLAN captured once per statement
+"""
+
+import os
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+# SLOW_QUERY_MS sets the threshold (default 50ms)
+DEFAULT_THRESHOLD_MS = 50.0
+RECENT_LIMIT = 200               # slow executions kept for the report
+PARAM_VALUE_LENGTH = 60          # longer parameter values (job descriptions) are cut
+MAX_PARAMS = 12
+
+# Only these can be explained; PRAGMA/COMMIT/DDL are timed but never planned
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+@dataclass
+class SlowExecution:
+    statement: str
+    sql: str
+    params: Any
+    duration_ms: float
+    endpoint: str
+    at: str
+
+
+@dataclass
+class QueryPlan:
+    lines: List[str]
+    full_scans: List[str]        # tables read without an index
+    temp_btrees: List[str]       # sorts / DISTINCT / GROUP BY done in a temporary b-tree
+
+
+@dataclass
+class SlowStatement:
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    plan: Optional[QueryPlan] = None
+    last: Optional[SlowExecution] = None
+
+
+def format_params(params: Any) -> Any:
+    """JSON-friendly copy of bound parameters, long values shortened"""
+    def short(value):
+        if isinstance(value, (bytes, memoryview)):
+            return f"<{len(value)} bytes>"
+        if isinstance(value, str) and len(value) > PARAM_VALUE_LENGTH:
+            return value[:PARAM_VALUE_LENGTH - 1] + '…'
+        return value
+
+    if isinstance(params, dict):
+        return {name: short(value) for name, value in list(params.items())[:MAX_PARAMS]}
+    if isinstance(params, (list, tuple)):
+        values = [short(value) for value in params[:MAX_PARAMS]]
+        if len(params) > MAX_PARAMS:
+            values.append(f"… {len(params) - MAX_PARAMS} more")
+        return values
+    return None
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Any = ()) -> Optional[QueryPlan]:
+    """EXPLAIN QUERY PLAN for sql, as indented lines plus the full scans and temp b-trees it shows"""
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        # sqlite3.Connection.execute, not a subclass's: explaining must not be timed or logged
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    except sqlite3.Error:
+        return None
+
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+
+    details = [row[3] for row in rows]
+    # Scanning a CTE/subquery result (or an FTS index) isn't a missing index
+    subqueries = {detail.split(' ', 1)[1] for detail in details if detail.startswith(('MATERIALIZE ', 'CO-ROUTINE '))}
+    return QueryPlan(
+        lines=lines,
+        full_scans=[detail for detail in details if detail.startswith('SCAN ') and ' USING ' not in detail
+                    and 'VIRTUAL TABLE' not in detail and not detail.startswith('SCAN CONSTANT')
+                    and detail.split(' ')[1] not in subqueries],
+        temp_btrees=[detail for detail in details if 'TEMP B-TREE' in detail]
+    )
+
+
+class SlowQueryLog:
+    """Recent slow executions and per-statement aggregates (plans captured on first sighting)"""
+
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, recent_limit: int = RECENT_LIMIT):
+        self.threshold = threshold_ms / 1000
+        self.recent: Deque[SlowExecution] = deque(maxlen=recent_limit)
+        self.statements: Dict[str, SlowStatement] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def threshold_ms(self) -> float:
+        return self.threshold * 1000
+
+    def record(self, conn: sqlite3.Connection, statement: str, sql: str, params: Any,
+               seconds: float, endpoint: str = ''):
+        """Log one slow execution; the first one of a statement also captures its plan"""
+        execution = SlowExecution(
+            statement=statement,
+            sql=sql,
+            params=format_params(params),
+            duration_ms=round(seconds * 1000, 3),
+            endpoint=endpoint,
+            at=datetime.now().isoformat(timespec='seconds')
+        )
+        with self._lock:
+            stats = self.statements.get(statement)
+            needs_plan = stats is None or stats.plan is None
+        plan = explain(conn, sql, params if isinstance(params, (dict, list, tuple)) else ()) if needs_plan else None
+
+        with self._lock:
+            stats = self.statements.setdefault(statement, SlowStatement(statement))
+            stats.count += 1
+            stats.total_ms += execution.duration_ms
+            stats.max_ms = max(stats.max_ms, execution.duration_ms)
+            stats.last = execution
+            if stats.plan is None:
+                stats.plan = plan
+            self.recent.append(execution)
+
+        print(f"🐢 Slow query ({execution.duration_ms:.1f}ms{', ' + endpoint if endpoint else ''}): "
+              f"{statement[:120]}")
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self.statements.clear()
+
+    def snapshot(self) -> List[SlowStatement]:
+        with self._lock:
+            return list(self.statements.values())
+
+
+SLOW_QUERIES = SlowQueryLog(float(os.getenv('SLOW_QUERY_MS', DEFAULT_THRESHOLD_MS)))
+
+
+# Usage example:
+if __name__ == "__main__":
+    from .db import connection
+
+    with connection("job_tracker.db") as conn:
+        plan = explain(conn, "SELECT id FROM job_opportunities WHERE notes LIKE ?", ('%Notion Page ID: x%',))
+    print('\n'.join(plan.lines))
+    print(f"Full scans: {plan.full_scans}")
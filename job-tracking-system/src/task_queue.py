@@ -0,0 +1,290 @@
+"""
+Background Task Queue
+SQLite-backed queue run by a pool of worker threads, with progress reporting and retries
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .db import connection
+
+DEFAULT_MAX_ATTEMPTS = 3
+# Retry n waits RETRY_BACKOFF_SECONDS * 2**(n-1): 30s, 60s, 120s, ...
+RETRY_BACKOFF_SECONDS = 30
+# A task still running after this long lost its worker (process killed mid-task) and is requeued
+LEASE_SECONDS = 900
+POLL_INTERVAL = 2.0
+
+# Failures a retry can't fix (missing job, bad payload)
+PERMANENT_ERRORS = (ValueError, KeyError)
+
+ProgressCallback = Callable[[int, str], None]
+Handler = Callable[[Dict, ProgressCallback], Any]
+
+
+@dataclass
+class Task:
+    id: int
+    task_type: str
+    payload: Dict
+    status: str
+    progress: int
+    progress_message: Optional[str]
+    result: Any
+    error: Optional[str]
+    attempts: int
+    max_attempts: int
+    run_after: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    finished_at: Optional[str]
+
+
+TASK_COLUMNS = ', '.join(Task.__dataclass_fields__)
+
+
+def _task(row: Optional[Tuple]) -> Optional[Task]:
+    if row is None:
+        return None
+    task = Task(*row)
+    task.payload = json.loads(task.payload) if task.payload else {}
+    task.result = json.loads(task.result) if task.result else None
+    return task
+
+
+def enqueue(conn: sqlite3.Connection, task_type: str, payload: Dict, dedupe_key: Optional[str] = None,
+            max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Tuple[int, bool]:
+    """Queue a task; returns (task id, created) - a queued/running task with the same dedupe_key is reused"""
+    try:
+        cursor = conn.execute("""
+            INSERT INTO tasks (task_type, dedupe_key, payload, max_attempts)
+            VALUES (?, ?, ?, ?)
+        """, (task_type, dedupe_key, json.dumps(payload), max_attempts))
+        return cursor.lastrowid, True
+    except sqlite3.IntegrityError:
+        existing = conn.execute("""
+            SELECT id FROM tasks
+            WHERE task_type = ? AND dedupe_key = ? AND status IN ('queued', 'running')
+        """, (task_type, dedupe_key)).fetchone()
+        if existing is None:
+            raise
+        return existing[0], False
+
+
+def get_task(conn: sqlite3.Connection, task_id: int) -> Optional[Task]:
+    return _task(conn.execute(f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone())
+
+
+def claim_task(conn: sqlite3.Connection, worker_id: str, task_types: List[str]) -> Optional[Task]:
+    """Mark the oldest runnable task of task_types as running on worker_id and return it"""
+    placeholders = ', '.join('?' for _ in task_types)
+    # IMMEDIATE takes the write lock up front, so two workers can never claim the same row
+    # (inside a caller's transaction, the caller's commit decides)
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(f"""
+            UPDATE tasks
+            SET status = 'running', attempts = attempts + 1, progress = 0, progress_message = NULL,
+                locked_by = ?, locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM tasks
+                WHERE status = 'queued' AND run_after <= CURRENT_TIMESTAMP
+                  AND task_type IN ({placeholders})
+                ORDER BY run_after, id
+                LIMIT 1
+            )
+            RETURNING {TASK_COLUMNS}
+        """, [worker_id, *task_types]).fetchone()
+        if owns_transaction:
+            conn.commit()
+    except Exception:
+        if owns_transaction:
+            conn.rollback()
+        raise
+    return _task(row)
+
+
+def update_progress(conn: sqlite3.Connection, task_id: int, progress: int, message: str = ''):
+    conn.execute("""
+        UPDATE tasks SET progress = ?, progress_message = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (min(max(int(progress), 0), 100), message, task_id))
+
+
+def complete_task(conn: sqlite3.Connection, task_id: int, result: Any):
+    conn.execute("""
+        UPDATE tasks
+        SET status = 'succeeded', progress = 100, result = ?, error = NULL, locked_by = NULL,
+            updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (json.dumps(result), task_id))
+
+
+def fail_task(conn: sqlite3.Connection, task: Task, error: str, retry: bool = True) -> bool:
+    """Record a failed attempt; returns True if the task was requeued with backoff"""
+    if retry and task.attempts < task.max_attempts:
+        delay = RETRY_BACKOFF_SECONDS * 2 ** (task.attempts - 1)
+        conn.execute("""
+            UPDATE tasks
+            SET status = 'queued', error = ?, locked_by = NULL, run_after = datetime('now', ?),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (error, f'+{delay} seconds', task.id))
+        return True
+
+    conn.execute("""
+        UPDATE tasks
+        SET status = 'failed', error = ?, locked_by = NULL,
+            updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (error, task.id))
+    return False
+
+
+def requeue_orphaned(conn: sqlite3.Connection, lease_seconds: int = LEASE_SECONDS) -> int:
+    """Requeue (or fail, if out of attempts) running tasks whose worker stopped heartbeating"""
+    expired = f'-{lease_seconds} seconds'
+    conn.execute("""
+        UPDATE tasks
+        SET status = 'failed', error = 'Worker stopped while running the task', locked_by = NULL,
+            updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'running' AND updated_at < datetime('now', ?) AND attempts >= max_attempts
+    """, (expired,))
+    return conn.execute("""
+        UPDATE tasks
+        SET status = 'queued', locked_by = NULL, run_after = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE status = 'running' AND updated_at < datetime('now', ?)
+    """, (expired,)).rowcount
+
+
+def queue_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Task counts per status"""
+    counts = {status: 0 for status in ('queued', 'running', 'succeeded', 'failed')}
+    counts.update(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+    return counts
+
+
+class TaskWorkerPool:
+    """
+    Worker threads that claim tasks from the queue and run their handlers
+
+    Handlers get (payload, progress) and return a JSON-serialisable result;
+    progress(percent, message) is written to the task row as they go (it also
+    renews the task's lease). Raising retries the task with exponential backoff,
+    up to max_attempts; PERMANENT_ERRORS fail it straight away.
+    """
+
+    def __init__(self, db_path: str, handlers: Dict[str, Handler], workers: int = 2,
+                 poll_interval: float = POLL_INTERVAL, lease_seconds: int = LEASE_SECONDS):
+        self.db_path = db_path
+        self.handlers = handlers
+        self.workers = max(workers, 1)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._last_recovery = 0.0
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._recover()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(f"{os.getpid()}-{number + 1}",),
+                                      name=f'task-worker-{number + 1}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming tasks; waits for running handlers to finish (up to timeout)"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, task_type: str, payload: Dict, dedupe_key: Optional[str] = None,
+               max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Tuple[int, bool]:
+        """Queue a task and wake an idle worker; returns (task id, created)"""
+        if task_type not in self.handlers:
+            raise ValueError(f"Unknown task type: {task_type}")
+        with connection(self.db_path) as conn:
+            task_id, created = enqueue(conn, task_type, payload, dedupe_key, max_attempts)
+        self._wakeup.set()
+        return task_id, created
+
+    def _recover(self):
+        self._last_recovery = time.monotonic()
+        with connection(self.db_path) as conn:
+            requeued = requeue_orphaned(conn, self.lease_seconds)
+        if requeued:
+            print(f"Requeued {requeued} orphaned task(s)")
+
+    def _run(self, worker_id: str):
+        task_types = list(self.handlers)
+        while not self._stopping.is_set():
+            try:
+                with connection(self.db_path) as conn:
+                    task = claim_task(conn, worker_id, task_types)
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  Task worker {worker_id} could not claim a task: {e}")
+                task = None
+
+            if task is None:
+                if time.monotonic() - self._last_recovery > self.lease_seconds / 2:
+                    self._recover()
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._execute(task)
+
+    def _execute(self, task: Task):
+        def progress(percent: int, message: str = ''):
+            with connection(self.db_path) as conn:
+                update_progress(conn, task.id, percent, message)
+
+        try:
+            result = self.handlers[task.task_type](task.payload, progress)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            with connection(self.db_path) as conn:
+                retrying = fail_task(conn, task, error, retry=not isinstance(e, PERMANENT_ERRORS))
+            state = 'will retry' if retrying else 'giving up'
+            print(f"⚠️  Task {task.id} ({task.task_type}) attempt {task.attempts}/{task.max_attempts} "
+                  f"failed, {state}: {error}")
+            return
+
+        with connection(self.db_path) as conn:
+            complete_task(conn, task.id, result)
+
+
+# Usage example:
+if __name__ == "__main__":
+    def slow_add(payload: Dict, progress: ProgressCallback) -> Dict:
+        for step in range(1, 4):
+            time.sleep(0.5)
+            progress(step * 33, f"Step {step} of 3")
+        return {'sum': payload['a'] + payload['b']}
+
+    pool = TaskWorkerPool("job_tracker.db", {'slow_add': slow_add}, workers=2)
+    pool.start()
+    task_id, _ = pool.submit('slow_add', {'a': 1, 'b': 2})
+    while True:
+        with connection("job_tracker.db") as conn:
+            task = get_task(conn, task_id)
+        print(f"Task {task.id}: {task.status} {task.progress}% {task.progress_message or ''}")
+        if task.status in ('succeeded', 'failed'):
+            break
+        time.sleep(0.5)
+    pool.stop()
+    print(task.result)
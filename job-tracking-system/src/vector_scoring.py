@@ -0,0 +1,164 @@
+"""
+Vectorised Corpus Scoring
+Scores the whole job_opportunities table with sparse matrix operations (requires numpy and scipy)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional dependency
+    np = None
+    sparse = None
+
+from .db import connection
+from .job_document import JobDocument
+from .profile_index import FIT_COMPONENTS, SKILL_CATEGORIES
+from .scoring_algorithm import JobScoringAlgorithm
+
+
+def _require_numpy():
+    if np is None or sparse is None:
+        raise ImportError("Vectorised scoring needs numpy and scipy: pip3 install numpy scipy")
+
+
+@dataclass
+class CorpusMatrix:
+    """Tokenized corpus: which profile keywords occur in which job, plus the per-job fit scores"""
+    job_ids: 'np.ndarray'
+    incidence: 'sparse.csr_matrix'  # jobs x keywords, 1.0 where the keyword occurs
+    industry_fit: 'np.ndarray'
+    role_level: 'np.ndarray'
+    location_fit: 'np.ndarray'
+    profile_version: str
+
+
+def tokenize_corpus(scorer: JobScoringAlgorithm, job_ids: Optional[List[int]] = None) -> CorpusMatrix:
+    """Run the keyword automaton over every posting once and build the job x keyword matrix"""
+    _require_numpy()
+    profile, profile_version = scorer._profile_state()
+    matcher = profile.keyword_matcher
+
+    ids, industry, role_level, location = [], [], [], []
+    indptr, indices = [0], []
+
+    with connection(scorer.db_path) as conn:
+        for job_data in scorer.load_jobs(conn, job_ids):
+            ids.append(job_data['id'])
+            indices.extend(sorted(matcher.find_ids(JobDocument.from_job(job_data).text)))
+            indptr.append(len(indices))
+            industry.append(scorer._score_industry(job_data.get('industry', '')))
+            role_level.append(scorer._score_role_level(job_data['title']))
+            location.append(scorer._score_location(job_data.get('location', ''),
+                                                   job_data.get('remote_option', '')))
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(ids), len(matcher.keywords))
+    )
+
+    return CorpusMatrix(
+        job_ids=np.array(ids, dtype=np.int64),
+        incidence=incidence,
+        industry_fit=np.array(industry, dtype=np.int64),
+        role_level=np.array(role_level, dtype=np.int64),
+        location_fit=np.array(location, dtype=np.int64),
+        profile_version=profile_version
+    )
+
+
+def score_corpus(scorer: JobScoringAlgorithm, corpus: CorpusMatrix) -> Dict[str, 'np.ndarray']:
+    """
+    Score every job in the corpus with a handful of matrix operations
+
+    Returns one array per breakdown key (as in JobScore.breakdown) plus 'total_score',
+    all aligned with corpus.job_ids. Values match JobScoringAlgorithm.score_job exactly:
+    the arithmetic is done in float64 in the same order as the serial scorer.
+    """
+    _require_numpy()
+    profile, profile_version = scorer._profile_state()
+    if profile_version != corpus.profile_version:
+        raise ValueError("Corpus was tokenized with a different scoring profile; re-run tokenize_corpus")
+
+    keyword_ids = {keyword: i for i, keyword in enumerate(profile.keyword_matcher.keywords)}
+    keyword_count = len(keyword_ids)
+
+    breakdown = {}
+    raw_scores = {}
+    for category in profile.categories:
+        # keyword -> skill incidence for this category
+        rows, cols = [], []
+        for skill_index, skill in enumerate(category.skills):
+            for keyword in skill.keywords:
+                rows.append(keyword_ids[keyword])
+                cols.append(skill_index)
+        keyword_skill = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(keyword_count, len(category.skills))
+        )
+
+        skill_hits = (corpus.incidence @ keyword_skill).toarray() > 0
+        match_scores = np.array(
+            [min(skill.proficiency * 10 + skill.years * 2, 100) for skill in category.skills],
+            dtype=np.float64
+        )
+
+        if category.skills:
+            raw = (skill_hits @ match_scores) / (len(category.skills) * 100)
+        else:
+            raw = np.zeros(len(corpus.job_ids))
+
+        raw_scores[category.name] = raw
+        breakdown[category.name] = np.trunc(raw * 100).astype(np.int64)
+
+    breakdown['industry_fit'] = corpus.industry_fit
+    breakdown['role_level'] = corpus.role_level
+    breakdown['location_fit'] = corpus.location_fit
+
+    total = np.zeros(len(corpus.job_ids))
+    for name in SKILL_CATEGORIES:
+        total = total + raw_scores[name] * profile.category(name).weight * 100
+    for name in FIT_COMPONENTS:
+        total = total + (breakdown[name] / 10) * profile.fit_weight(name) * 100
+
+    breakdown['total_score'] = np.minimum(np.trunc(total).astype(np.int64), 100)
+    return breakdown
+
+
+def verify_against_serial(scorer: JobScoringAlgorithm, corpus: CorpusMatrix,
+                          breakdown: Dict[str, 'np.ndarray']) -> List[int]:
+    """Score the corpus with score_job_data and return the IDs of jobs that disagree"""
+    mismatches = []
+    positions = {int(job_id): i for i, job_id in enumerate(corpus.job_ids)}
+
+    with connection(scorer.db_path) as conn:
+        for job_data in scorer.load_jobs(conn, corpus.job_ids.tolist()):
+            i = positions[job_data['id']]
+            expected = scorer.score_job_data(job_data)
+            if (expected.total_score != breakdown['total_score'][i]
+                    or any(expected.breakdown[name] != breakdown[name][i] for name in expected.breakdown)):
+                mismatches.append(job_data['id'])
+
+    return mismatches
+
+
+# Usage example:
+if __name__ == "__main__":
+    import sys
+
+    scorer = JobScoringAlgorithm("job_tracker.db")
+
+    started = time.perf_counter()
+    corpus = tokenize_corpus(scorer)
+    tokenized = time.perf_counter()
+    breakdown = score_corpus(scorer, corpus)
+    scored = time.perf_counter()
+
+    print(f"Tokenized {len(corpus.job_ids)} jobs in {tokenized - started:.2f}s, "
+          f"scored in {(scored - tokenized) * 1000:.1f}ms")
+
+    if '--verify' in sys.argv:
+        mismatches = verify_against_serial(scorer, corpus, breakdown)
+        print(f"{len(mismatches)} jobs differ from JobScoringAlgorithm.score_job")
@@ -0,0 +1,45 @@
+"""
+Shared fixtures: a fresh database built from database/schema.sql plus every migration
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.db import close_all, connection
+from src.migrations import migrate_database
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'database' / 'schema.sql'
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'job_tracker.db')
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA_PATH.read_text())
+    migrate_database(path)
+    yield path
+    close_all(path)
+
+
+@pytest.fixture
+def conn(db_path):
+    with connection(db_path) as conn:
+        yield conn
+
+
+@pytest.fixture
+def make_job(conn):
+    """Insert a job (at a company created on first use) and return its id"""
+    def make_job(title='Head of Design', company='Canva', **fields):
+        row = conn.execute("SELECT id FROM companies WHERE name = ?", (company,)).fetchone()
+        company_id = row[0] if row else conn.execute("INSERT INTO companies (name) VALUES (?)", (company,)).lastrowid
+        columns = ['company_id', 'title', *fields]
+        cursor = conn.execute(f"""
+            INSERT INTO job_opportunities ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+        """, (company_id, title, *fields.values()))
+        conn.commit()
+        return cursor.lastrowid
+    return make_job
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from src.activity_log import (activity_for, archive_stats, archived_activity, compact_activity_log,
+                              latest_activity, retention_days)
+
+
+@pytest.fixture
+def log_activity(conn):
+    def log_activity(entity_id, activity_type='package_created', days_ago=0, **metadata):
+        conn.execute("""
+            INSERT INTO activity_log (activity_type, entity_type, entity_id, description, metadata, created_at)
+            VALUES (?, 'job', ?, ?, ?, datetime('now', ?))
+        """, (activity_type, entity_id, f'{activity_type} for job {entity_id}', json.dumps(metadata),
+              f'-{days_ago} days'))
+        conn.commit()
+    return log_activity
+
+
+def test_old_rows_move_into_segments_and_stay_readable(db_path, conn, log_activity):
+    for job_id in range(1, 6):
+        log_activity(job_id, days_ago=200, folder_path=f'/Jobs/{job_id}')
+    log_activity(1, 'notion_synced', days_ago=150, notion_page_id='abc123')
+    log_activity(1, 'application_sent')
+
+    report = compact_activity_log(db_path, days=90, segment_rows=4)
+
+    assert (report.rows_archived, report.segments_written) == (6, 2)
+    stats = archive_stats(conn)
+    assert (stats['hot_rows'], stats['archived_rows'], stats['segments']) == (1, 6, 2)
+
+    assert [entry['activity_type'] for entry in activity_for(conn, 'job', 1)] == \
+        ['application_sent', 'notion_synced', 'package_created']
+    assert activity_for(conn, 'job', 1, include_archived=False)[0]['activity_type'] == 'application_sent'
+    assert latest_activity(conn, 'job', 1, 'notion_synced')['notion_page_id'] == 'abc123'
+    assert [entry['folder_path'] for entry in archived_activity(conn, 'job', 5)] == ['/Jobs/5']
+    assert archived_activity(conn, 'job', 99) == []
+
+
+def test_nothing_to_archive_inside_the_window(db_path, conn, log_activity):
+    log_activity(1, days_ago=10)
+    assert compact_activity_log(db_path, days=90).rows_archived == 0
+    assert archive_stats(conn)['hot_rows'] == 1
+
+
+def test_json_fields_are_generated_columns(conn, log_activity):
+    log_activity(7, folder_path='/Jobs/Canva')
+    conn.execute("""
+        INSERT INTO activity_log (activity_type, entity_type, entity_id, description, metadata)
+        VALUES ('note', 'job', 7, 'Plain text metadata', 'not json')
+    """)
+    assert conn.execute("SELECT folder_path FROM activity_log ORDER BY id").fetchall() == [('/Jobs/Canva',), (None,)]
+
+
+def test_retention_comes_from_the_environment(monkeypatch):
+    monkeypatch.delenv('ACTIVITY_RETENTION_DAYS', raising=False)
+    assert retention_days() == 90
+    monkeypatch.setenv('ACTIVITY_RETENTION_DAYS', '30')
+    assert retention_days() == 30
@@ -0,0 +1,24 @@
+from src.analytics import monthly_trends, rebuild_rollups, score_distribution, source_analysis
+
+
+def reports(conn):
+    return score_distribution(conn), source_analysis(conn), monthly_trends(conn)
+
+
+def test_triggers_match_a_full_rebuild(conn, make_job):
+    seek = make_job(source='seek', ai_score=92, created_at='2024-04-10 09:00:00')
+    linkedin = make_job(source='linkedin', ai_score=55, created_at='2024-05-02 09:00:00')
+    make_job(source='seek', ai_score=None, created_at='2024-05-03 09:00:00')
+    make_job(source='', ai_score=30, created_at='2024-05-04 09:00:00')
+
+    conn.execute("UPDATE job_opportunities SET ai_score = 100 WHERE id = ?", (linkedin,))
+    conn.execute("UPDATE job_opportunities SET source = 'linkedin' WHERE id = ?", (seek,))
+    conn.execute("UPDATE job_opportunities SET created_at = '2024-06-01 09:00:00' WHERE id = ?", (linkedin,))
+    conn.execute("DELETE FROM job_opportunities WHERE source = 'seek'")
+    incremental = reports(conn)
+
+    rebuild_rollups(conn)
+    assert reports(conn) == incremental
+    assert score_distribution(conn) == [('90-100', 2), ('0-49', 1)]
+    assert source_analysis(conn) == [('linkedin', 2, 96.0)]
+    assert [row[0] for row in monthly_trends(conn)] == ['2024-06', '2024-05', '2024-04']
@@ -0,0 +1,58 @@
+import io
+
+from src.bulk_import import import_file, import_jobs, parse_rows, validate_row
+
+CSV = """Job Title,Company,Salary Min,Priority,Description
+Head of Design,Canva,"180,000",High,Lead design systems and AI products
+,Atlassian,,,
+Design Director,Canva Pty Ltd,lots,,
+Principal Designer,Atlassian,200000,,Machine learning tooling
+"""
+
+
+def test_csv_headers_are_aliased_and_rows_validated():
+    rows = list(parse_rows(io.StringIO(CSV), 'csv'))
+    assert [line for line, _ in rows] == [2, 3, 4, 5]
+
+    job, reason = validate_row(rows[0][1])
+    assert reason is None
+    assert (job['title'], job['company_name'], job['salary_min'], job['priority'], job['currency']) == \
+        ('Head of Design', 'Canva', 180000, 'high', 'AUD')
+    assert validate_row(rows[1][1]) == (None, 'Missing title')
+    assert validate_row(rows[2][1]) == (None, "Invalid salary_min: 'lots'")
+
+
+def test_bad_jsonl_lines_are_reported_not_raised():
+    rows = list(parse_rows(io.StringIO('{"title": "A", "company": "B"}\n\n[1]\n{oops\n'), 'jsonl'))
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert validate_row(rows[1][1]) == (None, 'Expected a JSON object')
+    assert validate_row(rows[2][1])[1].startswith('Invalid JSON')
+
+
+def test_import_batches_resolve_companies_and_score(db_path, conn, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text(CSV)
+
+    report = import_file(db_path, str(path), batch_size=1, score=True)
+
+    assert (report.rows_read, report.jobs_imported, report.jobs_scored) == (4, 2, 2)
+    assert report.companies_created == 2
+    assert [(rejected.line, rejected.reason) for rejected in report.rejected] == \
+        [(3, 'Missing title'), (4, "Invalid salary_min: 'lots'")]
+    assert conn.execute("""
+        SELECT j.title, c.name, j.ai_score IS NOT NULL
+        FROM job_opportunities j JOIN companies c ON c.id = j.company_id
+        ORDER BY j.id
+    """).fetchall() == [('Head of Design', 'Canva', 1), ('Principal Designer', 'Atlassian', 1)]
+
+
+def test_reposts_in_the_same_import_are_linked(db_path, conn):
+    description = ("Lead the design systems team across our banking apps. Partner with product and "
+                   "engineering to ship accessible, consistent experiences. Mentor designers weekly.")
+    rows = [(1, {'title': 'Design Systems Lead', 'company': 'Westpac', 'description': description}),
+            (2, {'title': 'Design Systems Lead', 'company': 'Westpac', 'description': description})]
+
+    report = import_jobs(db_path, rows, dedupe=True)
+
+    assert report.duplicates_linked == 1
+    assert conn.execute("SELECT COUNT(*) FROM job_opportunities WHERE duplicate_of IS NOT NULL").fetchone()[0] == 1
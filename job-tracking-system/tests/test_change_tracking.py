@@ -0,0 +1,33 @@
+import pytest
+
+from src.change_tracking import data_version
+
+
+def test_version_moves_only_when_a_declared_table_changes(conn, make_job):
+    job_id = make_job()
+    jobs = data_version(conn, ['job_opportunities', 'companies'])
+    applications = data_version(conn, ['applications'])
+
+    conn.execute("UPDATE job_opportunities SET notes = 'Follow up' WHERE id = ?", (job_id,))
+    conn.commit()
+
+    changed = data_version(conn, ['companies', 'job_opportunities'])
+    assert changed.token != jobs.token
+    assert changed.etag('/jobs') != jobs.etag('/jobs')
+    assert changed.etag('/jobs') != changed.etag('/jobs.csv')
+    assert changed.last_modified is not None
+    assert data_version(conn, ['applications']) == applications
+
+
+def test_rolled_back_writes_leave_the_version_alone(conn, make_job):
+    make_job()
+    before = data_version(conn, ['job_opportunities'])
+    conn.execute("DELETE FROM job_opportunities")
+    conn.rollback()
+
+    assert data_version(conn, ['job_opportunities']) == before
+
+
+def test_untracked_tables_are_rejected(conn):
+    with pytest.raises(ValueError):
+        data_version(conn, ['job_opportunities', 'activity_log'])
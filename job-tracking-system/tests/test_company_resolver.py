@@ -0,0 +1,119 @@
+import pytest
+
+from src.company_resolver import (CompanyResolver, add_company_alias, get_resolver, merge_duplicate_companies,
+                                  normalize_company_name)
+from src.db import connection, get_pool
+
+
+def company_ids(db_path):
+    with connection(db_path) as conn:
+        return dict(conn.execute("SELECT name, id FROM companies").fetchall())
+
+
+def test_normalize_strips_legal_forms():
+    assert normalize_company_name('Acme Pty Ltd') == 'acme'
+    assert normalize_company_name('A.N.Z. Pty. Ltd.') == 'anz'
+    assert normalize_company_name('The Iconic') == 'iconic'
+
+
+def test_resolve_reuses_company(db_path):
+    resolver = CompanyResolver()
+    with connection(db_path) as conn:
+        created = resolver.resolve(conn, 'Canva Pty Ltd')
+    with connection(db_path) as conn:
+        again = resolver.resolve(conn, 'canva')
+    assert created.created and not again.created
+    assert again.id == created.id
+
+
+def test_fuzzy_match_catches_typos(db_path):
+    resolver = CompanyResolver()
+    with connection(db_path) as conn:
+        atlassian = resolver.resolve(conn, 'Atlassian')
+        assert resolver.resolve(conn, 'Atlasian', create=False).id == atlassian.id
+        assert resolver.resolve(conn, 'Canva', create=False) is None
+
+
+def test_rolled_back_company_is_not_cached(db_path):
+    resolver = get_resolver(db_path)
+    pool = get_pool(db_path)
+
+    # A request that creates a company and then fails: the pool rolls the insert back on release
+    conn = pool.acquire()
+    canva = resolver.resolve(conn, 'Canva')
+    assert canva.created
+    pool.release(conn)
+
+    with connection(db_path) as conn:
+        atlassian = resolver.resolve(conn, 'Atlassian')
+    with connection(db_path) as conn:
+        canva = resolver.resolve(conn, 'Canva')
+
+    assert canva.created
+    assert canva.id != atlassian.id
+    assert company_ids(db_path) == {'Atlassian': atlassian.id, 'Canva': canva.id}
+
+
+def test_committed_company_is_cached(db_path):
+    resolver = get_resolver(db_path)
+    with connection(db_path) as conn:
+        canva = resolver.resolve(conn, 'Canva')
+
+    with connection(db_path) as conn:
+        hits = resolver.hits
+        assert resolver.resolve(conn, 'canva').id == canva.id
+    assert resolver.hits == hits + 1
+
+
+def test_cache_hits_run_no_query_and_merges_clear_them(db_path):
+    with connection(db_path) as conn:
+        conn.execute("INSERT INTO companies (name) VALUES ('Canva Pty Ltd')")
+    resolver = get_resolver(db_path)
+    with connection(db_path) as conn:
+        canva = resolver.resolve(conn, 'Canva')
+    with connection(db_path) as conn:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        assert resolver.resolve(conn, 'CANVA').id == canva.id
+        conn.set_trace_callback(None)
+    assert statements == []
+
+    # The older 'Canva Pty Ltd' row survives the merge, so the cached Canva id is gone
+    with connection(db_path) as conn:
+        assert merge_duplicate_companies(conn) == 1
+    with connection(db_path) as conn:
+        misses = resolver.misses
+        resolver.resolve(conn, 'Canva', create=False)
+    assert resolver.misses == misses + 1
+
+
+@pytest.mark.parametrize('name', ['National Australia Bank', 'Westpac Group', 'Westpac Banking', 'ANZ Bank'])
+def test_ordinary_words_stay_in_the_key(name):
+    assert normalize_company_name(name) == name.lower()
+
+
+def test_distinct_employers_are_not_merged(conn):
+    conn.executemany("INSERT INTO companies (name) VALUES (?)",
+                     [('Westpac Group',), ('Westpac Banking',), ('Canva',), ('Canva Pty Ltd',)])
+    assert merge_duplicate_companies(conn) == 1
+    assert [row[0] for row in conn.execute("SELECT name FROM companies ORDER BY id")] == \
+        ['Westpac Group', 'Westpac Banking', 'Canva']
+
+
+def test_alias_resolves_to_company(db_path):
+    resolver = get_resolver(db_path)
+    with connection(db_path) as conn:
+        anz = resolver.resolve(conn, 'ANZ')
+    with connection(db_path) as conn:
+        assert add_company_alias(conn, 'ANZ Bank', anz.id) == 'anz bank'
+    with connection(db_path) as conn:
+        assert resolver.resolve(conn, 'ANZ Bank', create=False).id == anz.id
+
+
+def test_alias_cannot_take_another_companys_name(conn):
+    resolver = CompanyResolver()
+    anz = resolver.resolve(conn, 'ANZ')
+    nab = resolver.resolve(conn, 'National Australia Bank')
+    with pytest.raises(ValueError):
+        add_company_alias(conn, 'National Australia Bank Ltd', anz.id)
+    assert add_company_alias(conn, 'NAB', nab.id) == 'nab'
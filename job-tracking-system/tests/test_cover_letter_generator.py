@@ -0,0 +1,42 @@
+import pytest
+
+from src.cover_letter_generator import CoverLetterGenerator
+
+POSTINGS = [
+    {'id': 1, 'title': 'Senior Product Designer',
+     'job_description': 'Join our designers shaping leadership tools for banking customers',
+     'requirements': 'Experience leading research; prototyping'},
+    {'id': 2, 'title': 'Head of AI Transformation',
+     'job_description': 'Drive machine learning adoption and process optimization',
+     'requirements': 'Consulting background, strategic leadership'},
+    {'id': 3, 'title': 'Director, Design Systems',
+     'job_description': 'Own the design system and UX research practice across brands',
+     'requirements': 'Built and scaled design organizations'},
+]
+
+
+@pytest.fixture
+def generator(db_path):
+    return CoverLetterGenerator(db_path)
+
+
+def test_keywords_match_inside_longer_words(generator):
+    # "design" counts in "Designer" and "lead" in "leadership", as before documents were shared
+    posting = {'id': 4, 'title': 'Senior Product Designer', 'job_description': '', 'requirements': ''}
+    assert generator._determine_template_style(posting) == 'design_leadership'
+
+    achievement = generator._select_relevant_achievement(
+        {'id': 5, 'title': '', 'job_description': 'cross-functional designers', 'requirements': ''}, 'leadership')
+    assert achievement.startswith('Led cross-functional teams')
+
+
+@pytest.mark.parametrize('posting', POSTINGS, ids=lambda posting: posting['title'])
+@pytest.mark.parametrize('category', ['innovation', 'leadership'])
+def test_achievement_choice_matches_substring_scoring(generator, posting, category):
+    job_text = f"{posting['job_description']} {posting['requirements']}".lower()
+    achievements = generator.achievements_bank[f'{category}_examples']
+    # First achievement with the most words found anywhere in the posting text
+    best = max(achievements, key=lambda text: (sum(word in job_text for word in text.lower().split()),
+                                              -achievements.index(text)))
+
+    assert generator._select_relevant_achievement(posting, category) == best
@@ -0,0 +1,45 @@
+from src.migrations import migrate_database
+
+COUNTS = """
+    SELECT (SELECT COUNT(*) FROM job_opportunities),
+           (SELECT COUNT(*) FROM job_opportunities WHERE priority = 'high' OR ai_score >= 80),
+           (SELECT COUNT(*) FROM applications),
+           (SELECT COUNT(*) FROM interviews)
+"""
+
+
+def stats(conn):
+    return conn.execute("""
+        SELECT total_jobs, high_priority, applications_sent, interviews_scheduled
+        FROM dashboard_stats WHERE id = 1
+    """).fetchone()
+
+
+def test_triggers_keep_counters_equal_to_full_counts(conn, make_job):
+    high = make_job(priority='high')
+    scored = make_job(ai_score=85)
+    plain = make_job(ai_score=40)
+    application = conn.execute("""
+        INSERT INTO applications (job_id, application_date) VALUES (?, '2024-05-01')
+    """, (high,)).lastrowid
+    conn.execute("INSERT INTO interviews (application_id) VALUES (?)", (application,))
+    assert stats(conn) == (3, 2, 1, 1)
+
+    conn.execute("UPDATE job_opportunities SET ai_score = 90 WHERE id = ?", (high,))
+    conn.execute("UPDATE job_opportunities SET ai_score = 95 WHERE id = ?", (plain,))
+    conn.execute("UPDATE job_opportunities SET ai_score = NULL, priority = 'low' WHERE id = ?", (scored,))
+    conn.execute("DELETE FROM interviews")
+    conn.execute("DELETE FROM job_opportunities WHERE id = ?", (plain,))
+
+    assert stats(conn) == conn.execute(COUNTS).fetchone() == (2, 1, 1, 0)
+
+
+def test_migration_backfills_existing_rows(db_path, conn, make_job):
+    make_job(priority='high')
+    make_job()
+    conn.execute("UPDATE dashboard_stats SET total_jobs = 0, high_priority = 0")
+    conn.execute("DELETE FROM schema_migrations WHERE name = '012_dashboard_stats'")
+    conn.commit()
+
+    assert migrate_database(db_path) == ['012_dashboard_stats']
+    assert stats(conn) == (2, 1, 0, 0)
@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+from src.db import ConnectionPool, connection, get_pool
+
+
+def test_connections_are_reused_and_configured(db_path):
+    pool = get_pool(db_path)
+    with connection(db_path) as first:
+        pass
+    with connection(db_path) as second:
+        assert second.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert second.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    assert first is second
+    assert pool.reused >= 1
+
+
+def test_nested_blocks_get_separate_connections(db_path):
+    with connection(db_path) as outer, connection(db_path) as inner:
+        assert outer is not inner
+
+
+def test_commits_on_success_and_rolls_back_on_error(db_path):
+    with connection(db_path) as conn:
+        conn.execute("INSERT INTO companies (name) VALUES ('Canva')")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with connection(db_path) as conn:
+            conn.execute("INSERT INTO companies (name) VALUES ('Atlassian')")
+            conn.execute("INSERT INTO job_opportunities (title) VALUES ('No company')")
+
+    with connection(db_path) as conn:
+        assert conn.execute("SELECT name FROM companies").fetchall() == [('Canva',)]
+
+
+def test_release_rolls_back_uncommitted_work_and_caps_idle(db_path):
+    pool = ConnectionPool(db_path, max_idle=1)
+    first, second = pool.acquire(), pool.acquire()
+    first.execute("INSERT INTO companies (name) VALUES ('Canva')")
+
+    pool.release(first)
+    pool.release(second)
+
+    assert not first.in_transaction
+    assert first.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        second.execute("SELECT 1")
+    pool.close()
@@ -0,0 +1,51 @@
+from src.dedupe import (find_clusters, index_job, link_duplicate, minhash, shingles, similarity)
+
+POSTING = ("Lead the design systems team across our banking apps. Partner with product and engineering "
+           "to ship accessible, consistent experiences. Mentor designers and run design critiques weekly.")
+
+
+def job(job_id, description=POSTING, title='Design Systems Lead'):
+    return {'id': job_id, 'title': title, 'job_description': description, 'requirements': ''}
+
+
+def test_minhash_estimates_jaccard():
+    assert similarity(minhash(POSTING), minhash(POSTING)) == 1.0
+    assert similarity(minhash(POSTING), minhash("Senior data engineer building Spark pipelines")) < 0.2
+    assert minhash('') is None
+    assert len(shingles('one two')) == 1
+
+
+def test_reposted_role_links_to_original(conn, make_job):
+    original = make_job(job_description=POSTING)
+    index_job(conn, job(original))
+    repost = make_job(job_description=POSTING + ' Apply now!')
+
+    assert link_duplicate(conn, job(repost, POSTING + ' Apply now!')) == original
+    other = make_job('Data Engineer', job_description='Build Spark pipelines for the risk platform')
+    assert link_duplicate(conn, job(other, 'Build Spark pipelines for the risk platform', 'Data Engineer')) is None
+
+
+def test_deleting_a_job_removes_its_index_rows_and_links(conn, make_job):
+    original = make_job(job_description=POSTING)
+    repost = make_job(job_description=POSTING)
+    index_job(conn, job(original))
+    link_duplicate(conn, job(repost))
+
+    conn.execute("DELETE FROM job_opportunities WHERE id = ?", (original,))
+
+    assert conn.execute("SELECT COUNT(*) FROM job_minhash WHERE job_id = ?", (original,)).fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM job_lsh_bands WHERE job_id = ?", (original,)).fetchone()[0] == 0
+    assert conn.execute("SELECT duplicate_of FROM job_opportunities WHERE id = ?", (repost,)).fetchone()[0] is None
+
+
+def test_clusters_ignore_jobs_that_no_longer_exist(conn, make_job):
+    first = make_job(job_description=POSTING)
+    second = make_job(job_description=POSTING)
+    third = make_job(job_description=POSTING)
+    for job_id in (first, second, third):
+        index_job(conn, job(job_id))
+    # Index rows left behind by an older, deleted job (before the cleanup trigger existed)
+    index_job(conn, job(0))
+
+    assert find_clusters(conn) == [[first, second, third]]
+    assert link_duplicate(conn, job(third)) == first
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src import export
+from src.export import (applications_export_query, export_format, jobs_export_query, parse_since,
+                        stream_export)
+
+
+def test_ndjson_export_streams_filtered_jobs_in_batches(db_path, conn, make_job, monkeypatch):
+    ids = [make_job(f'Design Lead {n}', ai_score=80 + n) for n in range(5)]
+    make_job('Data Engineer', ai_score=90)
+    monkeypatch.setattr(export, 'BATCH_SIZE', 2)
+
+    chunks = list(stream_export(db_path, jobs_export_query(conn, 'design', min_score=81), 'ndjson'))
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert len(chunks) == 2
+    assert [row['id'] for row in rows] == ids[1:]
+    assert rows[0]['company_name'] == 'Canva'
+    assert 'score_fingerprint' not in rows[0]
+
+
+def test_csv_export_starts_with_a_header(db_path, conn, make_job):
+    job_id = make_job(notes='Referral, via "Sam"')
+    conn.execute("INSERT INTO applications (job_id, application_date, status) VALUES (?, '2024-05-01', 'interview')",
+                 (job_id,))
+    conn.commit()
+
+    text = ''.join(stream_export(db_path, applications_export_query('interview'), 'csv'))
+    rows = list(csv.DictReader(io.StringIO(text)))
+
+    assert [(row['job_title'], row['company_name']) for row in rows] == [('Head of Design', 'Canva')]
+    jobs = list(csv.DictReader(io.StringIO(''.join(stream_export(db_path, jobs_export_query(conn), 'csv')))))
+    assert jobs[0]['notes'] == 'Referral, via "Sam"'
+
+
+def test_updated_since_filters_on_updated_at(db_path, conn, make_job):
+    make_job(updated_at='2024-01-01 00:00:00')
+    recent = make_job(updated_at='2024-06-01 12:00:00')
+
+    query = jobs_export_query(conn, updated_since='2024-06-01T21:00:00+10:00')
+    assert [json.loads(line)['id'] for line in ''.join(stream_export(db_path, query, 'ndjson')).splitlines()] == [recent]
+
+
+def test_arguments_are_validated(conn):
+    assert parse_since('2024-06-01') == '2024-06-01 00:00:00'
+    assert parse_since('2024-06-01T10:00:00Z') == '2024-06-01 10:00:00'
+    assert export_format('JSONL') == 'ndjson'
+    for call in (lambda: parse_since('yesterday'), lambda: export_format('xml'),
+                 lambda: jobs_export_query(conn, search_text='"" *')):
+        with pytest.raises(ValueError):
+            call()
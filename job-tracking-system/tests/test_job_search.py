@@ -0,0 +1,40 @@
+import pytest
+
+from src.job_search import SNIPPET_END, SNIPPET_START, fts_query, search_jobs
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('design systems', '"design" "systems"'),
+    ('"design systems" lead*', '"design systems" "lead"*'),
+    ('AND OR ( NEAR', '"AND" "OR" "(" "NEAR"'),
+    ('* "" ', None),
+    (None, None),
+])
+def test_search_box_text_becomes_a_quoted_query(text, expected):
+    assert fts_query(text) == expected
+
+
+def test_title_matches_rank_above_description_matches(conn, make_job):
+    in_description = make_job('Product Lead', job_description='Grow our design systems practice')
+    in_title = make_job('Design Systems Lead', job_description='Own the component library')
+    make_job('Data Engineer', job_description='Spark pipelines')
+
+    results = search_jobs(conn, 'design systems')
+
+    assert [job['id'] for job in results] == [in_title, in_description]
+    assert f'{SNIPPET_START}Design{SNIPPET_END}' in results[0]['snippet']
+
+
+def test_company_names_filters_and_edits_are_searchable(conn, make_job):
+    job_id = make_job('Head of Design', 'Atlassian', status='applied', ai_score=85)
+    make_job('Head of Design', 'Canva', status='identified', ai_score=60)
+
+    assert [job['id'] for job in search_jobs(conn, 'atlass*')] == [job_id]
+    assert len(search_jobs(conn, 'design')) == 2
+    assert [job['id'] for job in search_jobs(conn, 'design', status='applied')] == [job_id]
+    assert [job['id'] for job in search_jobs(conn, 'design', min_score=80)] == [job_id]
+
+    conn.execute("UPDATE job_opportunities SET title = 'Research Director' WHERE id = ?", (job_id,))
+    assert [job['id'] for job in search_jobs(conn, 'research')] == [job_id]
+    conn.execute("DELETE FROM job_opportunities WHERE id = ?", (job_id,))
+    assert search_jobs(conn, 'research') == []
@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+from src.keyword_matcher import KeywordMatcher
+
+
+def test_finds_every_keyword_in_one_pass():
+    matcher = KeywordMatcher(['design', 'design systems', 'systems thinking', 'AWS Bedrock'])
+    text = 'Own design systems thinking on AWS Bedrock'
+    assert matcher.find(text) == {'design', 'design systems', 'systems thinking', 'AWS Bedrock'}
+
+
+def test_keywords_are_literal_not_regex():
+    matcher = KeywordMatcher(['P&L', 'AI/ML', 'C++', 'Node.js'])
+    assert matcher.find('Owns the P&L for AI/ML products built in C++') == {'P&L', 'AI/ML', 'C++'}
+    assert matcher.find('Nodexjs') == set()
+
+
+def test_acronyms_need_word_boundaries_at_both_ends():
+    matcher = KeywordMatcher(['AI', 'EA', 'CTO'])
+    assert matcher.find('maintain the team and the director') == set()
+    assert matcher.find('Report to the CTO on AI (EA) work') == {'AI', 'EA', 'CTO'}
+
+
+def test_stems_may_run_into_longer_words():
+    matcher = KeywordMatcher(['Digital Transform', 'Process Optim', 'lead'])
+    assert matcher.find('Digital transformation and process optimization') == {'Digital Transform', 'Process Optim'}
+    # ...but must still start on a word boundary
+    assert matcher.find('misleading') == set()
+
+
+def test_overlapping_keywords_via_failure_links():
+    matcher = KeywordMatcher(['he', 'she', 'his', 'hers'])
+    assert matcher.find('she hers his') == {'she', 'he', 'hers', 'his'}
+    assert matcher.find('ushers') == set()
+
+
+def test_empty_and_duplicate_keywords():
+    matcher = KeywordMatcher(['', 'UX', 'UX'])
+    assert matcher.keywords == ['UX']
+    assert matcher.find('') == set()
+    assert matcher.find_ids('Lead UX') == {0}
+
+
+@pytest.mark.parametrize('text', [
+    'Head of Design leading AI strategy, P&L ownership, design thinking and UX research.',
+    'We need a designer with systems-level thinking; AI/ML a plus. Maintain the EA roadmap.',
+])
+def test_matches_word_boundary_regex_reference(text):
+    keywords = ['Design', 'design thinking', 'AI', 'P&L', 'UX', 'AI/ML', 'EA', 'systems', 'lead']
+
+    def reference(keyword):
+        end = r'(?!\w)' if not any(c.islower() for c in keyword) else ''
+        return re.search(r'(?<!\w)' + re.escape(keyword.lower()) + end, text.lower()) is not None
+
+    assert KeywordMatcher(keywords).find(text) == {keyword for keyword in keywords if reference(keyword)}
@@ -0,0 +1,56 @@
+import sqlite3
+
+from src import metrics
+from src.metrics import Histogram, MetricsRegistry, TimedConnection, statement_shape
+
+
+def test_statement_shapes_fold_whitespace_and_placeholder_lists():
+    assert statement_shape("""
+        SELECT id FROM jobs
+        WHERE id IN (?, ?,?)
+    """) == 'SELECT id FROM jobs WHERE id IN (?, ...)'
+    assert len(statement_shape('SELECT ' + 'x, ' * 200)) == metrics.STATEMENT_LABEL_LENGTH
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [('0.01', 2), ('0.1', 3), ('1.0', 4), ('+Inf', 5)]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(1.0) == 3.0
+    assert Histogram((1.0,)).quantile(0.5) is None
+
+
+def test_requests_report_statement_counts_and_repeats():
+    registry = MetricsRegistry()
+    registry.begin_request('jobs')
+    for _ in range(3):
+        registry.record_statement('SELECT title FROM job_opportunities WHERE id = ?', 0.002)
+    registry.record_borrow('job_tracker.db')
+    registry.end_request('GET', 'jobs', 200, 0.02)
+
+    route = registry.summary()['routes'][0]
+    assert (route['requests'], route['avg_statements'], route['avg_connection_borrows']) == (1, 3.0, 1.0)
+    assert route['worst_repeat'] == {'statement': 'SELECT title FROM job_opportunities WHERE id = ?', 'count': 3}
+    assert route['sql_share'] == 0.3
+
+    exposition = registry.prometheus()
+    assert 'http_requests_total{method="GET",endpoint="jobs",status="200"} 1' in exposition
+    assert 'http_request_duration_seconds_bucket{method="GET",endpoint="jobs",le="0.025"} 1' in exposition
+
+
+def test_timed_connections_record_every_statement(db_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, 'REGISTRY', registry)
+    conn = sqlite3.connect(db_path, factory=TimedConnection)
+    try:
+        conn.execute("SELECT COUNT(*) FROM companies").fetchone()
+        conn.executemany("INSERT INTO companies (name) VALUES (?)", [('Canva',), ('Atlassian',)])
+        conn.commit()
+    finally:
+        conn.close()
+
+    calls = {statement['statement']: statement['calls'] for statement in registry.summary()['statements']}
+    assert calls == {'SELECT COUNT(*) FROM companies': 1, 'INSERT INTO companies (name) VALUES (?)': 1, 'COMMIT': 1}
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+from src.db import connection
+from src.pagination import (JOB_ORDER, applications_page, decode_cursor, encode_cursor, jobs_page, order_by,
+                            page_size)
+
+
+@pytest.fixture
+def row_conn(db_path):
+    with connection(db_path, row_factory=sqlite3.Row) as conn:
+        yield conn
+
+
+def walk(fetch):
+    """Every item of every page, following next_cursor"""
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        items.extend(page.items)
+        cursor = page.next_cursor
+        if not cursor:
+            return items
+
+
+def test_pages_cover_every_job_once_in_score_order(row_conn, make_job):
+    for score, created_at in ((70, '2024-05-01'), (90, None), (None, '2024-05-01'), (70, None), (50, '2024-05-02'),
+                              (None, None), (90, '2024-05-01'), (0, '2024-05-03'), (70, '2024-05-01')):
+        make_job(ai_score=score, created_at=created_at)
+
+    items = walk(lambda cursor: jobs_page(row_conn, cursor=cursor, limit=2))
+
+    expected = row_conn.execute("""
+        SELECT id FROM job_opportunities ORDER BY ai_score DESC, created_at DESC, id DESC
+    """).fetchall()
+    assert [row['id'] for row in items] == [row['id'] for row in expected]
+    assert len(items) == 9
+
+
+def test_later_pages_seek_the_ranked_index(row_conn):
+    sql = "SELECT j.id FROM job_opportunities j WHERE 1=1"
+    plan = row_conn.execute("EXPLAIN QUERY PLAN " + sql + f"""
+        AND {JOB_ORDER[0]} <= ? AND ({', '.join(JOB_ORDER)}) < (?, ?, ?) ORDER BY {order_by(JOB_ORDER)}
+    """, (70, 70, '2024-05-01', 3)).fetchall()
+    assert [row[3] for row in plan] == ['SEARCH j USING INDEX idx_jobs_ranked (<expr><?)']
+
+
+def test_filters_apply_on_every_page(row_conn, make_job):
+    for score in (95, 85, 60, 88):
+        make_job(ai_score=score, priority='high')
+    make_job(ai_score=99, priority='low')
+
+    items = walk(lambda cursor: jobs_page(row_conn, priority='high', min_score=80, cursor=cursor, limit=1))
+    assert [row['ai_score'] for row in items] == [95, 88, 85]
+
+
+def test_applications_newest_first(conn, row_conn, make_job):
+    job_id = make_job()
+    conn.executemany("INSERT INTO applications (job_id, application_date) VALUES (?, ?)",
+                     [(job_id, date) for date in ('2024-03-01', '2024-05-01', '2024-04-01')])
+    conn.commit()
+
+    items = walk(lambda cursor: applications_page(row_conn, cursor=cursor, limit=2))
+    assert [row['application_date'] for row in items] == ['2024-05-01', '2024-04-01', '2024-03-01']
+    assert items[0]['company_name'] == 'Canva'
+
+
+def test_cursor_round_trip_and_rejects_tampering():
+    assert decode_cursor(encode_cursor([90, '2024-05-01 09:00:00', 7]), 3) == [90, '2024-05-01 09:00:00', 7]
+    for cursor in ('not a cursor!', encode_cursor([1, 2]), encode_cursor({'id': 1})):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, 3)
+
+
+def test_page_size_is_clamped():
+    assert (page_size(None), page_size(0), page_size(-5), page_size(10_000)) == (50, 50, 1, 200)
@@ -0,0 +1,17 @@
+from src.parallel_scoring import rescore_parallel
+from src.scoring_algorithm import JobScoringAlgorithm
+
+
+def test_status_filter_applies_to_parallel_rescoring(db_path, conn, make_job):
+    for i in range(40):
+        make_job(f'Head of Design {i}', job_description='Lead AI product design strategy and design systems',
+                 status='identified' if i % 2 else 'applied')
+    scorer = JobScoringAlgorithm(db_path)
+    identified = {row[0] for row in conn.execute("SELECT id FROM job_opportunities WHERE status = 'identified'")}
+
+    result = rescore_parallel(scorer, workers=2, chunk_size=5, force=True,
+                              query='j.status = ?', params=('identified',))
+
+    assert set(result.scores) == identified
+    expected = scorer.score_jobs(list(identified), force=True)
+    assert result.scores == expected.scores
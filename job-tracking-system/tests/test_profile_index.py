@@ -0,0 +1,29 @@
+from src.profile_index import DEFAULT_SKILLS, load_profile_index
+
+
+def test_empty_profile_falls_back_to_default_skills(db_path):
+    index = load_profile_index(db_path)
+
+    assert [skill.skill for skill in index.category('ai_technology').skills] == \
+        [skill for skill, *_ in DEFAULT_SKILLS['ai_technology']]
+    assert index.category('ai_technology').weight == 0.30
+    assert index.fit_weight('location_fit') == 0.05
+
+
+def test_index_is_reused_until_profile_or_weights_change(db_path, conn):
+    index = load_profile_index(db_path)
+    assert load_profile_index(db_path) is index
+
+    conn.execute("""
+        INSERT INTO my_profile (category, skill, proficiency_level, years_experience, keywords)
+        VALUES ('ai_technology', 'Machine Learning', 9, 5, 'machine learning, ML ')
+    """)
+    conn.commit()
+    edited = load_profile_index(db_path)
+    assert edited is not index
+    assert edited.category('ai_technology').skills[0].keywords == ('machine learning', 'ML')
+    assert edited.category('executive_leadership').skills == ()
+
+    conn.execute("UPDATE scoring_weights SET weight = 0.5 WHERE component = 'role_level'")
+    conn.commit()
+    assert load_profile_index(db_path).fit_weight('role_level') == 0.5
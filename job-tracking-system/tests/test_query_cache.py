@@ -0,0 +1,40 @@
+from src.query_cache import QueryCache
+
+COUNT_JOBS = "SELECT COUNT(*) FROM job_opportunities"
+
+
+def test_hits_until_the_table_changes(conn, make_job):
+    cache = QueryCache()
+    make_job()
+    assert cache.fetchall(conn, COUNT_JOBS, tables=['job_opportunities']) == [(1,)]
+    assert cache.fetchall(conn, COUNT_JOBS, tables=['job_opportunities']) == [(1,)]
+
+    # No invalidate() call: the change counter alone makes the entry stale
+    make_job()
+    assert cache.fetchall(conn, COUNT_JOBS, tables=['job_opportunities']) == [(2,)]
+    assert (cache.hits, cache.misses, cache.stale) == (1, 2, 1)
+
+
+def test_invalidate_drops_only_entries_that_read_the_table(conn):
+    cache = QueryCache()
+    cache.fetchall(conn, COUNT_JOBS, tables=['job_opportunities'])
+    cache.fetchall(conn, "SELECT COUNT(*) FROM companies", tables=['companies'])
+    cache.fetchall(conn, "SELECT COUNT(*) FROM job_opportunities, companies",
+                   tables=['job_opportunities', 'companies'])
+
+    assert cache.invalidate('companies') == 2
+    assert cache.stats()['entries'] == 1
+    assert cache.invalidate('companies') == 0
+
+
+def test_least_recently_used_entry_is_evicted(conn):
+    cache = QueryCache(maxsize=2)
+    loads = []
+
+    def load(key):
+        return cache.get_or_load(conn, key, ['companies'], lambda: loads.append(key) or key)
+
+    load('a'), load('b'), load('a'), load('c'), load('a'), load('b')
+
+    assert loads == ['a', 'b', 'c', 'b']
+    assert cache.evictions == 2
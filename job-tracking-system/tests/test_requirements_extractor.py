@@ -0,0 +1,41 @@
+from src.profile_index import load_profile_index
+from src.requirements_extractor import extract_requirements, jobs_requiring, match_by_importance
+from src.scoring_algorithm import JobScoringAlgorithm
+
+POSTING = {
+    'requirements': "Design systems leadership with an MBA or PhD\nNice to have: DevOps exposure",
+    'job_description': "About the role:\nYou will shape our design systems",
+}
+
+
+def add_profile(conn):
+    conn.execute("""
+        INSERT INTO my_profile (category, skill, proficiency_level, years_experience, keywords)
+        VALUES ('design_innovation', 'Design Systems', 9, 10, 'design systems')
+    """)
+
+
+def test_one_row_per_line_keeps_the_line_score(db_path, conn):
+    add_profile(conn)
+    conn.commit()
+
+    requirements = extract_requirements(POSTING, load_profile_index(db_path))
+
+    assert [(req.requirement, req.importance, req.terms) for req in requirements] == [
+        ('Design systems leadership with an MBA or PhD', 'required', ['MBA', 'PhD']),
+        ('Nice to have: DevOps exposure', 'nice-to-have', ['DevOps']),
+    ]
+    assert requirements[0].match_score == 100
+
+
+def test_stored_terms_and_averages(db_path, conn, make_job):
+    add_profile(conn)
+    job_id = make_job(requirements=POSTING['requirements'], job_description=POSTING['job_description'])
+
+    JobScoringAlgorithm(db_path).score_jobs(force=True)
+
+    assert conn.execute("SELECT COUNT(*) FROM job_requirements").fetchone()[0] == 2
+    assert jobs_requiring(conn, 'PhD', 'required') == [job_id]
+    assert jobs_requiring(conn, ' mba ') == jobs_requiring(conn, 'MBA') == [job_id]
+    assert jobs_requiring(conn, 'DevOps', 'required') == []
+    assert match_by_importance(conn, job_id) == {'required': 100.0, 'nice-to-have': 0.0}
@@ -0,0 +1,56 @@
+import pytest
+
+from src import reweighting
+from src.profile_index import load_profile_index
+from src.reweighting import what_if
+
+
+@pytest.fixture
+def scored_jobs(conn, make_job):
+    """An AI-heavy job and a design-heavy job, AI ranked first under the default weights"""
+    ai_job = make_job('AI Lead')
+    design_job = make_job('Design Director')
+    conn.executemany("""
+        INSERT INTO job_scores (job_id, total_score, ai_technology, design_innovation)
+        VALUES (?, 0, ?, ?)
+    """, [(ai_job, 90, 40), (design_job, 40, 80)])
+    conn.commit()
+    return ai_job, design_job
+
+
+def test_heavier_design_weight_reorders_jobs(db_path, conn, scored_jobs):
+    ai_job, design_job = scored_jobs
+    profile = load_profile_index(db_path)
+
+    baseline = what_if(conn, db_path, profile, {})
+    assert [entry['job_id'] for entry in baseline.top] == [ai_job, design_job]
+    assert baseline.jobs_moved == 0
+
+    result = what_if(conn, db_path, profile, {'design_innovation': 0.6})
+    assert [entry['job_id'] for entry in result.top] == [design_job, ai_job]
+    assert (result.jobs_moved, result.top[0]['rank_delta'], result.top[0]['title']) == (2, 1, 'Design Director')
+    assert result.weights['ai_technology'] == 0.30
+
+
+def test_pure_python_ranking_matches(db_path, conn, scored_jobs, monkeypatch):
+    profile = load_profile_index(db_path)
+    expected = what_if(conn, db_path, profile, {'design_innovation': 0.6}).top
+
+    monkeypatch.setattr(reweighting, 'np', None)
+    monkeypatch.setattr(reweighting, '_cache', {})
+    assert what_if(conn, db_path, profile, {'design_innovation': 0.6}).top == expected
+
+
+def test_new_scores_invalidate_the_cached_matrix(db_path, conn, scored_jobs, make_job):
+    profile = load_profile_index(db_path)
+    assert what_if(conn, db_path, profile, {}).jobs_ranked == 2
+
+    conn.execute("INSERT INTO job_scores (job_id, total_score) VALUES (?, 0)", (make_job('Analyst'),))
+    conn.commit()
+    assert what_if(conn, db_path, profile, {}).jobs_ranked == 3
+
+
+@pytest.mark.parametrize('weights', [{'salary': 0.5}, {'role_level': -1}, {'role_level': 'high'}])
+def test_invalid_weights_are_rejected(db_path, conn, weights):
+    with pytest.raises(ValueError):
+        what_if(conn, db_path, load_profile_index(db_path), weights)
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.scoring_algorithm import JobScoringAlgorithm, job_fingerprint, load_stored_breakdown
+
+POSTING = ("Lead a team of designers building AI products with machine learning. "
+           "Own design strategy, stakeholder management and executive presentations.")
+
+
+def test_batch_scores_match_single_job_scoring(db_path, make_job):
+    ids = [make_job(job_description=POSTING), make_job('Data Engineer', job_description='Spark and SQL pipelines')]
+    scorer = JobScoringAlgorithm(db_path)
+
+    result = scorer.score_jobs()
+
+    assert result.jobs_scored == 2
+    assert result.scores == {job_id: scorer.score_job(job_id).total_score for job_id in ids}
+    assert scorer.score_job(ids[0]).strong_matches and not scorer.score_job(ids[1]).strong_matches
+
+
+def test_batch_scoring_filters_by_ids_and_query(db_path, make_job):
+    design = make_job(job_description=POSTING, status='saved')
+    applied = make_job(job_description=POSTING, status='applied')
+    scorer = JobScoringAlgorithm(db_path)
+
+    assert set(scorer.score_jobs(job_ids=[design]).scores) == {design}
+    assert set(scorer.score_jobs(query='j.status = ?', params=('applied',), force=True).scores) == {applied}
+
+
+def test_unchanged_jobs_are_skipped_until_edited_or_forced(db_path, conn, make_job):
+    first = make_job(job_description=POSTING)
+    second = make_job(job_description=POSTING)
+    scorer = JobScoringAlgorithm(db_path)
+    scorer.score_jobs()
+
+    assert scorer.score_jobs().jobs_skipped == 2
+
+    conn.execute("UPDATE job_opportunities SET requirements = 'Python' WHERE id = ?", (second,))
+    conn.commit()
+    rescored = scorer.score_jobs()
+    assert (rescored.jobs_skipped, set(rescored.scores)) == (1, {second})
+
+    assert scorer.score_jobs(force=True).jobs_scored == 2
+    assert first in scorer.score_jobs(force=True).scores
+
+
+def test_fingerprint_ignores_unscored_fields():
+    job = {'title': 'Head of Design', 'job_description': POSTING, 'notes': 'call back'}
+    assert job_fingerprint(job) == job_fingerprint({**job, 'notes': 'changed'})
+    assert job_fingerprint(job) != job_fingerprint({**job, 'title': 'Design Lead'})
+
+
+def test_profile_edit_marks_only_affected_jobs_stale(db_path, conn, make_job):
+    conn.executemany("""
+        INSERT INTO my_profile (category, skill, proficiency_level, years_experience, keywords)
+        VALUES ('ai_technology', ?, 8, 5, ?)
+    """, [('Machine Learning', 'machine learning'), ('Computer Vision', 'computer vision')])
+    conn.commit()
+    ml_job = make_job(job_description='Ship machine learning products')
+    make_job('Vision Lead', job_description='Build computer vision systems')
+    scorer = JobScoringAlgorithm(db_path)
+    scorer.sync_profile_version()
+    scorer.score_jobs()
+
+    conn.execute("UPDATE my_profile SET proficiency_level = 9 WHERE skill = 'Machine Learning'")
+    conn.commit()
+
+    assert scorer.refresh_profile()
+    assert set(scorer.score_jobs().scores) == {ml_job}
+
+
+def test_breakdown_is_stored_and_reused(db_path, conn, make_job):
+    job_id = make_job(job_description=POSTING, requirements='Experience with Python and AWS')
+    scorer = JobScoringAlgorithm(db_path)
+    scored = scorer.update_job_score(job_id)
+
+    stored = load_stored_breakdown(conn, job_id)
+    assert stored['total_score'] == scored.total_score
+    assert stored['breakdown'] == scored.breakdown
+    assert stored['strong_matches'] == scored.strong_matches
+    assert load_stored_breakdown(conn, make_job()) is None
+
+    reused = scorer.update_job_score(job_id)
+    assert (reused.breakdown, reused.recommendations) == (scored.breakdown, scored.recommendations)
+    assert reused.requirements == scored.requirements
+
+
+def test_concurrent_refreshes_report_a_profile_change_once(db_path, conn):
+    scorer = JobScoringAlgorithm(db_path)
+    scorer.sync_profile_version()
+    conn.execute("UPDATE scoring_weights SET weight = 0.5 WHERE component = 'role_level'")
+    conn.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: scorer.refresh_profile(), range(8)))
+
+    assert results.count(True) == 1
@@ -0,0 +1,31 @@
+from src.slow_queries import MAX_PARAMS, SlowQueryLog, explain, format_params
+
+
+def test_params_are_shortened_for_the_log():
+    assert format_params(('x' * 100, b'\x00' * 8, 3)) == ['x' * 59 + '…', '<8 bytes>', 3]
+    assert format_params(list(range(MAX_PARAMS + 3)))[-1] == '… 3 more'
+    assert format_params({'id': 1}) == {'id': 1}
+    assert format_params(None) is None
+
+
+def test_plans_flag_full_scans_and_temp_btrees(conn):
+    plan = explain(conn, "SELECT * FROM job_opportunities WHERE notes LIKE ? ORDER BY notes", ('%x%',))
+    assert [scan.split()[1] for scan in plan.full_scans] == ['job_opportunities']
+    assert plan.temp_btrees
+
+    indexed = explain(conn, "SELECT * FROM job_opportunities WHERE id = ?", (1,))
+    assert indexed.full_scans == [] and indexed.temp_btrees == []
+    assert explain(conn, "PRAGMA table_info(tasks)") is None
+
+
+def test_first_slow_execution_captures_the_plan(conn, capsys):
+    log = SlowQueryLog(threshold_ms=10)
+    sql = "SELECT * FROM companies WHERE industry = ?"
+    log.record(conn, sql, sql, ('Fintech',), 0.05, 'companies')
+    log.record(conn, sql, sql, ('Banking',), 0.07)
+
+    [stats] = log.snapshot()
+    assert (stats.count, stats.max_ms, stats.last.params) == (2, 70.0, ['Banking'])
+    assert stats.plan.full_scans
+    assert [execution.endpoint for execution in log.recent] == ['companies', '']
+    assert 'Slow query (50.0ms, companies)' in capsys.readouterr().out
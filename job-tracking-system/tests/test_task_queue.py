@@ -0,0 +1,80 @@
+import time
+
+from src.db import connection
+from src.task_queue import (TaskWorkerPool, claim_task, complete_task, enqueue, fail_task, get_task,
+                            queue_stats, requeue_orphaned)
+
+
+def test_active_tasks_are_deduplicated(conn):
+    first, created = enqueue(conn, 'build_package', {'job_id': 1}, dedupe_key='job:1')
+    assert created
+    assert enqueue(conn, 'build_package', {'job_id': 1}, dedupe_key='job:1') == (first, False)
+    assert enqueue(conn, 'build_package', {'job_id': 2}, dedupe_key='job:2')[1]
+
+    conn.commit()
+    claimed = claim_task(conn, 'worker-1', ['build_package'])
+    complete_task(conn, claimed.id, {'ok': True})
+    assert enqueue(conn, 'build_package', {'job_id': 1}, dedupe_key='job:1')[1]
+
+
+def test_tasks_are_claimed_once_in_queue_order(conn):
+    first = enqueue(conn, 'build_package', {'job_id': 1})[0]
+    enqueue(conn, 'other', {})
+    second = enqueue(conn, 'build_package', {'job_id': 2})[0]
+    conn.commit()
+
+    claimed = [claim_task(conn, 'worker-1', ['build_package']) for _ in range(3)]
+
+    assert [task.id for task in claimed[:2]] == [first, second]
+    assert claimed[2] is None
+    assert (claimed[0].status, claimed[0].attempts, claimed[0].payload) == ('running', 1, {'job_id': 1})
+
+
+def test_failures_back_off_then_give_up(conn):
+    task_id = enqueue(conn, 'build_package', {}, max_attempts=2)[0]
+    conn.commit()
+
+    task = claim_task(conn, 'worker-1', ['build_package'])
+    assert fail_task(conn, task, 'Drive unavailable')
+    assert get_task(conn, task_id).status == 'queued'
+    assert claim_task(conn, 'worker-1', ['build_package']) is None  # still backing off
+
+    conn.execute("UPDATE tasks SET run_after = CURRENT_TIMESTAMP WHERE id = ?", (task_id,))
+    conn.commit()
+    task = claim_task(conn, 'worker-1', ['build_package'])
+    assert not fail_task(conn, task, 'Drive unavailable')
+    assert (get_task(conn, task_id).status, get_task(conn, task_id).error) == ('failed', 'Drive unavailable')
+
+
+def test_orphaned_tasks_are_requeued(conn):
+    task_id = enqueue(conn, 'build_package', {})[0]
+    conn.commit()
+    claim_task(conn, 'worker-1', ['build_package'])
+    conn.execute("UPDATE tasks SET updated_at = datetime('now', '-1 hour') WHERE id = ?", (task_id,))
+
+    assert requeue_orphaned(conn, lease_seconds=60) == 1
+    assert get_task(conn, task_id).status == 'queued'
+
+
+def test_worker_pool_runs_handlers_and_records_progress(db_path):
+    def handler(payload, progress):
+        progress(50, 'Halfway')
+        if payload.get('missing'):
+            raise KeyError('job')
+        return {'doubled': payload['n'] * 2}
+
+    pool = TaskWorkerPool(db_path, {'double': handler}, workers=2, poll_interval=0.05)
+    pool.start()
+    try:
+        ok = pool.submit('double', {'n': 21})[0]
+        bad = pool.submit('double', {'missing': True})[0]
+        deadline = time.monotonic() + 10
+        with connection(db_path) as conn:
+            while queue_stats(conn)['queued'] + queue_stats(conn)['running'] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            done, failed = get_task(conn, ok), get_task(conn, bad)
+    finally:
+        pool.stop(timeout=5)
+
+    assert (done.status, done.progress, done.result) == ('succeeded', 100, {'doubled': 42})
+    assert (failed.status, failed.attempts) == ('failed', 1)  # KeyError is permanent, no retry
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+
+from src.scoring_algorithm import JobScoringAlgorithm
+from src.vector_scoring import score_corpus, tokenize_corpus, verify_against_serial
+
+
+def test_matrix_scores_match_the_serial_scorer(db_path, conn, make_job):
+    make_job(job_description='Lead designers building AI products with machine learning and Python')
+    make_job('Account Manager', job_description='Grow enterprise accounts', location='Sydney', remote_option='hybrid')
+    make_job('Senior Data Engineer', 'Westpac', job_description='')
+    conn.execute("UPDATE companies SET industry = 'Banking' WHERE name = 'Westpac'")
+    conn.commit()
+    scorer = JobScoringAlgorithm(db_path)
+
+    corpus = tokenize_corpus(scorer)
+    breakdown = score_corpus(scorer, corpus)
+
+    assert len(corpus.job_ids) == 3
+    assert verify_against_serial(scorer, corpus, breakdown) == []
+
+
+def test_stale_corpus_is_rejected_after_a_profile_edit(db_path, conn, make_job):
+    make_job(job_description='Machine learning')
+    scorer = JobScoringAlgorithm(db_path)
+    corpus = tokenize_corpus(scorer)
+
+    conn.execute("UPDATE scoring_weights SET weight = 0.5 WHERE component = 'role_level'")
+    conn.commit()
+    scorer.refresh_profile()
+
+    with pytest.raises(ValueError):
+        score_corpus(scorer, corpus)